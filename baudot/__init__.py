@@ -4,3 +4,10 @@ Baudot – Tools for handling stateful 5-bit encoding
 """
 
 from .core import encode, encode_str, decode, decode_to_str
+from .core import encode_to_codes, decode_codes
+from .core import iter_encode, iter_decode, iter_codes, write_codes
+from .transcode import transcode, transcode_codes
+from .batch import encode_many, decode_many
+
+from .pycodecs import register as _register_codecs
+_register_codecs()
@@ -0,0 +1,9 @@
+"""
+Entry point of ``python -m baudot``
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
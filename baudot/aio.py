@@ -0,0 +1,111 @@
+"""
+Asynchronous encoding/decoding over ``asyncio`` streams.
+
+These tools mirror :py:func:`baudot.encode` and :py:func:`baudot.decode`
+for network links: text travels as bytes in a regular encoding (UTF-8 by
+default), and codes travel as one code per byte. The shift state is kept
+across reads, and writes wait for the output buffer to drain.
+"""
+
+import asyncio
+import codecs
+from typing import Optional
+
+from .codecs import BaudotCodec
+from .core import CHUNK_SIZE
+from .exceptions import BaudotException
+
+__all__ = ['encode', 'decode', 'start_gateway']
+
+
+async def encode(reader: asyncio.StreamReader, codec: BaudotCodec,
+                 writer: asyncio.StreamWriter, *, encoding: str = 'utf-8',
+                 chunk_size: int = CHUNK_SIZE):
+    """
+    Encode text from an asyncio stream to another, until the end of
+    the input, using the given codec.
+
+    :param reader: Stream to read encoded text from
+    :param codec: Codec to use for encoding
+    :param writer: Stream to write codes to, one per byte
+    :param encoding: Encoding of the input text
+    :param chunk_size: Maximum number of bytes read at once
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    engine = codec.compile()
+    state = engine.initial
+
+    while True:
+        data = await reader.read(chunk_size)
+        chars = decoder.decode(data, final=not data)
+        codes, state = engine.encode_codes(chars, state)
+        if codes:
+            writer.write(codes)
+            await writer.drain()
+        if not data:
+            break
+
+
+async def decode(reader: asyncio.StreamReader, codec: BaudotCodec,
+                 writer: asyncio.StreamWriter, *, encoding: str = 'utf-8',
+                 chunk_size: int = CHUNK_SIZE):
+    """
+    Decode codes from an asyncio stream to another, until the end of
+    the input, using the given codec.
+
+    :param reader: Stream to read codes from, one per byte
+    :param codec: Codec to use for decoding
+    :param writer: Stream to write the decoded text to
+    :param encoding: Encoding of the output text
+    :param chunk_size: Maximum number of codes read at once
+    """
+    encoder = codecs.getincrementalencoder(encoding)()
+    engine = codec.compile()
+    state = engine.initial
+
+    while True:
+        codes = await reader.read(chunk_size)
+        chars, state = engine.decode_codes(codes, state)
+        data = encoder.encode(chars, final=not codes)
+        if data:
+            writer.write(data)
+            await writer.drain()
+        if not codes:
+            break
+
+
+async def start_gateway(codec: BaudotCodec, host: Optional[str] = None,
+                        port: int = 0, *, direction: str = 'decode',
+                        encoding: str = 'utf-8') -> asyncio.AbstractServer:
+    """
+    Start a reference gateway server.
+
+    Each client sends either codes (``direction='decode'``) or text
+    (``direction='encode'``) and receives the conversion back on the
+    same connection, as it is processed. The connection is closed when
+    the client ends its input, or on an encoding or decoding error.
+
+    :param codec: Codec used on all connections
+    :param host: Interface(s) to listen on, all of them by default
+    :param port: Port to listen on, a random one by default
+    :param direction: Either ``'encode'`` or ``'decode'``
+    :param encoding: Encoding of the text side of the gateway
+    :return: The listening server
+    """
+    if direction not in ('encode', 'decode'):
+        raise ValueError(f"Invalid direction: {direction}")
+    convert = encode if direction == 'encode' else decode
+
+    async def handle_link(reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter):
+        try:
+            await convert(reader, codec, writer, encoding=encoding)
+            if writer.can_write_eof():
+                writer.write_eof()
+        except (BaudotException, UnicodeError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    return await asyncio.start_server(handle_link, host, port)
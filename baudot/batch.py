@@ -0,0 +1,158 @@
+"""
+Conversion of many short messages at once.
+
+Each message is converted independently, from the initial state of the
+codec, as with :py:func:`baudot.encode_to_codes` and
+:py:func:`baudot.decode_codes`. The codec is compiled once for all of
+them, and the results are returned in a compact :py:class:`BatchResult`:
+one concatenated buffer, and the offsets of the messages in it.
+
+Messages can be spread over a pool of threads or processes, by batches
+of ``batch_size`` messages. Conversion is CPU-bound pure Python, so
+only processes use several cores; threads are useful when the messages
+come from another thread-friendly source.
+"""
+
+from array import array
+from functools import partial
+from itertools import accumulate, chain, islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, \
+    Union
+
+from .codecs import BaudotCodec
+from .core import chunk_decoder, chunk_encoder
+
+__all__ = ['encode_many', 'decode_many', 'BatchResult', 'POOLS']
+
+#: Default number of messages per task
+BATCH_SIZE = 1024
+
+#: Supported kinds of pools
+POOLS = ('thread', 'process')
+
+
+class BatchResult:
+    """
+    Results of the conversion of several messages.
+
+    Message ``i`` is ``data[offsets[i]:offsets[i + 1]]``, which is also
+    returned by ``result[i]``.
+    """
+
+    def __init__(self, data: Union[bytes, str], offsets: array):
+        #: Concatenated results: codes (one per byte) or characters
+        self.data = data
+        #: Offsets of the messages in :py:attr:`data`, plus the end
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, item: int) -> Union[bytes, str]:
+        if not -len(self) <= item < len(self):
+            raise IndexError('BatchResult index out of range')
+        item %= len(self)
+        return self.data[self.offsets[item]:self.offsets[item + 1]]
+
+    def __iter__(self) -> Iterator[Union[bytes, str]]:
+        data, offsets = self.data, self.offsets
+        return (data[start:stop] for start, stop
+                in zip(offsets, islice(offsets, 1, None)))
+
+
+def encode_many(messages: Iterable[str], codec: BaudotCodec,
+                optimal: bool = False, errors: str = 'strict', *,
+                pool: Optional[str] = None, workers: Optional[int] = None,
+                batch_size: int = BATCH_SIZE) -> BatchResult:
+    """
+    Encode several unicode strings to codes, each one independently.
+
+    :param messages: Unicode strings to encode
+    :param codec: Codec to use for encoding
+    :param optimal: Whether to look for the shortest possible encoding
+    :param errors: Policy for unsupported characters
+        (see :py:mod:`baudot.errors`)
+    :param pool: Kind of pool spreading the messages, ``'thread'`` or
+        ``'process'``; by default, they are encoded in this thread
+    :param workers: Size of the pool, as many as CPUs by default
+    :param batch_size: Number of messages per task of the pool
+    :return: Concatenated codes (one per byte) and their offsets
+    """
+    # pylint: disable=too-many-arguments
+    task = partial(_encode_batch, codec, optimal, errors)
+    return _run(task, messages, b'', pool, workers, batch_size)
+
+
+def decode_many(blobs: Iterable[Sequence[int]], codec: BaudotCodec,
+                errors: str = 'strict', *, pool: Optional[str] = None,
+                workers: Optional[int] = None,
+                batch_size: int = BATCH_SIZE) -> BatchResult:
+    """
+    Decode several sequences of codes, each one independently.
+
+    :param blobs: Codes to decode, one ``bytes`` object (or other
+        sequence of codes) per message
+    :param codec: Codec to use for decoding
+    :param errors: Policy for invalid codes (see :py:mod:`baudot.errors`)
+    :param pool: Kind of pool spreading the messages, ``'thread'`` or
+        ``'process'``; by default, they are decoded in this thread
+    :param workers: Size of the pool, as many as CPUs by default
+    :param batch_size: Number of messages per task of the pool
+    :return: Concatenated strings and their offsets
+    """
+    # pylint: disable=too-many-arguments
+    task = partial(_decode_batch, codec, errors)
+    return _run(task, blobs, '', pool, workers, batch_size)
+
+
+def _encode_batch(codec: BaudotCodec, optimal: bool, errors: str,
+                  messages: List[str]) -> Tuple[bytes, List[int]]:
+    engine = codec.compile()
+    encode_codes = chunk_encoder(engine, optimal, errors)
+    initial = engine.initial
+    results = []
+    for chars in messages:
+        codes, state = encode_codes(chars, initial)
+        results.append(codes + encode_codes('', state)[0])
+    return b''.join(results), list(map(len, results))
+
+
+def _decode_batch(codec: BaudotCodec, errors: str,
+                  blobs: List[Sequence[int]]) -> Tuple[str, List[int]]:
+    engine = codec.compile()
+    decode_codes, initial = chunk_decoder(engine, errors), engine.initial
+    results = [decode_codes(codes, initial)[0] for codes in blobs]
+    return ''.join(results), list(map(len, results))
+
+
+def _run(task, items: Iterable, empty: Union[bytes, str],
+         pool: Optional[str], workers: Optional[int],
+         batch_size: int) -> BatchResult:
+    # pylint: disable=too-many-arguments
+    if pool is not None and pool not in POOLS:
+        raise ValueError(f"Unsupported pool: {pool}")
+    if batch_size < 1:
+        raise ValueError('The batch size must be positive')
+
+    batches = iter(partial(_take, iter(items), batch_size), [])
+    if pool is None:
+        results = list(map(task, batches))
+    else:
+        # Imported here, as they are slow to import and seldom needed
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor, \
+            ThreadPoolExecutor
+        executor = ThreadPoolExecutor(workers) if pool == 'thread' \
+            else ProcessPoolExecutor(workers)
+        with executor:
+            results = list(executor.map(task, batches))
+
+    data = empty.join(data for data, _ in results)
+    lengths = chain.from_iterable(lengths for _, lengths in results)
+    offsets = array('q', [0])
+    offsets.extend(accumulate(lengths))
+    return BatchResult(data, offsets)
+
+
+def _take(iterator: Iterator, count: int) -> list:
+    return list(islice(iterator, count))
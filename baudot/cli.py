@@ -0,0 +1,254 @@
+"""
+Command-line interface, available as the ``baudot`` command or with
+``python -m baudot``::
+
+    baudot encode --codec ita2 --format tape < message.txt > message.tape
+    baudot decode --codec ita2-us --format hex message.hex
+    baudot transcode --codec ita1 --to-codec ita2 --format packed ...
+
+Inputs are read from the files given as arguments, or from the standard
+input, and converted by chunks in constant memory. The results are
+written to the standard output, or to ``--output``.
+
+With ``--output-dir``, each input file is converted to a file of the
+same name in that directory instead, and ``--jobs`` converts several
+files at the same time in separate processes.
+
+Codecs are looked up by name in :py:mod:`baudot.codecs.registry`, or
+loaded from a table file if the name ends with ``.json`` or ``.toml``
+(see :py:mod:`baudot.codecs.files`).
+"""
+
+import argparse
+import io
+import os
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Optional, Sequence
+
+from . import codecs
+from .core import decode, encode
+from .errors import ERRORS
+from .exceptions import BaudotException
+from .handlers import BaudotReader, BaudotWriter, HexBytesReader, \
+    HexBytesWriter, MappedHexReader, MappedPackedReader, PackedReader, \
+    PackedWriter, TapeReader, TapeWriter
+from .transcode import transcode
+
+__all__ = ['main']
+
+#: Code formats supported by the command-line interface
+FORMATS = ('tape', 'hex', 'packed')
+
+# File suffixes used with --output-dir
+_SUFFIXES = {'tape': '.tape', 'hex': '.hex', 'packed': '.packed'}
+_TEXT_SUFFIX = '.txt'
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the command-line interface.
+
+    :param argv: Command-line arguments, by default ``sys.argv[1:]``
+    :return: Exit status of the command
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'codecs':
+        print('\n'.join(codecs.names()))
+        return 0
+
+    if args.jobs > 1 and not args.output_dir:
+        parser.error('--jobs requires --output-dir')
+    if args.output and args.output_dir:
+        parser.error('--output and --output-dir are mutually exclusive')
+
+    try:
+        if args.output_dir:
+            _convert_batch(args)
+        else:
+            with ExitStack() as stack:
+                output = _open_output(args, args.output, stack)
+                for path in args.files or [None]:
+                    _convert(args, path, output)
+    except (BaudotException, OSError) as exc:
+        print(f'{parser.prog}: error: {exc}', file=sys.stderr)
+        return 1
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='baudot', description='Encode and decode 5-bit Baudot codes.')
+    commands = parser.add_subparsers(dest='command', metavar='command',
+                                     required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        'files', nargs='*', metavar='FILE',
+        help='input files (default: standard input)')
+    common.add_argument(
+        '-c', '--codec', type=_codec, default='ita2',
+        help='codec name, or path to a table file (default: ita2)')
+    common.add_argument(
+        '-f', '--format', choices=FORMATS, default='tape',
+        help='format of the codes (default: tape)')
+    common.add_argument(
+        '-e', '--errors', choices=ERRORS, default='strict',
+        help='policy for invalid input (default: strict)')
+    common.add_argument(
+        '-o', '--output', metavar='FILE',
+        help='output file (default: standard output)')
+    common.add_argument(
+        '-d', '--output-dir', metavar='DIR',
+        help='convert each input file to a file in this directory')
+    common.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N',
+        help='number of files converted in parallel (with --output-dir)')
+
+    encode_parser = commands.add_parser(
+        'encode', parents=[common], help='encode text to codes')
+    encode_parser.add_argument(
+        '--optimal', action='store_true',
+        help='look for the shortest encoding')
+
+    commands.add_parser('decode', parents=[common],
+                        help='decode codes to text')
+
+    transcode_parser = commands.add_parser(
+        'transcode', parents=[common],
+        help='convert codes to another codec or format')
+    transcode_parser.add_argument(
+        '--to-codec', type=_codec,
+        help='codec of the output (default: same as --codec)')
+    transcode_parser.add_argument(
+        '--to-format', choices=FORMATS,
+        help='format of the output (default: same as --format)')
+
+    commands.add_parser('codecs', help='list the available codecs')
+    return parser
+
+
+def _codec(name: str) -> codecs.BaudotCodec:
+    if name.lower().endswith(('.json', '.toml')):
+        # pylint: disable=import-outside-toplevel
+        from .codecs.files import load_codec
+        try:
+            return load_codec(name)
+        except (BaudotException, OSError, ValueError) as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from exc
+    try:
+        return codecs.get(name)
+    except LookupError as exc:
+        raise argparse.ArgumentTypeError(
+            f"{exc} (available: {', '.join(codecs.names())})") from exc
+
+
+def _output_format(args: argparse.Namespace) -> Optional[str]:
+    """Format of the output codes, ``None`` for text"""
+    if args.command == 'encode':
+        return args.format
+    if args.command == 'transcode':
+        return args.to_format or args.format
+    return None
+
+
+def _convert(args: argparse.Namespace, path: Optional[str], output):
+    """Convert one input to an opened output"""
+    with ExitStack() as stack:
+        if args.command == 'encode':
+            stream = _open_text(path, 'r', stack)
+            encode(stream, args.codec, output, args.optimal,
+                   errors=args.errors)
+            return
+
+        reader = _open_reader(args.format, path, args.errors, stack)
+        if args.command == 'decode':
+            decode(reader, args.codec, output, errors=args.errors)
+        else:
+            transcode(reader, args.codec, args.to_codec or args.codec,
+                      output, args.errors)
+
+
+def _convert_batch(args: argparse.Namespace):
+    """Convert each input file to a file in the output directory"""
+    if not args.files:
+        raise BaudotException('--output-dir requires input files')
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    fmt = _output_format(args)
+    suffix = _SUFFIXES[fmt] if fmt else _TEXT_SUFFIX
+    outputs = [os.path.join(args.output_dir, Path(path).stem + suffix)
+               for path in args.files]
+    if len(set(outputs)) < len(outputs):
+        raise BaudotException('Several input files have the same name')
+
+    if args.jobs <= 1:
+        for path, output in zip(args.files, outputs):
+            _convert_file(args, path, output)
+        return
+
+    with ProcessPoolExecutor(args.jobs) as executor:
+        futures = [executor.submit(_convert_file, args, path, output)
+                   for path, output in zip(args.files, outputs)]
+        for future in futures:
+            future.result()
+
+
+def _convert_file(args: argparse.Namespace, path: str, output: str):
+    with ExitStack() as stack:
+        _convert(args, path, _open_output(args, output, stack))
+
+
+def _open_output(args: argparse.Namespace, path: Optional[str],
+                 stack: ExitStack):
+    """Open the output stream or writer of a command"""
+    fmt = _output_format(args)
+    if fmt is None or fmt == 'tape':
+        stream = _open_text(path, 'w', stack)
+        return stack.enter_context(TapeWriter(stream)) if fmt else stream
+
+    stream = _open_binary(path, 'w', stack)
+    writer: BaudotWriter = HexBytesWriter(stream) if fmt == 'hex' \
+        else PackedWriter(stream)
+    return stack.enter_context(writer)
+
+
+def _open_reader(fmt: str, path: Optional[str], errors: str,
+                 stack: ExitStack) -> BaudotReader:
+    reader: BaudotReader
+    if fmt == 'tape':
+        reader = TapeReader(_open_text(path, 'r', stack))
+    elif path is not None and stat.S_ISREG(os.stat(path).st_mode):
+        # Memory-mapped readers are faster on regular files
+        reader = MappedHexReader(path, errors) if fmt == 'hex' \
+            else MappedPackedReader(path)
+    else:
+        stream = _open_binary(path, 'r', stack)
+        reader = HexBytesReader(stream, errors) if fmt == 'hex' \
+            else PackedReader(stream)
+    return stack.enter_context(reader)
+
+
+def _open_binary(path: Optional[str], mode: str, stack: ExitStack):
+    if path is None:
+        return sys.stdin.buffer if mode == 'r' else sys.stdout.buffer
+    return stack.enter_context(open(path, mode + 'b'))
+
+
+def _open_text(path: Optional[str], mode: str, stack: ExitStack):
+    # Line endings are kept as is: CR and LF are distinct codes
+    if path is not None:
+        return stack.enter_context(
+            open(path, mode, encoding='utf-8', newline=''))
+
+    wrapper = io.TextIOWrapper(_open_binary(None, mode, stack),
+                               encoding='utf-8', newline='')
+    # Flush and detach on exit, to leave the standard stream open
+    stack.callback(wrapper.detach)
+    stack.callback(wrapper.flush)
+    return wrapper
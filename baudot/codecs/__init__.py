@@ -1,9 +1,37 @@
-
 """
 Codecs are the tools used to convert encoded-data (5-bit digits)
 into Unicode characters and back.
+
+The built-in codecs below are only built when first accessed.
 """
 
+from typing import TYPE_CHECKING
+
 from .core import BaudotCodec, SimpleTabledCodec, Shift
-from .ita1_baudot import ITA1_CONTINENTAL, ITA1_UK
-from .ita2_baudot_murray import ITA2_STANDARD, ITA2_US
+from .core import CodecEngine, CompiledCodec, compile_tabled
+from .registry import get, names, register
+
+if TYPE_CHECKING:  # Imported on first access, see __getattr__
+    from .ita1_baudot import ITA1_CONTINENTAL, ITA1_UK
+    from .ita2_baudot_murray import ITA2_STANDARD, ITA2_US
+
+__all__ = ['BaudotCodec', 'SimpleTabledCodec', 'Shift', 'CodecEngine',
+           'CompiledCodec', 'compile_tabled', 'get', 'names', 'register',
+           'ITA1_CONTINENTAL', 'ITA1_UK', 'ITA2_STANDARD', 'ITA2_US']
+
+_BUILTINS = {
+    'ITA1_CONTINENTAL': 'ita1',
+    'ITA1_UK': 'ita1-uk',
+    'ITA2_STANDARD': 'ita2',
+    'ITA2_US': 'ita2-us',
+}
+
+
+def __getattr__(name: str):
+    if name in _BUILTINS:
+        return get(_BUILTINS[name])
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_BUILTINS))
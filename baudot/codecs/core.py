@@ -6,16 +6,24 @@ These tools handle encoding and decoding *per character*;
 the core logic of stateful encoding is in ``baudot.core``
 """
 
+import re
 from abc import ABC, abstractmethod
 from collections import namedtuple, defaultdict
-from typing import List, Dict, Union, Tuple, Set, Optional
+from typing import (
+    Any, List, NamedTuple, Pattern, Sequence, Dict, Union, Tuple, Set,
+    Optional)
 
 from ..exceptions import IncoherentTable, DecodingError, EncodingError
 
-__all__ = ['Shift', 'BaudotCodec', 'SimpleTabledCodec']
+__all__ = ['Shift', 'BaudotCodec', 'SimpleTabledCodec',
+           'CodecEngine', 'CompiledCodec', 'compile_tabled']
 
 Shift = namedtuple('Shift', ('name',))
 
+#: Below this average number of characters per state change, encoding
+#: character by character is faster than encoding by runs
+MIN_RUN = 8
+
 Value = Union[str, Shift]
 Table = List[Value]
 
@@ -39,6 +47,16 @@ class BaudotCodec(ABC):
         Abstract method for decoding a single code.
         """
 
+    def compile(self) -> 'CodecEngine':
+        """
+        Get the stateful engine used by ``baudot.core`` for this codec.
+
+        The default engine simply calls :py:meth:`encode` and
+        :py:meth:`decode` for each value. Subclasses may return a
+        faster engine if they know their whole table.
+        """
+        return CodecEngine(self)
+
 
 class SimpleTabledCodec(BaudotCodec):
     """
@@ -51,9 +69,11 @@ class SimpleTabledCodec(BaudotCodec):
     The ``Shift`` instances are the only control characters this
     library knows of. Any other must be taken from ASCII/Unicode.
     """
+    # pylint: disable=too-many-instance-attributes
 
     __slots__ = ['name', 'shifts', 'alphabet', 'decoding_table',
-                 'encoding_single', 'encoding_any', 'encoding_others']
+                 'encoding_single', 'encoding_any', 'encoding_others',
+                 '_compiled']
 
     def __init__(self, name: str, tables: Dict[Shift, Table]):
 
@@ -70,6 +90,7 @@ class SimpleTabledCodec(BaudotCodec):
         self.encoding_single: Dict[Value, Tuple[int, Shift]] = enc_single
         self.encoding_any: Dict[Value, int] = enc_any
         self.encoding_others: Dict[Value, Set[Tuple[int, Shift]]] = enc_others
+        self._compiled: Optional[CompiledCodec] = None
 
     def encode(self, value: Value, state: Shift) -> Tuple[int, Shift]:
         """
@@ -97,18 +118,14 @@ class SimpleTabledCodec(BaudotCodec):
         if value not in self.encoding_others:
             raise EncodingError(f"Unsupported value {value}")
 
-        # The logic below handles other cases. This will need more work.
-
-        # TODO: Allow char with codes in two states but not in a third
-        # TODO: Allow char that appears twice in a single state
-        matches = self.encoding_others[value]
-        try:
-            # This logic handles the case where a same character exists
-            # in multiple states but with different codes. Just return
-            # the code that works with the current state.
-            return next((code, st) for code, st in matches if st == state)
-        except StopIteration:
-            raise NotImplementedError("This char encodes in a weird way.")
+        # The value exists in several states with different codes, or
+        # several times in a state. Prefer a code that works with the
+        # current state, otherwise switch to the first state having it.
+        states = list(self.decoding_table)
+        matches = sorted(self.encoding_others[value],
+                         key=lambda match: (states.index(match[1]), match[0]))
+        return next(((code, st) for code, st in matches if st == state),
+                    matches[0])
 
     def decode(self, code: int, state: Optional[Shift]) -> Value:
         """
@@ -133,6 +150,411 @@ class SimpleTabledCodec(BaudotCodec):
 
         return self.decoding_table[state][code]
 
+    def compile(self) -> 'CompiledCodec':
+        """
+        Get the compiled form of this codec. It is built on first use,
+        then cached.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledCodec(self)
+        return self._compiled
+
+
+class CodecEngine:
+    """
+    Stateful encoding and decoding of single values, on top of any codec.
+
+    This is what ``baudot.core`` uses to run a codec. The states it
+    handles are opaque to the caller: start from :py:attr:`initial`,
+    then always pass the state returned by the previous call.
+
+    This generic engine uses ``Shift`` instances as states, and calls
+    the codec's own methods for every value.
+    """
+
+    initial: Any = None
+
+    def __init__(self, codec: BaudotCodec):
+        self.codec = codec
+
+    def encode_char(self, char: str, state: Any) -> Tuple[bytes, Any]:
+        """
+        Encode a character, including the shift code it may require.
+
+        :param char: Character to encode
+        :param state: Current state of encoding
+        :return: Codes to emit, and the new state
+        """
+        code, new_state = self.codec.encode(char, state)
+        if new_state == state:
+            return bytes((code,)), state
+
+        state_code, _ = self.codec.encode(new_state, None)
+        return bytes((state_code, code)), new_state
+
+    def decode_code(self, code: int, state: Any) -> Tuple[str, Any]:
+        """
+        Decode a single code.
+
+        :param code: Code to decode
+        :param state: Current state of decoding
+        :return: Decoded characters (empty on a shift), and the new state
+        """
+        value = self.codec.decode(code, state)
+        if isinstance(value, Shift):
+            return '', value
+        return value, state
+
+    def shift_of(self, state: Any) -> Optional[Shift]:
+        """
+        Get the shift corresponding to a state of this engine.
+
+        :param state: State of this engine
+        :return: Corresponding shift, or ``None`` for the initial state
+        """
+        return state
+
+    def state_of(self, shift: Optional[Shift]) -> Any:
+        """
+        Get the state of this engine corresponding to a shift: the
+        inverse of :py:meth:`shift_of`.
+
+        :param shift: Shift of the codec, or ``None`` for the initial state
+        :return: Corresponding state of this engine
+        """
+        return shift
+
+    def guess_state(self, state: Any) -> Any:
+        """
+        Guess the actual state when a code cannot be decoded in the
+        given one, typically because it is the initial state.
+
+        The generic engine knows nothing of the codec's states, so it
+        returns the state unchanged.
+
+        :param state: State in which decoding failed
+        :return: Most likely state
+        """
+        return state
+
+    def resync_state(self, state: Any, following: Sequence[int]) -> Any:
+        """
+        Guess the state again after an invalid code, which may have been
+        a lost shift code.
+
+        The generic engine knows nothing of the codec's states, so it
+        returns the state unchanged.
+
+        :param state: State before the invalid code
+        :param following: Codes received after the invalid code
+        :return: Most likely state after the invalid code
+        """
+        # pylint: disable=unused-argument
+        return state
+
+    def encode_codes(self, chars: str, state: Any) -> Tuple[bytes, Any]:
+        """
+        Encode a whole string, shift codes included.
+
+        :param chars: Characters to encode
+        :param state: Current state of encoding
+        :return: Codes to emit (one per byte), and the new state
+        """
+        codes = bytearray()
+        for char in chars:
+            value, state = self.encode_char(char, state)
+            codes += value
+        return bytes(codes), state
+
+    def decode_codes(self, codes: Sequence[int], state: Any) -> Tuple[str, Any]:
+        """
+        Decode a whole sequence of codes.
+
+        :param codes: Codes to decode, e.g. a ``bytes`` object
+        :param state: Current state of decoding
+        :return: Decoded string, and the new state
+        """
+        chars = []
+        for code in codes:
+            value, state = self.decode_code(code, state)
+            chars.append(value)
+        return ''.join(chars), state
+
+
+class CompiledCodec(CodecEngine):
+    """
+    Engine running a :py:class:`SimpleTabledCodec` from flat tables.
+
+    States are integer ids instead of ``Shift`` instances: the id of a
+    state is the offset of its row in :py:attr:`decoding`, that is 32
+    times its index in :py:attr:`states`. Index 0 is the initial state
+    (``None``), in which only unambiguous codes can be decoded.
+
+    All lookups are precomputed by running the codec itself, so this
+    engine behaves exactly like the generic one.
+    """
+
+    initial: int = 0
+
+    def __init__(self, codec: SimpleTabledCodec):
+        super().__init__(codec)
+
+        #: All states, as ``None`` then the codec's shifts
+        self.states: Tuple[Optional[Shift], ...] = \
+            (None,) + tuple(codec.decoding_table)
+        ids = {state: 32 * i for i, state in enumerate(self.states)}
+
+        #: Flat decoding table, indexed by ``state + code``.
+        #: Entries are ``(chars, new_state)``, or ``None`` if the code
+        #: cannot be decoded in that state.
+        self.decoding: List[Optional[Tuple[str, int]]] = []
+        for state in self.states:
+            for code in range(32):
+                try:
+                    value = codec.decode(code, state)
+                except DecodingError:
+                    self.decoding.append(None)
+                    continue
+                if isinstance(value, Shift):
+                    self.decoding.append(('', ids[value]))
+                else:
+                    self.decoding.append((value, ids[state]))
+
+        #: Encoding tables, indexed by state then character. Entries
+        #: are the codes to emit (shift included) and the new state.
+        self.encoding: Dict[int, Dict[str, Tuple[bytes, int]]] = {}
+        for state in self.states:
+            table = self.encoding[ids[state]] = {}
+            for char in codec.alphabet:
+                try:
+                    codes, new_state = super().encode_char(char, state)
+                except EncodingError:
+                    continue
+                table[char] = codes, ids[new_state]
+
+        self._runs = _make_runs(self.encoding)
+        # Shift codes selecting the same state from any state
+        self._sync = {code: state for code, state in self.shift_codes().items()
+                      if state is not None}
+
+    def encode_char(self, char: str, state: int) -> Tuple[bytes, int]:
+        try:
+            return self.encoding[state][char]
+        except KeyError:
+            raise self._encoding_error(char, state) from None
+
+    def decode_code(self, code: int, state: int) -> Tuple[str, int]:
+        if not 0 <= code < 32:
+            raise DecodingError(f"Invalid code: {code}")
+        entry = self.decoding[state + code]
+        if entry is None:
+            raise DecodingError(
+                f"Unrecognized state: {self.states[state // 32]}")
+        return entry
+
+    def shift_of(self, state: int) -> Optional[Shift]:
+        return self.states[state // 32]
+
+    def state_of(self, shift: Optional[Shift]) -> int:
+        return 32 * self.states.index(shift)
+
+    def shift_codes(self) -> Dict[int, Optional[int]]:
+        """
+        Find the codes that are shifts in some state.
+
+        :return: Each of these codes, with the state it selects from any
+            state in which it can be decoded, or ``None`` if that depends
+            on the state (or if the code also decodes to characters)
+        """
+        shifts: Dict[int, Optional[int]] = {}
+        for code in range(32):
+            entries = set(self.decoding[code::32])
+            entries.discard(None)
+            if any(not chars for chars, _ in entries):
+                (_, state), *others = entries
+                shifts[code] = None if others else state
+        return shifts
+
+    def guess_state(self, state: int) -> int:
+        """
+        Guess the actual state when a code cannot be decoded in the
+        given one: the first state of the codec's table (e.g. letters)
+        when starting, otherwise the state unchanged.
+        """
+        return 32 if state == self.initial else state
+
+    def resync_state(self, state: int, following: Sequence[int]) -> int:
+        """
+        Guess the state again after an invalid code, from the next shift
+        code among the following ones. A shift is only sent to leave
+        another state: if the next one selects the current state, a
+        shift to another state was most likely lost. With two states,
+        the other state is then used; otherwise, or if there is no shift
+        code in ``following``, the state is unchanged.
+        """
+        sync = self._sync
+        target = next((sync[code] for code in following if code in sync),
+                      None)
+        others = [other for other in range(32, 32 * len(self.states), 32)
+                  if other != target]
+        if target == state and len(others) == 1:
+            return others[0]
+        return state
+
+    def encode_codes(self, chars: str, state: int) -> Tuple[bytes, int]:
+        runs = self._runs
+        if runs is None or runs.invalid.search(chars):
+            return self._encode_each(chars, state)
+
+        # Characters are translated to their codes all at once. Shift
+        # codes are then inserted at the start of the runs of characters
+        # of another state, found by a single pattern.
+        codes = chars.translate(runs.translation)
+        shifts, states = runs.shifts, runs.states
+        pieces = []
+        last = count = 0
+
+        for run in runs.pattern.finditer(chars):
+            new_state = states[run.lastindex]
+            if new_state == state:
+                continue
+            start = run.start()
+            pieces.append(codes[last:start])
+            pieces.append(shifts[state, new_state])
+            last, state = start, new_state
+
+            count += 1
+            if count >= 32 and start < count * MIN_RUN:
+                # Runs are too short, finish character by character
+                rest, state = self._encode_each(chars[start:], state)
+                return ''.join(pieces).encode('latin-1') + rest, state
+
+        pieces.append(codes[last:])
+        return ''.join(pieces).encode('latin-1'), state
+
+    def _encode_each(self, chars: str, state: int) -> Tuple[bytes, int]:
+        tables = self.encoding
+        table = tables[state]
+        codes = bytearray()
+
+        try:
+            for char in chars:
+                value, new_state = table[char]
+                codes += value
+                if new_state != state:
+                    state = new_state
+                    table = tables[state]
+        except KeyError:
+            raise self._encoding_error(char, state) from None
+
+        return bytes(codes), state
+
+    def decode_codes(self, codes: Sequence[int], state: int) -> Tuple[str, int]:
+        if codes and max(codes) >= 32:
+            code = next(c for c in codes if c >= 32)
+            raise DecodingError(f"Invalid code: {code}")
+
+        table = self.decoding
+        chars = []
+        append = chars.append
+
+        try:
+            for code in codes:
+                char, state = table[state + code]
+                append(char)
+        except TypeError:  # Unpacking a None entry
+            raise DecodingError(
+                f"Unrecognized state: {self.states[state // 32]}") from None
+
+        return ''.join(chars), state
+
+    def _encoding_error(self, char: str, state: int) -> EncodingError:
+        # Let the codec raise the appropriate error, if any
+        super().encode_char(char, self.states[state // 32])
+        return EncodingError(f"Unsupported value {char}")
+
+
+def compile_tabled(codec: BaudotCodec, purpose: str) -> CompiledCodec:
+    """
+    Get the compiled engine of a codec, for tools that need its flat tables.
+
+    :param codec: Codec to compile
+    :param purpose: What the engine is needed for, for the error message
+    :raises TypeError: If the codec does not compile to a
+        :py:class:`CompiledCodec`
+    """
+    engine = codec.compile()
+    if not isinstance(engine, CompiledCodec):
+        raise TypeError(f'{purpose} requires a SimpleTabledCodec')
+    return engine
+
+
+class _Runs(NamedTuple):
+    invalid: Pattern  # Characters that cannot be encoded
+    translation: Dict[int, str]  # Code of each character
+    pattern: Pattern  # Runs of characters, one group per state
+    states: Tuple[int, ...]  # State of each group of the pattern
+    shifts: Dict[Tuple[int, int], str]  # Shift codes between states
+
+
+def _make_runs(encoding: Dict[int, Dict[str, Tuple[bytes, int]]]
+               ) -> Optional[_Runs]:
+    """
+    Tables for encoding by runs (see :py:meth:`CompiledCodec.encode_codes`),
+    or ``None`` if the code of a character or of a shift depends on the
+    current state.
+    """
+    translation: Dict[int, str] = {}
+    any_chars: List[str] = []
+    state_chars: Dict[int, List[str]] = defaultdict(list)
+    shifts: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+
+    for char in encoding[0]:
+        if len(char) != 1:
+            continue  # Never used when encoding character by character
+        entries = [(state, table.get(char))
+                   for state, table in encoding.items()]
+        if any(entry is None for _, entry in entries):
+            return None
+
+        codes = {value[-1:] for _, (value, _) in entries}
+        targets = {new_state for _, (_, new_state) in entries}
+        if len(codes) > 1:
+            return None
+        translation[ord(char)] = codes.pop().decode('latin-1')
+
+        if all(new_state == state and len(value) == 1
+               for state, (value, new_state) in entries):
+            any_chars.append(char)
+        elif len(targets) == 1:
+            target = targets.pop()
+            if len(encoding[target][char][0]) != 1:
+                return None
+            state_chars[target].append(char)
+            for state, (value, _) in entries:
+                if state != target:
+                    shifts[state, target].add(value[:-1].decode('latin-1'))
+        else:
+            return None
+
+    if any(len(codes) > 1 for codes in shifts.values()):
+        return None
+
+    def char_class(chars):
+        return f"[{re.escape(''.join(chars))}]"
+
+    pattern = '|'.join(f'({char_class(chars)}{char_class(chars + any_chars)}*)'
+                       for chars in state_chars.values())
+    alphabet = ''.join(map(chr, translation))
+    return _Runs(
+        invalid=re.compile(f'[^{re.escape(alphabet)}]' if alphabet else '.',
+                           re.DOTALL),
+        translation=translation,
+        pattern=re.compile(pattern or '(?!)'),
+        states=(0,) + tuple(state_chars),
+        shifts={key: codes.pop() for key, codes in shifts.items()},
+    )
+
 
 def _verify_tables(tables: Dict[Shift, Table]):
     """
@@ -0,0 +1,177 @@
+"""
+Loading of codec tables from JSON or TOML files.
+
+A table file holds the name of the codec and one table of 32 entries
+per state. Entries are characters, or ``{"shift": "<state name>"}``
+objects for the state shifts. For example, in JSON::
+
+    {
+        "name": "My teleprinter code",
+        "tables": {
+            "Letters": ["\\u0000", "E", "\\n", ..., {"shift": "Letters"}],
+            "Figures": ["\\u0000", "3", "\\n", ..., {"shift": "Letters"}]
+        }
+    }
+
+Or in TOML (which requires Python 3.11, or the ``tomli`` package)::
+
+    name = "My teleprinter code"
+
+    [tables]
+    Letters = ["\\u0000", "E", "\\n", ..., {shift = "Letters"}]
+    Figures = ["\\u0000", "3", "\\n", ..., {shift = "Letters"}]
+
+Building a codec verifies its tables and computes its encoding and
+compiled tables, which takes time. Loaded codecs are therefore cached
+on disk, keyed by a hash of the table file: the next load of the same
+file, even from another process, skips all of that work.
+
+The cache uses :py:mod:`pickle`, so the cache directory must only be
+writable by trusted users.
+"""
+
+import json
+import os
+import pickle
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, Optional, Union
+
+from .core import Shift, SimpleTabledCodec, Table
+from ..exceptions import IncoherentTable
+
+__all__ = ['load_codec', 'parse_codec', 'default_cache_dir']
+
+PathLike = Union[str, 'os.PathLike[str]']
+
+# Changing how codecs are built or stored must invalidate the cache
+_CACHE_VERSION = b'baudot-codec-cache-3\n'
+
+
+def load_codec(path: PathLike, cache: bool = True,
+               cache_dir: Optional[PathLike] = None) -> SimpleTabledCodec:
+    """
+    Load a codec from a JSON or TOML table file. The format is given
+    by the file extension, ``.json`` or ``.toml``.
+
+    :param path: Path to the table file
+    :param cache: Whether to use the on-disk cache of built codecs
+    :param cache_dir: Cache directory, by default the one given by
+        :py:func:`default_cache_dir`
+    :return: Codec defined by the file, already compiled
+    :raises IncoherentTable: If the file does not define a valid codec
+    """
+    path = Path(path)
+    data = path.read_bytes()
+
+    if not cache:
+        return parse_codec(data, path.suffix)
+
+    key = sha256(_CACHE_VERSION + data).hexdigest()
+    cache_file = Path(cache_dir or default_cache_dir()) / f'{key}.pickle'
+
+    try:
+        with open(cache_file, 'rb') as file:
+            codec = pickle.load(file)
+        if isinstance(codec, SimpleTabledCodec):
+            return codec
+    except Exception:  # pylint: disable=broad-except
+        # Missing, unreadable or corrupt cache: rebuild it
+        pass
+
+    codec = parse_codec(data, path.suffix)
+    _write_cache(cache_file, codec)
+    return codec
+
+
+def parse_codec(data: Union[bytes, str], fmt: str = 'json'
+                ) -> SimpleTabledCodec:
+    """
+    Build a codec from the contents of a table file.
+
+    :param data: Contents of a table file
+    :param fmt: Format of the contents, ``json`` or ``toml`` (a leading
+        dot is ignored, so file suffixes can be passed)
+    :return: Codec defined by the file, already compiled
+    :raises IncoherentTable: If the contents do not define a valid codec
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+
+    fmt = fmt.lower().lstrip('.')
+    if fmt == 'json':
+        document = json.loads(data)
+    elif fmt == 'toml':
+        document = _toml_loads(data)
+    else:
+        raise ValueError(f'Unsupported table file format: {fmt}')
+
+    if not isinstance(document, dict) or \
+            not isinstance(document.get('tables'), dict):
+        raise IncoherentTable('A table file must have a "tables" mapping')
+
+    name = document.get('name', '')
+    if not isinstance(name, str):
+        raise IncoherentTable('The codec name must be a string')
+
+    tables: Dict[Shift, Table] = {
+        Shift(state): [_parse_value(value) for value in table]
+        for state, table in document['tables'].items()
+    }
+    codec = SimpleTabledCodec(name, tables)
+    codec.compile()
+    return codec
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default cache directory of loaded codecs: the
+    ``BAUDOT_CACHE_DIR`` environment variable if set, otherwise
+    ``baudot`` in the user's cache directory.
+    """
+    if os.environ.get('BAUDOT_CACHE_DIR'):
+        return Path(os.environ['BAUDOT_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'baudot'
+
+
+def _parse_value(value: Any):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict) and list(value) == ['shift'] \
+            and isinstance(value['shift'], str):
+        return Shift(value['shift'])
+    raise IncoherentTable(f'Invalid table entry: {value!r}')
+
+
+def _toml_loads(data: str) -> Dict[str, Any]:
+    # pylint: disable=import-outside-toplevel
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError as exc:
+            raise ImportError(
+                'TOML table files require Python 3.11+ or tomli: '
+                'pip install tomli'
+            ) from exc
+    return tomllib.loads(data)
+
+
+def _write_cache(cache_file: Path, codec: SimpleTabledCodec):
+    # Write to a temporary file then rename it, so that concurrent
+    # processes never read a partial cache file
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=cache_file.parent, delete=False) as file:
+            try:
+                pickle.dump(codec, file, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, cache_file)
+    except OSError:
+        # The cache is only an optimization
+        pass
@@ -0,0 +1,126 @@
+"""
+Registry of the available codecs, by name.
+
+Codecs are only imported and built when first requested, then cached.
+Besides the built-in codecs, other packages can provide codecs through
+the ``baudot.codecs`` entry point group: the name of the entry point is
+the name of the codec, and its object is either a codec or a callable
+returning one. For example, in a ``setup.cfg``::
+
+    [options.entry_points]
+    baudot.codecs =
+        my-codec = my_package.codecs:MY_CODEC
+"""
+
+from importlib import import_module
+from typing import Callable, Dict, List, Union
+
+from .core import BaudotCodec
+from ..exceptions import CodecNotFound
+
+__all__ = ['get', 'names', 'register']
+
+ENTRY_POINT_GROUP = 'baudot.codecs'
+
+Factory = Union[str, Callable[[], BaudotCodec], BaudotCodec]
+
+_FACTORIES: Dict[str, Factory] = {
+    'ita1': 'baudot.codecs.ita1_baudot:ITA1_CONTINENTAL',
+    'ita1-uk': 'baudot.codecs.ita1_baudot:ITA1_UK',
+    'ita2': 'baudot.codecs.ita2_baudot_murray:ITA2_STANDARD',
+    'ita2-us': 'baudot.codecs.ita2_baudot_murray:ITA2_US',
+}
+_CACHE: Dict[str, BaudotCodec] = {}
+_ENTRY_POINTS_LOADED = False
+
+
+def get(name: str) -> BaudotCodec:
+    """
+    Get a codec by name, building it on first use.
+
+    Names are case-insensitive, and underscores or spaces may be used
+    instead of hyphens (``ITA2_US`` is the same as ``ita2-us``).
+
+    :param name: Name of the codec
+    :return: Codec instance, the same on every call
+    :raises CodecNotFound: If no codec has this name
+    """
+    name = normalize(name)
+    if name in _CACHE:
+        return _CACHE[name]
+
+    if name not in _FACTORIES:
+        _load_entry_points()
+    if name not in _FACTORIES:
+        raise CodecNotFound(f'Unknown codec: {name}')
+
+    codec = _CACHE[name] = _build(_FACTORIES[name])
+    return codec
+
+
+def names() -> List[str]:
+    """
+    Get the names of all available codecs, without building them.
+
+    :return: Sorted list of normalized codec names
+    """
+    _load_entry_points()
+    return sorted(_FACTORIES)
+
+
+def register(name: str, factory: Factory):
+    """
+    Register a codec under a name. Registering an existing name
+    replaces the previous codec.
+
+    :param name: Name of the codec
+    :param factory: The codec itself, a callable returning it, or the
+        ``'module:attribute'`` path to either, imported on first use
+    """
+    name = normalize(name)
+    _FACTORIES[name] = factory
+    _CACHE.pop(name, None)
+
+
+def normalize(name: str) -> str:
+    """Get the normalized form of a codec name"""
+    return name.strip().lower().replace('_', '-').replace(' ', '-')
+
+
+def _build(factory: Factory) -> BaudotCodec:
+    if isinstance(factory, str):
+        module, _, attribute = factory.partition(':')
+        factory = getattr(import_module(module), attribute)
+    if not isinstance(factory, BaudotCodec):
+        factory = factory()
+    if not isinstance(factory, BaudotCodec):
+        raise TypeError(f'Not a BaudotCodec: {factory!r}')
+    return factory
+
+
+def _load_entry_points():
+    global _ENTRY_POINTS_LOADED  # pylint: disable=global-statement
+    if _ENTRY_POINTS_LOADED:
+        return
+    _ENTRY_POINTS_LOADED = True
+
+    for entry_point in _entry_points():
+        # Codecs registered at runtime take precedence
+        _FACTORIES.setdefault(normalize(entry_point.name), entry_point.value)
+
+
+def _entry_points():
+    # Importing the metadata tools is slow, only do it when needed
+    # pylint: disable=import-outside-toplevel
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python 3.7
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return found.select(group=ENTRY_POINT_GROUP)
+    return found.get(ENTRY_POINT_GROUP, [])
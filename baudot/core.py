@@ -2,14 +2,62 @@
 Core encoding/decoding logic of the library
 """
 
-from io import TextIOBase, StringIO
-from typing import Optional
+from io import TextIOBase
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
 from .handlers import BaudotReader, BaudotWriter
-from .codecs import BaudotCodec, Shift
+from .codecs import BaudotCodec, CodecEngine, CompiledCodec
+from .errors import ErrorReport, check_errors, tolerant_decoder, \
+    tolerant_encoder
+from .optimal import chunked_encoder
+from .stats import CodecStats
 
+#: Number of characters or codes processed at once by the stream functions
+CHUNK_SIZE = 8192
 
-def encode(stream: TextIOBase, codec: BaudotCodec, writer: BaudotWriter):
+
+def encode_to_codes(chars: str, codec: BaudotCodec, optimal: bool = False,
+                    errors: str = 'strict',
+                    report: Optional[ErrorReport] = None) -> bytes:
+    """
+    Encode a unicode string to codes, using the given codec.
+
+    :param chars: Unicode string to encode
+    :param codec: Codec to use for encoding
+    :param optimal: Whether to look for the shortest possible encoding
+        (see :py:mod:`baudot.optimal`) instead of encoding greedily
+    :param errors: Policy for unsupported characters
+        (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the unsupported characters
+    :return: Encoded codes, one per byte
+    """
+    engine = codec.compile()
+    encoder = chunk_encoder(engine, optimal, errors, report)
+    codes, state = encoder(chars, engine.initial)
+    return codes + encoder('', state)[0]
+
+
+def decode_codes(codes: Sequence[int], codec: BaudotCodec,
+                 errors: str = 'strict',
+                 report: Optional[ErrorReport] = None) -> str:
+    """
+    Decode codes to a unicode string, using the given codec.
+
+    :param codes: Codes to decode, one per byte (``bytes``,
+        ``bytearray`` or ``memoryview``)
+    :param codec: Codec to use for decoding
+    :param errors: Policy for invalid codes (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the invalid codes
+    :return: Decoded Unicode string
+    """
+    engine = codec.compile()
+    chars, _ = chunk_decoder(engine, errors, report)(codes, engine.initial)
+    return chars
+
+
+def encode(stream: TextIOBase, codec: BaudotCodec, writer: BaudotWriter,
+           optimal: bool = False, stats: Optional[CodecStats] = None,
+           errors: str = 'strict', report: Optional[ErrorReport] = None):
     """
     Encode unicode characters from an input stream to an output writer,
     using the given codec.
@@ -17,28 +65,34 @@ def encode(stream: TextIOBase, codec: BaudotCodec, writer: BaudotWriter):
     :param stream: Unicode character stream to encode (can be a file)
     :param codec: Codec to use for encoding
     :param writer: Writer instance for the wanted output format
+    :param optimal: Whether to look for the shortest possible encoding
+    :param stats: Optional object collecting measures of this operation
+    :param errors: Policy for unsupported characters
+        (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the unsupported characters
     """
-    state: Optional[Shift] = None
-    buffer = []
+    # pylint: disable=too-many-arguments
+    engine = codec.compile()
+    encode_codes = chunk_encoder(engine, optimal, errors, report, stats)
+    read, write_many = stream.read, writer.write_many
+    if stats is not None:
+        read, write_many = stats.timed_io(read), stats.timed_io(write_many)
+    state = engine.initial
 
     while True:
-        char = stream.read(1)
-        if not char:  # TextIOBase returns empty character on EOF
+        chars = read(CHUNK_SIZE)
+        # TextIOBase returns empty string on EOF, which also makes the
+        # encoder return the codes of the characters it held back
+        codes, state = encode_codes(chars, state)
+        if codes:
+            write_many(codes)
+        if not chars:
             break
 
-        code, new_state = codec.encode(char, state)
-        buffer.append(code)
 
-        if new_state != state:
-            state_code, _ = codec.encode(new_state, None)
-            buffer.append(state_code)
-            state = new_state
-
-        while buffer:
-            writer.write(buffer.pop(-1))
-
-
-def encode_str(chars: str, codec: BaudotCodec, writer: BaudotWriter):
+def encode_str(chars: str, codec: BaudotCodec, writer: BaudotWriter,
+               optimal: bool = False, errors: str = 'strict',
+               report: Optional[ErrorReport] = None):
     """
     Encode unicode characters from an input string to an output writer,
     using the given codec.
@@ -46,12 +100,18 @@ def encode_str(chars: str, codec: BaudotCodec, writer: BaudotWriter):
     :param chars: Unicode string to encode
     :param codec: Codec to use for encoding
     :param writer: Writer instance for the wanted output format
+    :param optimal: Whether to look for the shortest possible encoding
+    :param errors: Policy for unsupported characters
+        (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the unsupported characters
     """
-    with StringIO(chars) as stream:
-        encode(stream, codec, writer)
+    # pylint: disable=too-many-arguments
+    writer.write_many(encode_to_codes(chars, codec, optimal, errors, report))
 
 
-def decode(reader: BaudotReader, codec: BaudotCodec, stream: TextIOBase):
+def decode(reader: BaudotReader, codec: BaudotCodec, stream: TextIOBase,
+           stats: Optional[CodecStats] = None, errors: str = 'strict',
+           report: Optional[ErrorReport] = None):
     """
     Decode a baudot code stream from a reader to a unicode stream,
     using a given codec.
@@ -59,27 +119,193 @@ def decode(reader: BaudotReader, codec: BaudotCodec, stream: TextIOBase):
     :param reader: Reader instance that will read codes from an input
     :param codec: Codec to use for decoding
     :param stream: Unicode stream to write to (can be a file)
+    :param stats: Optional object collecting measures of this operation
+    :param errors: Policy for invalid codes (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the invalid codes
     """
-    state: Optional[Shift] = None
-
-    for code in reader:
-        value = codec.decode(code, state)
+    # pylint: disable=too-many-arguments
+    engine = codec.compile()
+    decode_codes_ = chunk_decoder(engine, errors, report, stats)
+    read_into, write = reader.read_into, stream.write
+    if stats is not None:
+        read_into, write = stats.timed_io(read_into), stats.timed_io(write)
+    state = engine.initial
 
-        if isinstance(value, Shift):
-            state = value
-        else:
-            stream.write(value)
+    for codes in read_chunks(read_into):
+        chars, state = decode_codes_(codes, state)
+        write(chars)
 
 
-def decode_to_str(reader: BaudotReader, codec: BaudotCodec) -> str:
+def decode_to_str(reader: BaudotReader, codec: BaudotCodec,
+                  errors: str = 'strict',
+                  report: Optional[ErrorReport] = None) -> str:
     """
     Decode a baudot code stream from a reader to a unicode string,
     using a given codec.
 
     :param reader: Reader instance that will read codes from an input
     :param codec: Codec to use for decoding
+    :param errors: Policy for invalid codes (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the invalid codes
     :return: Decoded Unicode string
     """
-    with StringIO('') as stream:
-        decode(reader, codec, stream)
-        return stream.getvalue()
+    codes = bytearray()
+    for chunk in read_chunks(reader.read_into):
+        codes += chunk
+    return decode_codes(codes, codec, errors, report)
+
+
+def iter_encode(chunks: Iterable[str], codec: BaudotCodec,
+                optimal: bool = False, errors: str = 'strict',
+                report: Optional[ErrorReport] = None) -> Iterator[bytes]:
+    """
+    Encode chunks of unicode characters lazily, keeping the shift state
+    from a chunk to the next. Only one chunk is held at a time, so the
+    input may be endless.
+
+    :param chunks: Iterable of unicode strings, of any size
+    :param codec: Codec to use for encoding
+    :param optimal: Whether to look for the shortest possible encoding
+    :param errors: Policy for unsupported characters
+        (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the unsupported characters
+    :return: Iterator of the encoded codes (one per byte), one
+        non-empty ``bytes`` object per input chunk at most, and one at
+        the end
+    """
+    engine = codec.compile()
+    encode_codes = chunk_encoder(engine, optimal, errors, report)
+    state = engine.initial
+    for chars in chunks:
+        if not chars:
+            continue  # Would end the input of the encoder
+        codes, state = encode_codes(chars, state)
+        if codes:
+            yield codes
+    codes, state = encode_codes('', state)
+    if codes:
+        yield codes
+
+
+def iter_decode(chunks: Iterable[Sequence[int]], codec: BaudotCodec,
+                errors: str = 'strict',
+                report: Optional[ErrorReport] = None) -> Iterator[str]:
+    """
+    Decode chunks of codes lazily, keeping the shift state from a chunk
+    to the next. Only one chunk is held at a time, so the input may be
+    endless.
+
+    :param chunks: Iterable of codes (``bytes``, ``bytearray`` or
+        ``memoryview``, one code per byte), of any size
+    :param codec: Codec to use for decoding
+    :param errors: Policy for invalid codes (see :py:mod:`baudot.errors`)
+    :param report: Optional report of the invalid codes
+    :return: Iterator of the decoded strings, one non-empty string per
+        input chunk at most
+    """
+    engine = codec.compile()
+    decode_codes_ = chunk_decoder(engine, errors, report)
+    state = engine.initial
+    for codes in chunks:
+        chars, state = decode_codes_(codes, state)
+        if chars:
+            yield chars
+
+
+def iter_codes(reader: BaudotReader) -> Iterator[bytes]:
+    """
+    Read codes from a reader lazily, by chunks of up to
+    :py:data:`CHUNK_SIZE` codes. This is the source stage of a
+    decoding pipeline, e.g. ``iter_decode(iter_codes(reader), codec)``.
+
+    :param reader: Reader instance that will read codes from an input
+    :return: Iterator of the codes read, one per byte
+    """
+    for chunk in read_chunks(reader.read_into):
+        yield bytes(chunk)
+
+
+def write_codes(chunks: Iterable[Sequence[int]], writer: BaudotWriter):
+    """
+    Write chunks of codes to a writer as they come. This is the sink
+    stage of an encoding pipeline, e.g.
+    ``write_codes(iter_encode(lines, codec), writer)``.
+
+    :param chunks: Iterable of codes, one per byte
+    :param writer: Writer instance for the wanted output format
+    """
+    for codes in chunks:
+        writer.write_many(codes)
+
+
+def chunk_encoder(engine: CodecEngine, optimal: bool = False,
+                  errors: str = 'strict',
+                  report: Optional[ErrorReport] = None,
+                  stats: Optional[CodecStats] = None):
+    """
+    Get the function encoding chunks of characters for an engine, with
+    the given options. The returned function takes a chunk and the
+    current state, returns the codes and the new state, and must be
+    called on consecutive chunks, then with an empty chunk at the end of
+    the input: with ``optimal``, characters are held back until the
+    shortest encoding is known (see :py:func:`baudot.optimal.chunked_encoder`).
+
+    :param engine: Engine of the codec, from its ``compile()`` method
+    :param optimal: Whether to look for the shortest possible encoding
+    :param errors: Policy for unsupported characters
+    :param report: Optional report of the offsets of invalid characters
+    :param stats: Optional object measuring the encoding, errors included
+    """
+    # pylint: disable=too-many-arguments
+    check_errors(errors)
+    on_error = stats.count_error if stats is not None else None
+    if optimal:
+        if not isinstance(engine, CompiledCodec):
+            raise TypeError('Optimal encoding requires a SimpleTabledCodec')
+        encoder = chunked_encoder(engine, errors, report, on_error)
+    elif errors == 'strict':
+        encoder = engine.encode_codes
+    else:
+        encoder = tolerant_encoder(engine, engine.encode_codes, errors,
+                                   report, on_error)
+    return encoder if stats is None else stats.encoder(engine, encoder)
+
+
+def chunk_decoder(engine: CodecEngine, errors: str = 'strict',
+                  report: Optional[ErrorReport] = None,
+                  stats: Optional[CodecStats] = None):
+    """
+    Get the function decoding chunks of codes for an engine, as
+    :py:func:`chunk_encoder` does for encoding.
+
+    :param engine: Engine of the codec, from its ``compile()`` method
+    :param errors: Policy for invalid codes
+    :param report: Optional report of the offsets of invalid codes
+    :param stats: Optional object measuring the decoding, errors included
+    """
+    check_errors(errors)
+    decoder = engine.decode_codes
+    if errors != 'strict':
+        on_error = stats.count_error if stats is not None else None
+        decoder = tolerant_decoder(engine, decoder, errors, report, on_error)
+    return decoder if stats is None else stats.decoder(engine, decoder)
+
+
+def read_chunks(
+        read_into: Callable[[bytearray], int]) -> Iterator[memoryview]:
+    """
+    Read all the codes of a reader, by chunks of :py:data:`CHUNK_SIZE`.
+
+    Beware: all yielded chunks share the same underlying buffer, which
+    is overwritten by the next read.
+
+    :param read_into: ``read_into`` method of a reader
+    :return: Iterator of chunks of codes
+    """
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        count = read_into(buffer)
+        if not count:
+            return
+        yield view[:count]
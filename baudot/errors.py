@@ -0,0 +1,232 @@
+"""
+Error-tolerant encoding and decoding.
+
+The encoding and decoding functions of :py:mod:`baudot` accept an
+``errors`` policy, named after the ones of the standard library:
+
+============= ================================================
+Policy        Effect
+============= ================================================
+``'strict'``  Raise an exception (the default)
+``'replace'`` Replace with :py:data:`DECODING_REPLACEMENT` or
+              :py:data:`ENCODING_REPLACEMENT`
+``'ignore'``  Drop the faulty code or character
+============= ================================================
+
+With the non-strict policies, the offsets of the faulty codes or
+characters can be collected in an :py:class:`ErrorReport`, and the errors
+themselves counted (e.g. by :py:class:`baudot.stats.CodecStats`).
+
+Chunks are first processed by the engine as usual, so that clean data
+is converted at full speed; only chunks with errors are processed again,
+value per value.
+
+When decoding cannot start because the state is unknown (the data does
+not start with a shift code), the state is guessed (see
+:py:meth:`baudot.codecs.CodecEngine.guess_state`) and the guess is
+reported as an error. After an invalid code, which may have been a lost
+shift code, the state is guessed again from the next shift code among
+the :py:data:`RESYNC_WINDOW` following codes of the same chunk (see
+:py:meth:`baudot.codecs.CodecEngine.resync_state`).
+Corrupted codes that are still valid 5-bit values cannot be detected.
+
+Readers that accept an ``errors`` policy turn unreadable input into
+:py:data:`INVALID_CODE` instead of raising, and leave it to the decoder.
+"""
+
+from array import array
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .codecs import CodecEngine
+from .exceptions import DecodingError, EncodingError
+
+__all__ = ['ErrorReport', 'ERRORS', 'INVALID_CODE',
+           'DECODING_REPLACEMENT', 'ENCODING_REPLACEMENT', 'RESYNC_WINDOW',
+           'tolerant_decoder', 'tolerant_encoder', 'check_errors']
+
+#: Supported error handling policies
+ERRORS = ('strict', 'ignore', 'replace')
+
+#: Code emitted by readers for unreadable input, never a valid code
+INVALID_CODE = 0xff
+
+#: Replacement of undecodable codes
+DECODING_REPLACEMENT = '\ufffd'
+#: Replacement of unencodable characters, if the codec can encode it
+ENCODING_REPLACEMENT = '?'
+
+#: Number of codes after an invalid code searched for the next shift code
+RESYNC_WINDOW = 64
+
+
+class ErrorReport:
+    """
+    Offsets of the codes or characters that could not be converted,
+    counted from the start of the input.
+    """
+
+    def __init__(self):
+        self.offsets = array('q')
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.offsets)
+
+    def __repr__(self):
+        return f'<ErrorReport errors={len(self)} ranges={self.ranges()[:5]}>'
+
+    def add(self, offset: int):
+        """Add the offset of an error"""
+        self.offsets.append(offset)
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """
+        Summary of the errors, as ``(start, stop)`` ranges of
+        consecutive offsets.
+        """
+        ranges: List[Tuple[int, int]] = []
+        for offset in self.offsets:
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1] = ranges[-1][0], offset + 1
+            else:
+                ranges.append((offset, offset + 1))
+        return ranges
+
+
+def check_errors(errors: str):
+    """
+    Check that an error handling policy is supported.
+
+    :raises ValueError: If it is not
+    """
+    if errors not in ERRORS:
+        raise ValueError(f"Unsupported error handling: {errors}")
+
+
+def tolerant_decoder(
+        engine: CodecEngine,
+        decode_codes: Callable[[Sequence[int], int], Tuple[str, int]],
+        errors: str, report: Optional[ErrorReport] = None,
+        on_error: Optional[Callable[[Exception], None]] = None):
+    """
+    Wrap a chunk decoding function of an engine to apply an error
+    policy. The returned function must be called on consecutive chunks.
+
+    :param engine: Engine of the decoding function
+    :param decode_codes: Function decoding a chunk of codes
+    :param errors: Non-strict error policy
+    :param report: Optional report of the offsets of invalid codes
+    :param on_error: Optional function called with each error handled
+    """
+    # pylint: disable=too-many-arguments
+    check_errors(errors)
+    replacement = DECODING_REPLACEMENT if errors == 'replace' else ''
+    add = _handler(report, on_error)
+    position = 0
+
+    def decoder(codes: Sequence[int], state):
+        nonlocal position
+        try:
+            result = decode_codes(codes, state)
+        except DecodingError:
+            result = _decode_slow(engine, codes, state, replacement,
+                                  add, position)
+        position += len(codes)
+        return result
+
+    return decoder
+
+
+def tolerant_encoder(
+        engine: CodecEngine,
+        encode_codes: Callable[[str, int], Tuple[bytes, int]],
+        errors: str, report: Optional[ErrorReport] = None,
+        on_error: Optional[Callable[[Exception], None]] = None):
+    """
+    Wrap a chunk encoding function of an engine to apply an error
+    policy. The returned function must be called on consecutive chunks.
+
+    Chunks with errors are encoded greedily, even if ``encode_codes``
+    is an optimal encoder.
+
+    :param engine: Engine of the encoding function
+    :param encode_codes: Function encoding a chunk of characters
+    :param errors: Non-strict error policy
+    :param report: Optional report of the offsets of invalid characters
+    :param on_error: Optional function called with each error handled
+    """
+    # pylint: disable=too-many-arguments
+    check_errors(errors)
+    replacement = ENCODING_REPLACEMENT if errors == 'replace' else ''
+    add = _handler(report, on_error)
+    position = 0
+
+    def encoder(chars: str, state):
+        nonlocal position
+        try:
+            result = encode_codes(chars, state)
+        except EncodingError:
+            result = _encode_slow(engine, chars, state, replacement,
+                                  add, position)
+        position += len(chars)
+        return result
+
+    return encoder
+
+
+def _handler(report: Optional[ErrorReport],
+             on_error: Optional[Callable[[Exception], None]]
+             ) -> Callable[[int, Exception], None]:
+    """Function taking note of an error handled at an offset"""
+    def add(offset: int, error: Exception):
+        if report is not None:
+            report.add(offset)
+        if on_error is not None:
+            on_error(error)
+    return add
+
+
+def _decode_slow(engine: CodecEngine, codes: Sequence[int], state,
+                 replacement: str, add: Callable[[int, Exception], None],
+                 position: int):
+    # pylint: disable=too-many-arguments
+    decode_code = engine.decode_code
+    chars = []
+    for index, code in enumerate(codes):
+        try:
+            value, state = decode_code(code, state)
+        except DecodingError as exc:
+            add(position + index, exc)
+            value = replacement
+            if code >= 32:  # Garbage, maybe a lost shift code
+                following = codes[index + 1:index + 1 + RESYNC_WINDOW]
+                state = engine.resync_state(state, following)
+            elif engine.guess_state(state) != state:
+                try:
+                    value, state = decode_code(code, engine.guess_state(state))
+                except DecodingError:
+                    pass
+        chars.append(value)
+    return ''.join(chars), state
+
+
+def _encode_slow(engine: CodecEngine, chars: str, state, replacement: str,
+                 add: Callable[[int, Exception], None], position: int):
+    # pylint: disable=too-many-arguments
+    encode_char = engine.encode_char
+    codes = bytearray()
+    for offset, char in enumerate(chars, position):
+        try:
+            value, state = encode_char(char, state)
+        except EncodingError as exc:
+            add(offset, exc)
+            if not replacement:
+                continue
+            try:
+                value, state = encode_char(replacement, state)
+            except EncodingError:
+                continue
+        codes += value
+    return bytes(codes), state
@@ -26,3 +26,7 @@ class ReadError(BaudotException):
 
 class WriteError(BaudotException):
     """Raised when writing a 5-bit stream fails"""
+
+
+class CodecNotFound(BaudotException, LookupError):
+    """Raised when no codec is registered under a name"""
@@ -4,6 +4,9 @@ The handlers are interfaces to read and write 5-bit data
 from a variety of formats.
 """
 
-from .core import BaudotWriter, BaudotReader
+from .core import BaudotWriter, BaudotReader, BlockReader
 from .tape import TapeReader, TapeWriter, TapeConfig
 from .hexbytes import HexBytesReader, HexBytesWriter
+from .packed import PackedReader, PackedWriter
+from .mapped import MappedHexReader, MappedPackedReader
+from .serial import SerialReader, SerialWriter, SerialConfig
@@ -0,0 +1,395 @@
+"""
+Handler for compressed archives of codes, for long-term storage.
+
+Codes are stored in blocks, each compressed independently with
+:py:mod:`zlib` or :py:mod:`lzma`. The header of each block records the
+shift state and the number of characters decoded before it, so that
+any block can be decoded without the ones before it. A footer indexes
+all the blocks, for random access::
+
+    magic, version, compression
+    block header, compressed codes
+    block header, compressed codes
+    ...
+    footer: JSON header line, then arrays of the blocks' positions
+    trailer: offset of the footer, magic
+
+Archives can be read sequentially without the footer (from a pipe for
+example), and appended to: the footer is then written again at the end.
+If it is missing, e.g. after a crash while appending, it is rebuilt by
+scanning the block headers.
+
+Writing an archive requires the codec of the codes, to track the state
+and the character count of the blocks. Characters are counted as decoded
+with the ``'replace'`` error policy, so that any 5-bit codes can be
+archived, such as captured traffic that does not start with a shift.
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BufferedIOBase
+from typing import Deque, List, NamedTuple, Optional
+
+from .core import BlockReader, BaudotWriter
+from .mapped import little_endian
+from ..codecs import BaudotCodec, CompiledCodec, Shift, compile_tabled
+from ..errors import tolerant_decoder
+from ..exceptions import ReadError, WriteError
+
+__all__ = ['ArchiveReader', 'ArchiveWriter', 'BlockInfo', 'COMPRESSIONS']
+
+#: Default number of codes per block
+BLOCK_SIZE = 1 << 20
+
+#: Supported compression methods
+COMPRESSIONS = ('zlib', 'lzma')
+
+_MAGIC = b'BAUDOTAR'
+_VERSION = 1
+_HEADER = struct.Struct('<8sBB')  # Magic, version, compression
+_BLOCK = struct.Struct('<4sIIQH')  # Magic, size, codes, chars, state length
+_BLOCK_MAGIC = b'BDBK'
+_TRAILER = struct.Struct('<Q8s')  # Offset of the footer, magic
+_TRAILER_MAGIC = b'BDARINDX'
+
+_DECOMPRESS = {'zlib': zlib.decompress, 'lzma': lzma.decompress}
+
+
+class BlockInfo(NamedTuple):
+    """Position of a block in an archive"""
+    offset: int  #: Position of the block header in the file, in bytes
+    code: int  #: Number of codes before the block
+    char: int  #: Number of characters decoded before the block
+    state: Optional[Shift]  #: Active shift, ``None`` at the start
+    size: int  #: Number of codes in the block
+
+
+class ArchiveWriter(BaudotWriter):
+    """
+    Writer of compressed archives.
+
+    Call :py:meth:`close` (or use the writer as a context manager) when
+    done, to write the last block and the footer.
+
+    :param stream: Binary stream to write to
+    :param codec: Codec of the codes, a :py:class:`.SimpleTabledCodec`
+    :param compression: ``'zlib'`` or ``'lzma'``
+    :param block_size: Number of codes per block
+    :param level: Compression level, the default one of the method if
+        not given
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, stream: BufferedIOBase, codec: BaudotCodec,
+                 compression: str = 'zlib', block_size: int = BLOCK_SIZE,
+                 level: Optional[int] = None):
+        # pylint: disable=too-many-arguments
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.stream = stream
+        self.compression = compression
+        self.block_size = block_size
+        self.blocks: List[BlockInfo] = []
+        self._engine = compile_tabled(codec, 'Archiving')
+        self._decode = _decoder(self._engine)
+        self._state = self._engine.initial
+        self._codes = self._chars = 0
+        self._pending = bytearray()
+        self._level = level
+        self._offset = 0  # Position in the file, 0 until the header
+        self._closed = False
+
+    @classmethod
+    def append(cls, stream: BufferedIOBase, codec: BaudotCodec,
+               block_size: int = BLOCK_SIZE,
+               level: Optional[int] = None) -> 'ArchiveWriter':
+        """
+        Open an existing archive to add codes at its end.
+
+        :param stream: Seekable binary stream, open for reading and
+            writing (e.g. with mode ``'r+b'``)
+        :param codec: Codec of the codes, the same as the archive's
+        :param block_size: Number of codes per new block
+        :param level: Compression level of the new blocks
+        :return: Writer of the codes to add
+        """
+        # pylint: disable=protected-access
+        reader = ArchiveReader(stream)
+        writer = cls(stream, codec, reader.compression, block_size, level)
+        writer.blocks = reader.blocks
+        writer._offset = reader._footer
+
+        if reader.blocks:
+            # Resume from the state at the end of the last block
+            last = reader.blocks[-1]
+            reader.seek_block(-1)
+            state = writer._engine.state_of(last.state)
+            chars, writer._state = writer._decode(reader.read_block(), state)
+            writer._codes = last.code + last.size
+            writer._chars = last.char + len(chars)
+
+        # Overwrite the footer with the new blocks
+        stream.seek(writer._offset)
+        stream.truncate()
+        return writer
+
+    def write(self, code: int):
+        self.write_many(bytes([code]))
+
+    def write_many(self, codes: bytes):
+        if codes and max(codes) >= 32:
+            raise WriteError('Invalid 5-bit character code')
+        self._pending += codes
+        while len(self._pending) >= self.block_size:
+            self._write_block(bytes(self._pending[:self.block_size]))
+            del self._pending[:self.block_size]
+
+    def flush(self):
+        """Write the pending codes as a block, even if not full"""
+        if self._pending:
+            self._write_block(bytes(self._pending))
+            self._pending.clear()
+
+    def close(self):
+        """Write the last block, and the footer"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._write_header()
+
+        shifts = list(self._engine.states)
+        header = {
+            'blocks': len(self.blocks),
+            'shifts': [getattr(shift, 'name', None) for shift in shifts],
+        }
+        columns = (array('q', (b.offset for b in self.blocks)),
+                   array('q', (b.code for b in self.blocks)),
+                   array('q', (b.char for b in self.blocks)),
+                   array('B', (shifts.index(b.state) for b in self.blocks)),
+                   array('q', (b.size for b in self.blocks)))
+
+        self.stream.write(json.dumps(header).encode() + b'\n')
+        for column in columns:
+            self.stream.write(little_endian(column).tobytes())
+        self.stream.write(_TRAILER.pack(self._offset, _TRAILER_MAGIC))
+
+    def _write_header(self):
+        if not self._offset:
+            self.stream.write(_HEADER.pack(
+                _MAGIC, _VERSION, COMPRESSIONS.index(self.compression)))
+            self._offset = _HEADER.size
+
+    def _write_block(self, codes: bytes):
+        self._write_header()
+        state = self._engine.shift_of(self._state)
+        chars, self._state = self._decode(codes, self._state)
+
+        name = b'' if state is None else state.name.encode()
+        data = _compress(self.compression, codes, self._level)
+        self.stream.write(_BLOCK.pack(_BLOCK_MAGIC, len(data), len(codes),
+                                      self._chars, len(name)))
+        self.stream.write(name)
+        self.stream.write(data)
+
+        self.blocks.append(BlockInfo(self._offset, self._codes, self._chars,
+                                     state, len(codes)))
+        self._offset += _BLOCK.size + len(name) + len(data)
+        self._codes += len(codes)
+        self._chars += len(chars)
+
+
+class ArchiveReader(BlockReader):
+    """
+    Reader of compressed archives.
+
+    Blocks are decompressed ahead by a pool of ``workers`` threads
+    (compression libraries release the GIL while working), or in the
+    calling thread if it is 0.
+
+    :param stream: Binary stream to read from. The footer, and thus
+        :py:attr:`blocks` and :py:meth:`seek_block`, are only available
+        if it is seekable.
+    :param workers: Number of threads decompressing blocks
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, stream: BufferedIOBase, workers: int = 0):
+        super().__init__()
+        self.stream = stream
+        magic, version, compression = _unpack(_HEADER, stream.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION \
+                or compression >= len(COMPRESSIONS):
+            raise ReadError('Not a supported Baudot archive')
+        #: Compression method of the archive
+        self.compression = COMPRESSIONS[compression]
+        #: Blocks of the archive (empty if the stream is not seekable)
+        self.blocks: List[BlockInfo] = []
+
+        self._executor = ThreadPoolExecutor(workers) if workers else None
+        self._queue: Deque[Future] = deque()
+        self._ahead = 2 * workers
+        self._done = False
+        self._footer = 0  # Position of the footer, or end of the blocks
+        if stream.seekable():
+            self._load_index()
+            stream.seek(_HEADER.size)
+
+    def close(self):
+        """Stop the decompression threads"""
+        self._cancel()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def seek_block(self, index: int):
+        """
+        Continue reading from the start of a block. The state to decode
+        its codes from is given by :py:attr:`BlockInfo.state`.
+
+        :param index: Position of the block in :py:attr:`blocks`
+        """
+        self._cancel()
+        self._codes, self._position = b'', 0
+        self._done = False
+        self.stream.seek(self.blocks[index].offset)
+
+    def read_chars(self, codec: BaudotCodec, start: int, stop: int) -> str:
+        """
+        Decode the characters between two offsets, starting from the
+        block holding the first one.
+
+        :param codec: Codec of the codes, the same as the archive's
+        :param start: Offset of the first character
+        :param stop: Offset after the last character
+        :return: Decoded characters
+        """
+        engine = compile_tabled(codec, 'Archiving')
+        decode = _decoder(engine)
+        chars = [block.char for block in self.blocks]
+        index = max(bisect_right(chars, max(start, 0)) - 1, 0)
+        if not self.blocks or stop <= start:
+            return ''
+
+        self.seek_block(index)
+        block = self.blocks[index]
+        state = engine.state_of(block.state)
+        chunks, count = [], block.char
+        while count < stop:
+            codes = self.read_block()
+            if not codes:
+                break
+            text, state = decode(codes, state)
+            chunks.append(text)
+            count += len(text)
+
+        offset = max(start, 0) - block.char
+        return ''.join(chunks)[offset:offset + stop - max(start, 0)]
+
+    def read_block(self) -> bytes:
+        if self._executor is None:
+            data = self._read_compressed()
+            return b'' if data is None else self._decompress(data)
+
+        while len(self._queue) < self._ahead and not self._done:
+            data = self._read_compressed()
+            if data is None:
+                break
+            self._queue.append(self._executor.submit(self._decompress, data))
+        return self._queue.popleft().result() if self._queue else b''
+
+    def _cancel(self):
+        while self._queue:
+            self._queue.pop().cancel()
+
+    def _read_compressed(self) -> Optional[bytes]:
+        """Read the next block, or ``None`` at the end"""
+        if self._done or 0 < self._footer <= self.stream.tell():
+            return None
+        header = self.stream.read(_BLOCK.size)
+        if len(header) < _BLOCK.size or header[:4] != _BLOCK_MAGIC:
+            self._done = True  # Footer or end of the archive
+            return None
+        _, size, _, _, name = _unpack(_BLOCK, header)
+        self.stream.read(name)
+        data = self.stream.read(size)
+        if len(data) < size:
+            raise ReadError('Truncated Baudot archive')
+        return data
+
+    def _decompress(self, data: bytes) -> bytes:
+        try:
+            return _DECOMPRESS[self.compression](data)
+        except (zlib.error, lzma.LZMAError) as exc:
+            raise ReadError(f'Corrupt archive block: {exc}') from exc
+
+    def _load_index(self):
+        # pylint: disable=too-many-locals
+        stream = self.stream
+        size = stream.seek(0, 2)
+        stream.seek(max(size - _TRAILER.size, 0))
+        offset, magic = _unpack(_TRAILER, stream.read(_TRAILER.size))
+        if magic != _TRAILER_MAGIC or not _HEADER.size <= offset <= size:
+            self._scan(size)
+            return
+
+        self._footer = offset
+        stream.seek(offset)
+        try:
+            header = json.loads(stream.readline())
+            shifts = [None if name is None else Shift(name)
+                      for name in header['shifts']]
+            count = header['blocks']
+            columns = [array(typecode) for typecode in 'qqqBq']
+            for column in columns:
+                column.frombytes(stream.read(count * column.itemsize))
+                column[:] = little_endian(column)
+        except (ValueError, KeyError, TypeError, IndexError) as exc:
+            raise ReadError('Invalid Baudot archive footer') from exc
+
+        offsets, code, char, states, sizes = columns
+        self.blocks = [BlockInfo(*info[:3], shifts[info[3]], info[4])
+                       for info in zip(offsets, code, char, states, sizes)]
+
+    def _scan(self, end: int):
+        """Rebuild the index from the block headers, up to the first
+        block truncated before the end of the stream"""
+        stream = self.stream
+        offset, blocks = _HEADER.size, []
+        stream.seek(offset)
+        while True:
+            header = stream.read(_BLOCK.size)
+            if len(header) < _BLOCK.size or header[:4] != _BLOCK_MAGIC:
+                break
+            _, size, count, chars, name = _unpack(_BLOCK, header)
+            if offset + _BLOCK.size + name + size > end:
+                break
+            state = stream.read(name).decode() if name else None
+            code = blocks[-1].code + blocks[-1].size if blocks else 0
+            blocks.append(BlockInfo(offset, code, chars,
+                                    Shift(state) if state else None, count))
+            offset = stream.seek(size, 1)
+        self.blocks = blocks
+        self._footer = offset
+
+
+def _compress(compression: str, data: bytes, level: Optional[int]) -> bytes:
+    if compression == 'lzma':
+        return lzma.compress(data, preset=level)
+    return zlib.compress(data, -1 if level is None else level)
+
+
+def _unpack(layout: struct.Struct, data: bytes) -> tuple:
+    if len(data) < layout.size:
+        raise ReadError('Truncated Baudot archive')
+    return layout.unpack(data)
+
+
+def _decoder(engine: CompiledCodec):
+    """Decoder counting the characters of the blocks"""
+    return tolerant_decoder(engine, engine.decode_codes, 'replace')
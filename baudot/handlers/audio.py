@@ -0,0 +1,239 @@
+"""
+Handler for RTTY audio: frequency-shift keyed (AFSK) 5-bit codes, as
+sent over radio or telephone lines.
+
+Codes are framed as on a serial line (see :py:mod:`.serial`), and the
+mark and space levels are sent as two audio tones,
+:py:attr:`AudioConfig.shift` Hz apart.
+
+Audio is signed 16-bit mono PCM, either raw or in a WAV container.
+The writer synthesizes continuous-phase tones; the reader demodulates
+by mixing the samples with both tones (quadrature detection), and
+comparing their energy over a sliding window, which gives the line
+level of each sample. Both work block by block with NumPy, so that
+long recordings or live inputs are handled in streaming fashion, much
+faster than real time.
+
+This module requires `NumPy <https://numpy.org/>`_, which is an optional
+dependency of this library (``pip install baudot[numpy]``).
+"""
+
+import wave
+from io import BufferedIOBase
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError as _exc:
+    raise ImportError(
+        'baudot.handlers.audio requires NumPy: pip install baudot[numpy]'
+    ) from _exc
+
+from .core import BlockReader, BaudotWriter
+from .serial import SerialConfig, find_frames, frame_codes
+from ..errors import check_errors
+from ..exceptions import ReadError
+
+__all__ = ['AudioReader', 'AudioWriter', 'AudioConfig', 'DEFAULT_AUDIO']
+
+#: Number of audio frames read from the input at once
+READ_FRAMES = 1 << 14
+
+
+class AudioConfig(NamedTuple):
+    """
+    Parameters of an RTTY signal. The defaults are those of amateur
+    radio: 45.45 baud, 170 Hz shift.
+    """
+    baud: float = 45.45  #: Bits per second (usually 45.45, 50 or 75)
+    mark: float = 2125.  #: Frequency of the mark tone, in Hz
+    shift: float = 170.  #: Frequency of space minus that of mark, in Hz
+    rate: int = 8000  #: Samples per second
+    stop_bits: float = 1.5  #: Duration of the stop bits, in bits
+
+    @property
+    def space(self) -> float:
+        """Frequency of the space tone, in Hz"""
+        return self.mark + self.shift
+
+    @property
+    def bit_length(self) -> float:
+        """Duration of a bit, in samples"""
+        return self.rate / self.baud
+
+    @property
+    def serial(self) -> SerialConfig:
+        """Timing of the line, in audio samples"""
+        return SerialConfig(self.bit_length, self.stop_bits)
+
+
+DEFAULT_AUDIO = AudioConfig()
+
+
+class AudioWriter(BaudotWriter):
+    """
+    Writer of RTTY audio.
+
+    WAV output requires a seekable stream, to write its length at the
+    end: use raw PCM for pipes. Call :py:meth:`close` (or use the writer
+    as a context manager) when done, to end the audio properly.
+
+    :param stream: Binary stream to write to
+    :param config: Parameters of the signal
+    :param wav: Whether to write a WAV file, or raw PCM
+    :param amplitude: Amplitude of the signal, from 0 to 1
+    """
+
+    def __init__(self, stream: BufferedIOBase,
+                 config: AudioConfig = DEFAULT_AUDIO, wav: bool = True,
+                 amplitude: float = .5):
+        self.config = config
+        self.amplitude = amplitude
+        self._time = 0.  # Start of the next frame, in samples
+        self._phase = 0.
+        if wav:
+            self._wave = wave.open(stream, 'wb')
+            self._wave.setnchannels(1)
+            self._wave.setsampwidth(2)
+            self._wave.setframerate(config.rate)
+            self._write = self._wave.writeframes
+        else:
+            self._wave = None
+            self._write = stream.write
+
+    def write(self, code: int):
+        self.write_many(bytes([code]))
+
+    def write_many(self, codes: bytes):
+        if not codes:
+            return
+        if not self._time:  # Idle a little, for the receiver to sync
+            self._idle(1)
+
+        levels, self._time = frame_codes(codes, self.config.serial,
+                                         self._time)
+        self._tones(levels)
+
+    def close(self):
+        """Send some idle signal, then finish the file"""
+        self._idle(2)
+        if self._wave is not None:
+            self._wave.close()
+
+    def _idle(self, bits: float):
+        samples = round(self._time + bits * self.config.bit_length) \
+            - round(self._time)
+        self._time += bits * self.config.bit_length
+        self._tones(b'\x01' * samples)
+
+    def _tones(self, levels: bytes):
+        """Write the tones of line levels, one per byte and sample"""
+        if not levels:
+            return
+        config = self.config
+
+        # Frequency of each sample, integrated into a continuous phase
+        marks = np.frombuffer(levels, dtype=np.bool_)
+        frequency = np.where(marks, config.mark, config.space)
+        phase = self._phase + np.cumsum(2 * np.pi / config.rate * frequency)
+        self._phase = phase[-1] % (2 * np.pi)
+
+        samples = np.sin(phase) * (self.amplitude * 32767)
+        self._write(samples.astype('<i2').tobytes())
+
+
+class AudioReader(BlockReader):
+    """
+    Reader of RTTY audio.
+
+    The sample rate of WAV files is read from their header, and only
+    their first channel is demodulated.
+
+    Frames with a space instead of a stop bit are errors: with the
+    ``'strict'`` policy, they raise a :py:class:`.ReadError`; with
+    ``'replace'``, they are read as :py:data:`baudot.errors.INVALID_CODE`,
+    and with ``'ignore'`` they are dropped.
+
+    :param stream: Binary stream to read from
+    :param config: Parameters of the signal
+    :param wav: Whether to read a WAV file, or raw PCM
+    :param errors: Policy for framing errors
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, stream: BufferedIOBase,
+                 config: AudioConfig = DEFAULT_AUDIO, wav: bool = True,
+                 errors: str = 'strict'):
+        check_errors(errors)
+        super().__init__()
+        self.errors = errors
+        self._channels = 1
+        if wav:
+            self._wave = wave.open(stream, 'rb')
+            if self._wave.getsampwidth() != 2:
+                raise ReadError('Only 16-bit audio is supported')
+            self._channels = self._wave.getnchannels()
+            config = config._replace(rate=self._wave.getframerate())
+            self._read = self._wave.readframes
+        else:
+            self._wave = None
+            self._read = lambda frames: stream.read(2 * frames)
+        self.config = config
+
+        # Energy of each tone is summed over half a bit
+        self._window = max(int(config.bit_length / 2), 1)
+        self._count = 0  # Number of samples read
+        self._mixed = np.zeros((2, 0), dtype=complex)  # Last mixed samples
+        self._levels = b'\x01'  # Line levels not read yet, after idle
+        self._offset = -1  # Position of the first level in the input
+        self._rest = b''
+        self._eof = False
+
+    def read_block(self) -> bytes:
+        frame = 2 * self._channels
+        while not self._eof:
+            data = self._read(READ_FRAMES)
+            if not data:
+                self._eof = True
+                break
+            # Raw streams may end with an incomplete sample
+            data = self._rest + data
+            size = len(data) // frame * frame
+            self._rest = data[size:]
+            samples = np.frombuffer(data[:size], dtype='<i2')
+            self._demodulate(samples[::self._channels])
+
+            codes, position = find_frames(self._levels, self.config.serial,
+                                          self.errors, self._offset)
+            self._levels = self._levels[position:]
+            self._offset += position
+            if codes:
+                return bytes(codes)
+        return b''
+
+    def _demodulate(self, samples: 'np.ndarray'):
+        """Add the line levels of new samples"""
+        config = self.config
+        times = np.arange(self._count, self._count + samples.size)
+        self._count += samples.size
+        tones = np.array([config.mark, config.space])[:, None]
+        mixed = np.exp(-2j * np.pi / config.rate * tones * times) * samples
+        mixed = np.concatenate((self._mixed, mixed), axis=1)
+
+        window = self._window
+        if mixed.shape[1] < window:
+            self._mixed = mixed
+            return
+        sums = np.cumsum(mixed, axis=1)
+        sums = sums[:, window - 1:] - np.concatenate(
+            (np.zeros((2, 1)), sums[:, :-window]), axis=1)
+        self._mixed = mixed[:, mixed.shape[1] - window + 1:]
+
+        energy = np.abs(sums)
+        marks = (energy[0] > energy[1]).astype(np.uint8)
+        self._levels += marks.tobytes()
+
+    def close(self):
+        """Close the WAV reader, but not the stream"""
+        if self._wave is not None:
+            self._wave.close()
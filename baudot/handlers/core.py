@@ -3,6 +3,9 @@ Core utilities for Baudot input/output handlers
 """
 
 from abc import ABC, abstractmethod
+from itertools import islice
+
+from ..exceptions import ReadError
 
 
 class BaudotReader(ABC):
@@ -15,6 +18,80 @@ class BaudotReader(ABC):
     def __next__(self):
         pass
 
+    def read_into(self, buffer: bytearray) -> int:
+        """
+        Read several codes at once into a pre-allocated buffer.
+
+        The default implementation falls back to :py:meth:`__next__`;
+        subclasses may override it to read whole blocks natively.
+
+        :param buffer: Writable buffer receiving one code per byte
+            (``bytearray`` or ``memoryview``)
+        :return: Number of codes read, which is 0 only at the end
+            of the input
+        """
+        count = 0
+        for code in islice(self, len(buffer)):
+            try:
+                buffer[count] = code
+            except ValueError:
+                raise ReadError(
+                    f'Code value {code} is not a valid 5-bit value') from None
+            count += 1
+        return count
+
+    def close(self):
+        """
+        Release the resources held by the reader, if any. This does
+        nothing by default.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BlockReader(BaudotReader):
+    """
+    Base class for readers that decode their input by whole blocks.
+
+    Subclasses must implement :py:meth:`read_block`; single codes and
+    smaller reads are then served from the last decoded block.
+    """
+
+    def __init__(self):
+        self._codes = b''  # Codes decoded, but not read yet
+        self._position = 0
+
+    @abstractmethod
+    def read_block(self) -> bytes:
+        """
+        Read and decode the next block of codes from the input.
+
+        :return: Codes, one per byte. This is empty only at the end
+            of the input.
+        """
+
+    def __next__(self) -> int:
+        if self._position >= len(self._codes) and not self._fill():
+            raise StopIteration()
+        self._position += 1
+        return self._codes[self._position - 1]
+
+    def read_into(self, buffer: bytearray) -> int:
+        if self._position >= len(self._codes) and not self._fill():
+            return 0
+        codes = self._codes[self._position:self._position + len(buffer)]
+        buffer[:len(codes)] = codes
+        self._position += len(codes)
+        return len(codes)
+
+    def _fill(self) -> bool:
+        self._codes, self._position = self.read_block(), 0
+        return bool(self._codes)
+
 
 class BaudotWriter(ABC):
     """Abstract Base Class for a writer"""
@@ -22,3 +99,28 @@ class BaudotWriter(ABC):
     @abstractmethod
     def write(self, code: int):
         """Write a single code to the output"""
+
+    def write_many(self, codes: bytes):
+        """
+        Write several codes at once to the output.
+
+        The default implementation falls back to :py:meth:`write`;
+        subclasses may override it to write whole blocks natively.
+
+        :param codes: Codes to write, one per byte
+        """
+        write = self.write
+        for code in codes:
+            write(code)
+
+    def close(self):
+        """
+        Finish writing, for formats that need it. This does not close
+        the underlying stream, and does nothing by default.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -2,33 +2,47 @@
 Handler for reading and writing 5-bit codes as a hexadecimal bit stream.
 """
 
+import re
+from binascii import a2b_hex, Error as BinasciiError
 from io import BufferedIOBase
 
 from .core import BaudotReader, BaudotWriter
+from ..errors import INVALID_CODE, check_errors
 from ..exceptions import ReadError, WriteError
 
+__all__ = ['HexBytesReader', 'HexBytesWriter', 'parse_hex']
+
 
 class HexBytesReader(BaudotReader):
     """
     Reader for hexadecimal 5-bit streams
+
+    :param stream: Binary stream to read from
+    :param errors: Unless ``'strict'``, invalid hexadecimal bytes are
+        read as :py:data:`baudot.errors.INVALID_CODE` instead of raising
     """
 
-    def __init__(self, stream: BufferedIOBase):
+    def __init__(self, stream: BufferedIOBase, errors: str = 'strict'):
+        check_errors(errors)
         self.stream = stream
+        self.errors = errors
+        self._offset = 0
 
     def __next__(self):
         hex_byte = self.stream.read(2)
         if not hex_byte:
             raise StopIteration()
-        try:
-            code = int(hex_byte, 16)
-        except ValueError:
-            str_repr = hex_byte.decode(errors='backslashreplace')
-            raise ReadError(f'Invalid hexadecimal byte: {str_repr}')
-        if not 0 <= code < 32:
-            raise ReadError(f'Code value {code} is not a valid 5-bit value')
+        code, = parse_hex(hex_byte, self._offset, self.errors)
+        self._offset += len(hex_byte)
         return code
 
+    def read_into(self, buffer: bytearray) -> int:
+        data = self.stream.read(2 * len(buffer))
+        codes = parse_hex(data, self._offset, self.errors)
+        self._offset += len(data)
+        buffer[:len(codes)] = codes
+        return len(codes)
+
 
 class HexBytesWriter(BaudotWriter):
     """
@@ -44,3 +58,53 @@ class HexBytesWriter(BaudotWriter):
             raise WriteError('Invalid 5-bit character code')
 
         self.stream.write(f'{code:02x}'.encode())
+
+    def write_many(self, codes: bytes):
+        """Writes several codes as hexadecimal values"""
+        if codes and max(codes) >= 32:
+            raise WriteError('Invalid 5-bit character code')
+
+        self.stream.write(codes.hex().encode())
+
+
+_NOT_HEX = re.compile(b'[^0-9A-Fa-f]')
+
+
+def parse_hex(data: bytes, offset: int = 0, errors: str = 'strict') -> bytes:
+    """
+    Convert a block of hexadecimal data to 5-bit codes. The whole
+    block is converted and validated at once.
+
+    :param data: Hexadecimal data (``bytes`` or ``memoryview``), two
+        digits per code. A single digit at the end is a code of its own.
+    :param offset: Position of the data in the input, for error messages
+    :param errors: Unless ``'strict'``, invalid hexadecimal bytes are
+        converted to :py:data:`baudot.errors.INVALID_CODE`, and values
+        too large for 5 bits are returned as they are
+    :return: Codes, one per byte
+    """
+    try:
+        codes = a2b_hex(data)
+    except BinasciiError:
+        invalid = _NOT_HEX.search(data)
+        if invalid and errors != 'strict':
+            return bytes(INVALID_CODE if _NOT_HEX.search(pair) else
+                         int(pair, 16)
+                         for pair in map(bytes, _pairs(data)))
+        if invalid:
+            start = invalid.start() - invalid.start() % 2
+            str_repr = bytes(data[start:start + 2]).decode(
+                errors='backslashreplace')
+            raise ReadError(f'Invalid hexadecimal byte at offset '
+                            f'{offset + start}: {str_repr}') from None
+        codes = a2b_hex(data[:-1]) + bytes((int(bytes(data[-1:]), 16),))
+
+    if errors == 'strict' and codes and max(codes) >= 32:
+        index = next(i for i, code in enumerate(codes) if code >= 32)
+        raise ReadError(f'Code value {codes[index]} at offset '
+                        f'{offset + 2 * index} is not a valid 5-bit value')
+    return codes
+
+
+def _pairs(data: bytes):
+    return (data[i:i + 2] for i in range(0, len(data), 2))
@@ -0,0 +1,212 @@
+"""
+Memory-mapped readers for large hexadecimal or packed files.
+
+These readers take a file path instead of a stream. The file is mapped
+in memory, and decoded by large windows without copying it first, so
+that files much larger than the available memory can be read. Only
+regular files can be mapped: use the stream readers for pipes and devices.
+
+:py:class:`MappedCodes` gives access to any window of codes of such a
+file; it is also used by :py:mod:`baudot.index` and
+:py:mod:`baudot.parallel`.
+"""
+
+import mmap
+import os
+import stat
+import sys
+from array import array
+
+from .core import BlockReader
+from .hexbytes import parse_hex
+from .packed import unpack_codes
+from .tape import DEFAULT_TAPE, TapeConfig, parse_row, tape_rows
+from ..errors import check_errors
+from ..exceptions import ReadError
+
+__all__ = ['MappedHexReader', 'MappedPackedReader', 'MappedCodes', 'FORMATS',
+           'little_endian']
+
+#: Number of codes decoded at once
+BLOCK_SIZE = 1 << 16
+
+#: Formats of the files that can be mapped
+FORMATS = ('raw', 'hex', 'packed', 'tape')
+
+
+class MappedCodes:
+    """
+    Memory-mapped file of codes, read by windows of codes.
+
+    Files can be in the ``'raw'`` (one code per byte), ``'hex'`` (as
+    written by :py:class:`.HexBytesWriter`), ``'packed'`` (as written by
+    :py:class:`.PackedWriter`) or ``'tape'`` formats. Tape files must
+    have rows of a fixed width in bytes, as written by
+    :py:class:`.TapeWriter`.
+
+    :param path: Path of the file to read
+    :param fmt: Format of the file
+    :param errors: Error policy for invalid hexadecimal bytes, as for
+        :py:class:`.HexBytesReader`
+    :param config: Tape format of the file, for the ``'tape'`` format
+    :raises ReadError: If the file is not a regular file, or if its
+        length does not match its format
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, path: str, fmt: str = 'hex', errors: str = 'strict',
+                 config: TapeConfig = DEFAULT_TAPE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        check_errors(errors)
+        self.fmt = fmt
+        self.errors = errors
+        self._config = config
+        self._rows = tape_rows(config)[1]
+        self._width = 1
+        if fmt == 'tape':
+            widths = {len(row.encode()) for row in tape_rows(config)[0]}
+            if len(widths) != 1 or not self._rows:
+                raise ValueError('Tape format without fixed-width rows')
+            self._width = widths.pop()
+
+        self._map = None
+        with open(path, 'rb') as file:
+            status = os.fstat(file.fileno())
+            if not stat.S_ISREG(status.st_mode):
+                raise ReadError(f'Not a regular file: {path}')
+            #: Size of the file, in bytes
+            self.size = status.st_size
+            # Empty files cannot be mapped
+            if self.size:
+                self._map = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        self._data = memoryview(self._map if self._map else b'')
+        try:
+            self._length = self._count_codes()
+        except ReadError:
+            self.close()
+            raise
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file"""
+        self._data.release()
+        if self._map is not None:
+            self._map.close()
+
+    def read(self, start: int, stop: int) -> bytes:
+        """
+        Read the codes between two offsets.
+
+        :param start: Offset of the first code
+        :param stop: Offset after the last code
+        :return: Codes, one per byte
+        """
+        stop = min(stop, self._length)
+        if start >= stop:
+            return b''
+
+        if self.fmt == 'hex':
+            with self._data[2 * start:2 * stop] as window:
+                return parse_hex(window, 2 * start, self.errors)
+        if self.fmt == 'packed':
+            first, last = start // 8, (stop + 7) // 8
+            with self._data[5 * first:5 * last] as window:
+                codes = unpack_codes(window)
+            return codes[start - 8 * first:stop - 8 * first]
+        if self.fmt == 'tape':
+            width = self._width
+            lines = str(self._data[width * start:width * stop], 'utf-8')
+            return bytes(self._rows.get(line) or parse_row(line, self._config)
+                         for line in lines.splitlines(keepends=True))
+        return bytes(self._data[start:stop])
+
+    def _count_codes(self) -> int:
+        size = self.size
+        if self.fmt == 'hex':
+            return (size + 1) // 2
+        if self.fmt == 'packed':
+            if size % 5 == 0:
+                return size // 5 * 8
+            if size % 5 != 1:
+                raise ReadError('Truncated packed 5-bit stream')
+            count = self._data[-1]
+            if not 1 <= count < 8 or size == 1:
+                raise ReadError(f'Invalid packed group length: {count}')
+            return (size // 5 - 1) * 8 + count
+        if self.fmt == 'tape':
+            if size % self._width:
+                raise ReadError('Tape data is not made of fixed-width rows')
+            return size // self._width
+        return size
+
+
+def little_endian(values: array) -> array:
+    """
+    Get an array in little-endian byte order, the order of the numbers
+    stored in files, whatever the byte order of this machine. Swapping
+    the bytes again converts them back.
+    """
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+class _MappedReader(BlockReader):
+    """
+    Base class for memory-mapped readers
+    """
+    fmt = ''
+
+    def __init__(self, path: str, errors: str = 'strict'):
+        super().__init__()
+        self.path = path
+        self._file = MappedCodes(path, self.fmt, errors)
+        self._offset = 0
+
+    def read_block(self) -> bytes:
+        codes = self._file.read(self._offset, self._offset + BLOCK_SIZE)
+        self._offset += len(codes)
+        return codes
+
+    def close(self):
+        """Unmap the file"""
+        self._file.close()
+
+
+class MappedHexReader(_MappedReader):
+    """
+    Memory-mapped reader for hexadecimal 5-bit files
+
+    :param path: Path of the file to read
+    :param errors: Error policy for invalid hexadecimal bytes, as for
+        :py:class:`baudot.handlers.HexBytesReader`
+    """
+    fmt = 'hex'
+
+    @property
+    def errors(self) -> str:
+        """Error policy for invalid hexadecimal bytes"""
+        return self._file.errors
+
+
+class MappedPackedReader(_MappedReader):
+    """
+    Memory-mapped reader for packed 5-bit files
+
+    :param path: Path of the file to read
+    """
+    fmt = 'packed'
+
+    def __init__(self, path: str):
+        super().__init__(path)
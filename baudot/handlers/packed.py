@@ -0,0 +1,180 @@
+"""
+Handler for reading and writing densely packed 5-bit codes.
+
+Codes are packed by groups of 8 into 5 bytes, most significant bit
+first. If the number of codes is not a multiple of 8, the last group
+is padded with zero bits, and followed by one extra byte holding the
+number of codes it actually contains (1 to 7). The length of a valid
+packed stream is thus always a multiple of 5, plus 0 or 1.
+
+Packing and unpacking is done for whole blocks at once: each of the
+5 (or 8) byte positions of all the groups is loaded into a single big
+integer, on which all the bit operations are done in one go.
+"""
+
+from io import BufferedIOBase
+
+from .core import BlockReader, BaudotWriter
+from ..exceptions import ReadError, WriteError
+
+__all__ = ['PackedReader', 'PackedWriter',
+           'pack_codes', 'unpack_codes', 'unpack_end']
+
+#: Number of bytes read from the input at once (a multiple of 5)
+READ_SIZE = 5 * 4096
+
+
+class PackedReader(BlockReader):
+    """
+    Reader for packed 5-bit streams
+    """
+
+    def __init__(self, stream: BufferedIOBase):
+        super().__init__()
+        self.stream = stream
+        self._tail = b''  # Bytes read, but that might be the end
+        self._eof = False
+
+    def read_block(self) -> bytes:
+        while not self._eof:
+            data = self.stream.read(READ_SIZE)
+            if data:
+                # Keep enough bytes to handle the end of stream properly
+                data = self._tail + data
+                size = max(len(data) - 6, 0) // 5 * 5
+                self._tail = data[size:]
+                codes = unpack_codes(data[:size])
+            else:
+                self._eof = True
+                codes = unpack_end(self._tail)
+                self._tail = b''
+
+            if codes:
+                return codes
+        return b''
+
+
+class PackedWriter(BaudotWriter):
+    """
+    Writer for packed 5-bit streams
+
+    Codes are written by groups of 8; :py:meth:`close` must be called
+    to write the last group. The writer can also be used as a context
+    manager to do so.
+    """
+
+    def __init__(self, stream: BufferedIOBase):
+        self.stream = stream
+        self._pending = bytearray()
+
+    def write(self, code: int):
+        """Writes a single code"""
+        if not 0 <= code < 32:
+            raise WriteError('Invalid 5-bit character code')
+
+        self._pending.append(code)
+        if len(self._pending) == 8:
+            self.stream.write(pack_codes(self._pending))
+            self._pending.clear()
+
+    def write_many(self, codes: bytes):
+        """Writes several codes"""
+        if codes and max(codes) >= 32:
+            raise WriteError('Invalid 5-bit character code')
+
+        self._pending += codes
+        size = len(self._pending) // 8 * 8
+        if size:
+            self.stream.write(pack_codes(self._pending[:size]))
+            del self._pending[:size]
+
+    def close(self):
+        """
+        Writes the last, incomplete group of codes if any.
+        This does not close the underlying stream.
+        """
+        if self._pending:
+            count = len(self._pending)
+            self._pending += bytes(8 - count)
+            self.stream.write(pack_codes(self._pending) + bytes((count,)))
+            self._pending.clear()
+
+
+def pack_codes(codes: bytes) -> bytes:
+    """
+    Pack 5-bit codes, 8 codes into 5 bytes.
+
+    :param codes: Codes to pack, one per byte. Their number must be
+        a multiple of 8, and they are assumed to be valid.
+    :return: Packed bytes
+    """
+    # pylint: disable=too-many-locals
+    count = len(codes) // 8
+    code_0, code_1, code_2, code_3, code_4, code_5, code_6, code_7 = (
+        int.from_bytes(codes[i::8], 'big') for i in range(8))
+    mask_1, mask_3, mask_7, mask_15 = (
+        _lanes_mask(m, count) for m in (1, 3, 7, 15))
+
+    packed = bytearray(5 * count)
+    for i, lanes in enumerate((
+            (code_0 << 3) | ((code_1 >> 2) & mask_7),
+            ((code_1 & mask_3) << 6) | (code_2 << 1) | ((code_3 >> 4) & mask_1),
+            ((code_3 & mask_15) << 4) | ((code_4 >> 1) & mask_15),
+            ((code_4 & mask_1) << 7) | (code_5 << 2) | ((code_6 >> 3) & mask_3),
+            ((code_6 & mask_7) << 5) | code_7)):
+        packed[i::5] = lanes.to_bytes(count, 'big')
+    return bytes(packed)
+
+
+def unpack_codes(data: bytes) -> bytes:
+    """
+    Unpack 5-bit codes, 5 bytes into 8 codes.
+
+    :param data: Packed bytes. Their number must be a multiple of 5.
+    :return: Unpacked codes, one per byte
+    """
+    # pylint: disable=too-many-locals
+    count = len(data) // 5
+    byte_0, byte_1, byte_2, byte_3, byte_4 = (
+        int.from_bytes(data[i::5], 'big') for i in range(5))
+    mask_1, mask_3, mask_7, mask_15, mask_31 = (
+        _lanes_mask(m, count) for m in (1, 3, 7, 15, 31))
+
+    codes = bytearray(8 * count)
+    for i, lanes in enumerate((
+            (byte_0 >> 3) & mask_31,
+            ((byte_0 & mask_7) << 2) | ((byte_1 >> 6) & mask_3),
+            (byte_1 >> 1) & mask_31,
+            ((byte_1 & mask_1) << 4) | ((byte_2 >> 4) & mask_15),
+            ((byte_2 & mask_15) << 1) | ((byte_3 >> 7) & mask_1),
+            (byte_3 >> 2) & mask_31,
+            ((byte_3 & mask_3) << 3) | ((byte_4 >> 5) & mask_7),
+            byte_4 & mask_31)):
+        codes[i::8] = lanes.to_bytes(count, 'big')
+    return bytes(codes)
+
+
+def _lanes_mask(mask: int, count: int) -> int:
+    """Big integer with the given 8-bit mask repeated ``count`` times"""
+    return int.from_bytes(bytes((mask,)) * count, 'big')
+
+
+def unpack_end(data: bytes) -> bytes:
+    """
+    Unpack the last bytes of a packed stream, including the code count
+    of the last group if there is one.
+
+    :param data: Last packed bytes, starting at a group boundary
+    :return: Unpacked codes, one per byte
+    """
+    if len(data) % 5 == 0:
+        return unpack_codes(data)
+
+    if len(data) % 5 != 1:
+        raise ReadError('Truncated packed 5-bit stream')
+
+    count = data[-1]
+    if not 1 <= count < 8 or len(data) == 1:
+        raise ReadError(f'Invalid packed group length: {count}')
+
+    return unpack_codes(data[:-1])[:len(data) // 5 * 8 - 8 + count]
@@ -0,0 +1,261 @@
+"""
+Handler for asynchronous serial lines, as sampled by a logic analyzer.
+
+On the line, each code is framed by a start bit (space, 0), followed by
+its 5 bits (least significant first, mark for 1), then by stop bits
+(mark). The line idles on mark between codes. The handlers read and
+write the line level sampled :py:attr:`SerialConfig.samples_per_bit`
+times per bit, packed 8 samples per byte (first sample in the most
+significant bit), or one sample per byte (0 or 1).
+
+As with hardware UARTs, the reader synchronizes on the falling edge of
+each start bit, then takes the majority of the samples around the
+middle of each bit. Clock drift and jitter are thus tolerated, as long
+as they stay below a fraction of a bit over a single frame.
+
+The work is done by whole blocks with ``bytes`` operations (searching,
+counting, translating), never sample per sample in Python:
+:py:func:`frame_codes` and :py:func:`find_frames` are also used by the
+audio handler.
+"""
+
+from functools import lru_cache
+from io import BufferedIOBase
+from itertools import accumulate
+from typing import List, NamedTuple, Tuple
+
+from .core import BlockReader, BaudotWriter
+from ..errors import INVALID_CODE, check_errors
+from ..exceptions import ReadError, WriteError
+
+__all__ = ['SerialReader', 'SerialWriter', 'SerialConfig', 'DEFAULT_SERIAL',
+           'frame_codes', 'find_frames', 'pack_samples', 'unpack_samples']
+
+#: Number of bytes read from the input at once
+READ_SIZE = 1 << 16
+
+_MARK, _SPACE = b'\x01', b'\x00'
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class SerialConfig(NamedTuple):
+    """
+    Timing of a serial line. The number of samples per bit does not
+    need to be an integer.
+    """
+    samples_per_bit: float = 8.  #: Sampling rate, in samples per bit
+    stop_bits: float = 1.5  #: Duration of the stop bits (usually 1 to 2)
+
+
+DEFAULT_SERIAL = SerialConfig()
+
+
+class SerialReader(BlockReader):
+    """
+    Reader of sampled serial lines.
+
+    Frames with a space instead of a stop bit are errors: with the
+    ``'strict'`` policy, they raise a :py:class:`.ReadError`; with
+    ``'replace'``, they are read as :py:data:`baudot.errors.INVALID_CODE`,
+    and with ``'ignore'`` they are dropped.
+
+    :param stream: Binary stream to read from
+    :param config: Timing of the line
+    :param packed: Whether samples are packed 8 per byte, or 1 per byte
+    :param errors: Policy for framing errors
+    """
+
+    def __init__(self, stream: BufferedIOBase,
+                 config: SerialConfig = DEFAULT_SERIAL, packed: bool = True,
+                 errors: str = 'strict'):
+        check_errors(errors)
+        super().__init__()
+        self.stream = stream
+        self.config = config
+        self.packed = packed
+        self.errors = errors
+        self._samples = _MARK  # Samples not read yet, after idle
+        self._offset = -1  # Position of the first one in the input
+
+    def read_block(self) -> bytes:
+        while True:
+            data = self.stream.read(READ_SIZE)
+            if not data:
+                return b''
+
+            samples = self._samples + (unpack_samples(data) if self.packed
+                                       else data)
+            codes, position = find_frames(samples, self.config, self.errors,
+                                          self._offset)
+            self._samples = samples[position:]
+            self._offset += position
+            if codes:
+                return bytes(codes)
+
+
+class SerialWriter(BaudotWriter):
+    """
+    Writer of sampled serial lines.
+
+    Call :py:meth:`close` (or use the writer as a context manager) when
+    done, to pad the last byte with idle samples.
+
+    :param stream: Binary stream to write to
+    :param config: Timing of the line
+    :param packed: Whether to pack samples 8 per byte, or write 1 per byte
+    """
+
+    def __init__(self, stream: BufferedIOBase,
+                 config: SerialConfig = DEFAULT_SERIAL, packed: bool = True):
+        self.stream = stream
+        self.config = config
+        self.packed = packed
+        self._time = 0.  # Start of the next frame, in samples
+        self._pending = b''  # Samples not packed yet
+
+    def write(self, code: int):
+        self.write_many(bytes([code]))
+
+    def write_many(self, codes: bytes):
+        samples, self._time = frame_codes(codes, self.config, self._time)
+        if not self.packed:
+            self.stream.write(samples)
+            return
+
+        samples = self._pending + samples
+        size = len(samples) // 8 * 8
+        self._pending = samples[size:]
+        self.stream.write(pack_samples(samples[:size]))
+
+    def close(self):
+        """Pad the last byte with idle samples"""
+        if self._pending:
+            self.stream.write(pack_samples(self._pending))
+            self._pending = b''
+
+
+def frame_codes(codes: bytes, config: SerialConfig,
+                time: float = 0.) -> Tuple[bytes, float]:
+    """
+    Frame codes as line samples.
+
+    Frames start at fractional sample times; the length of the stop
+    bits is adjusted to the closest sample.
+
+    :param codes: Codes to frame, one per byte
+    :param config: Timing of the line
+    :param time: Time at which the first frame starts, in samples
+    :return: Line samples, one per byte (1 for mark), and the time at
+        which the next frame starts
+    """
+    if not codes:
+        return b'', time
+    if max(codes) >= 32:
+        raise WriteError('Invalid 5-bit character code')
+
+    bodies = _frame_bodies(config.samples_per_bit)
+    length = config.samples_per_bit * (6 + config.stop_bits)
+    starts = [round(time + n * length) for n in range(len(codes) + 1)]
+    body = len(bodies[0])
+    parts: List[bytes] = [b''] * (2 * len(codes))
+    parts[::2] = map(bodies.__getitem__, codes)
+    parts[1::2] = [_MARK * (stop - start - body)
+                   for start, stop in zip(starts, starts[1:])]
+    return b''.join(parts), time + len(codes) * length
+
+
+def find_frames(samples: bytes, config: SerialConfig, errors: str = 'strict',
+                offset: int = 0) -> Tuple[bytearray, int]:
+    """
+    Find and read the complete frames in line samples.
+
+    :param samples: Line samples, one per byte (1 for mark)
+    :param config: Timing of the line
+    :param errors: Policy for framing errors (see :py:class:`SerialReader`)
+    :param offset: Position of the samples in the input, for errors
+    :return: Codes read, and the position of the first sample that must
+        be kept to read the next frames with more samples
+    """
+    # pylint: disable=too-many-locals
+    windows = _bit_windows(config.samples_per_bit)
+    start_bit, data_bits, stop_bit = windows[0], windows[1:6], windows[6]
+    skip = int(6.5 * config.samples_per_bit)  # To the middle of the stop bit
+    count, size = samples.count, len(samples)
+
+    codes = bytearray()
+    position = 0
+    while True:
+        index = samples.find(b'\x01\x00', position)
+        if index < 0:
+            # Keep the last sample, in case the next one is a start bit
+            return codes, max(size - 1, 0)
+        edge = index + 1
+        if edge + stop_bit[1] > size:
+            return codes, index
+
+        # Majority of the samples in the middle of each bit
+        low, high = start_bit
+        if 2 * count(1, edge + low, edge + high) > high - low:
+            position = edge  # A glitch, not a start bit
+            continue
+        position = edge + skip
+
+        low, high = stop_bit
+        if 2 * count(1, edge + low, edge + high) <= high - low:
+            if errors == 'strict':
+                raise ReadError(f'Framing error at sample {offset + edge}')
+            if errors == 'replace':
+                codes.append(INVALID_CODE)
+            continue
+
+        code = 0
+        for bit, (low, high) in enumerate(data_bits):
+            if 2 * count(1, edge + low, edge + high) > high - low:
+                code |= 1 << bit
+        codes.append(code)
+
+
+def pack_samples(samples: bytes) -> bytes:
+    """
+    Pack samples (0 or 1 per byte) 8 per byte, first sample first.
+    The last byte is padded with idle (mark) samples.
+    """
+    if not samples:
+        return b''
+    samples += _MARK * (-len(samples) % 8)
+    return int(samples.translate(_TO_DIGITS), 2).to_bytes(
+        len(samples) // 8, 'big')
+
+
+def unpack_samples(data: bytes) -> bytes:
+    """Unpack samples packed 8 per byte, to one sample per byte"""
+    if not data:
+        return b''
+    number = int.from_bytes(data, 'big')
+    return format(number, f'0{8 * len(data)}b').encode().translate(
+        _FROM_DIGITS)
+
+
+@lru_cache(maxsize=None)
+def _frame_bodies(samples_per_bit: float) -> List[bytes]:
+    """Samples of the start and data bits of each code"""
+    ends = [round(samples_per_bit * (bit + 1)) for bit in range(6)]
+    lengths = [ends[0]] + [b - a for a, b in zip(ends, ends[1:])]
+    return [
+        _SPACE * lengths[0] + b''.join(
+            (_MARK if code >> bit & 1 else _SPACE) * lengths[bit + 1]
+            for bit in range(5))
+        for code in range(32)
+    ]
+
+
+@lru_cache(maxsize=None)
+def _bit_windows(samples_per_bit: float) -> List[Tuple[int, int]]:
+    """Middle half of each bit of a frame, relative to its start"""
+    quarter = samples_per_bit / 4
+    windows = []
+    for middle in accumulate([samples_per_bit / 2] + [samples_per_bit] * 6):
+        low = round(middle - quarter)
+        windows.append((low, max(round(middle + quarter), low + 1)))
+    return windows
@@ -22,7 +22,10 @@ For example, the tape might look like:::
 """
 
 from collections import namedtuple
+from functools import lru_cache
 from io import TextIOBase
+from itertools import islice
+from typing import Dict, Tuple
 
 from .core import BaudotReader, BaudotWriter
 from ..exceptions import WriteError
@@ -45,11 +48,25 @@ class TapeReader(BaudotReader):
     def __init__(self, stream: TextIOBase, config: TapeConfig = DEFAULT_TAPE):
         self.stream = stream
         self.config = config
+        self._codes = tape_rows(config)[1]
 
     def __next__(self) -> int:
         line = next(self.stream)
-        pairs = zip(line.replace(self.config.sep, ''), MSB_FIRST)
-        return sum(n for c, n in pairs if c == self.config.punch)
+        code = self._codes.get(line)
+        return self._parse(line) if code is None else code
+
+    def read_into(self, buffer: bytearray) -> int:
+        lines = list(islice(self.stream, len(buffer)))
+        codes = list(map(self._codes.get, lines))
+        if None in codes:
+            # Some lines are not exactly as written by TapeWriter
+            codes = [self._parse(line) if code is None else code
+                     for line, code in zip(lines, codes)]
+        buffer[:len(codes)] = bytes(codes)
+        return len(codes)
+
+    def _parse(self, line: str) -> int:
+        return parse_row(line, self.config)
 
 
 class TapeWriter(BaudotWriter):
@@ -60,12 +77,49 @@ class TapeWriter(BaudotWriter):
     def __init__(self, stream: TextIOBase, config: TapeConfig = DEFAULT_TAPE):
         self.stream = stream
         self.config = config
+        self._rows = tape_rows(config)[0]
 
     def write(self, code: int):
         """Writes a code to tape"""
         if not 0 <= code < 32:
             raise WriteError('Invalid 5-bit character code')
 
-        chars = ''.join(self.config.punch if c == '1' else self.config.blank
+        self.stream.write(self._rows[code])
+
+    def write_many(self, codes: bytes):
+        """Writes several codes to tape"""
+        if codes and max(codes) >= 32:
+            raise WriteError('Invalid 5-bit character code')
+
+        self.stream.write(''.join(map(self._rows.__getitem__, codes)))
+
+
+@lru_cache(maxsize=None)
+def tape_rows(config: TapeConfig) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """
+    Get the 32 possible rows of a tape format (newline included),
+    and the mapping from those rows back to their codes.
+
+    The mapping is left empty if the format is ambiguous, for
+    example if it uses the same character twice.
+    """
+    rows = []
+    for code in range(32):
+        chars = ''.join(config.punch if c == '1' else config.blank
                         for c in f'{code:05b}')
-        self.stream.write(f"{chars[:3]}{self.config.sep}{chars[3:]}\n")
+        rows.append(f"{chars[:3]}{config.sep}{chars[3:]}\n")
+
+    codes = {row: code for code, row in enumerate(rows)}
+    if any(parse_row(row, config) != code for row, code in codes.items()):
+        codes = {}
+
+    return tuple(rows), codes
+
+
+def parse_row(line: str, config: TapeConfig) -> int:
+    """
+    Get the code of a tape row. Any character other than the punch
+    counts as blank, and missing characters as well.
+    """
+    pairs = zip(line.replace(config.sep, ''), MSB_FIRST)
+    return sum(n for c, n in pairs if c == config.punch)
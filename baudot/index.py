@@ -0,0 +1,279 @@
+"""
+Random access to large encoded files, through a sidecar index.
+
+Decoding a code requires the shift state, which depends on all the codes
+before it. An index records checkpoints at regular intervals of codes:
+the offset of the code, the number of characters decoded before it, and
+the state at that point. Any window of the file can then be decoded from
+the closest checkpoint before it, instead of from the start::
+
+    index = build_index('archive.hex', ITA2_STANDARD)
+    index.save('archive.hex' + INDEX_SUFFIX)
+
+    with IndexedReader('archive.hex', ITA2_STANDARD) as reader:
+        snippet = reader.read_chars(10_000_000, 10_000_200)
+
+Files can be in the ``'raw'`` (one code per byte), ``'hex'``,
+``'packed'`` or ``'tape'`` formats. Tape files must have rows of a
+fixed width in bytes, as written by :py:class:`.TapeWriter`.
+"""
+
+import json
+import os
+from array import array
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional
+
+from .codecs import BaudotCodec, Shift, compile_tabled
+from .exceptions import ReadError
+from .handlers.mapped import MappedCodes, little_endian
+from .handlers.tape import DEFAULT_TAPE, TapeConfig
+
+__all__ = ['build_index', 'CodeIndex', 'Checkpoint', 'IndexedReader',
+           'INDEX_SUFFIX']
+
+#: Default number of codes between two checkpoints
+INTERVAL = 1 << 16
+
+#: Suffix of the index files looked up by :py:class:`IndexedReader`
+INDEX_SUFFIX = '.bdx'
+
+_MAGIC = b'BAUDOT-INDEX 1\n'
+
+
+class Checkpoint(NamedTuple):
+    """Decoding state at a given code of a file"""
+    code: int  #: Offset of the code, in codes
+    char: int  #: Number of characters decoded before that code
+    state: Optional[Shift]  #: Active shift, ``None`` at the start
+
+
+class CodeIndex:
+    """
+    Checkpoints of an encoded file, every :py:attr:`interval` codes.
+
+    Use :py:func:`build_index` to create one, and :py:meth:`save` and
+    :py:meth:`load` to store it next to the file.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, fmt: str, interval: int, size: int,
+                 states: List[Optional[Shift]],
+                 config: TapeConfig = DEFAULT_TAPE):
+        # pylint: disable=too-many-arguments
+        #: Format of the file
+        self.fmt = fmt
+        #: Number of codes between two checkpoints
+        self.interval = interval
+        #: Size of the indexed file, in bytes
+        self.size = size
+        #: Tape format of the file, for the ``'tape'`` format
+        self.config = config
+        #: States of the codec, indexed by :py:attr:`states`
+        self.shifts = states
+        #: Offsets of the checkpoints, in codes
+        self.codes = array('q')
+        #: Offsets of the checkpoints, in characters
+        self.chars = array('q')
+        #: State of each checkpoint, as an index in :py:attr:`shifts`
+        self.states = array('B')
+        #: Total number of codes of the file
+        self.total_codes = 0
+        #: Total number of characters of the file
+        self.total_chars = 0
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, item: int) -> Checkpoint:
+        return Checkpoint(self.codes[item], self.chars[item],
+                          self.shifts[self.states[item]])
+
+    def add(self, code: int, char: int, state: Optional[Shift]):
+        """Add a checkpoint at the end of the index"""
+        self.codes.append(code)
+        self.chars.append(char)
+        self.states.append(self.shifts.index(state))
+
+    def at_code(self, offset: int) -> int:
+        """Position of the last checkpoint at or before a code offset"""
+        return min(offset // self.interval, len(self) - 1)
+
+    def at_char(self, offset: int) -> int:
+        """Position of the last checkpoint at or before a character offset"""
+        return max(bisect_right(self.chars, offset) - 1, 0)
+
+    def save(self, path: str):
+        """
+        Write the index to a file.
+
+        :param path: Path of the index file, usually the path of the
+            indexed file followed by :py:data:`INDEX_SUFFIX`
+        """
+        header = {
+            'format': self.fmt,
+            'interval': self.interval,
+            'size': self.size,
+            'config': list(self.config),
+            'shifts': [getattr(shift, 'name', None) for shift in self.shifts],
+            'checkpoints': len(self),
+            'total_codes': self.total_codes,
+            'total_chars': self.total_chars,
+        }
+        with open(path, 'wb') as file:
+            file.write(_MAGIC)
+            file.write(json.dumps(header).encode() + b'\n')
+            for values in (self.codes, self.chars, self.states):
+                file.write(little_endian(values).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'CodeIndex':
+        """
+        Read an index from a file written by :py:meth:`save`.
+
+        :param path: Path of the index file
+        :raises ReadError: If the file is not a valid index
+        """
+        with open(path, 'rb') as file:
+            if file.readline() != _MAGIC:
+                raise ReadError(f'Not a Baudot index file: {path}')
+            try:
+                header = json.loads(file.readline())
+                index = cls(
+                    header['format'], header['interval'], header['size'],
+                    [None if name is None else Shift(name)
+                     for name in header['shifts']],
+                    TapeConfig(*header['config']))
+                count = header['checkpoints']
+                for values in (index.codes, index.chars, index.states):
+                    values.frombytes(file.read(count * values.itemsize))
+                    values[:] = little_endian(values)
+                index.total_codes = header['total_codes']
+                index.total_chars = header['total_chars']
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ReadError(f'Invalid Baudot index file: {path}') from exc
+        return index
+
+
+def build_index(path: str, codec: BaudotCodec, fmt: str = 'hex',
+                interval: int = INTERVAL,
+                config: TapeConfig = DEFAULT_TAPE) -> CodeIndex:
+    """
+    Index an encoded file, by decoding it once entirely.
+
+    :param path: Path of the file to index
+    :param codec: Codec of the file, a :py:class:`.SimpleTabledCodec`
+    :param fmt: Format of the file: ``'raw'``, ``'hex'``, ``'packed'``
+        or ``'tape'``
+    :param interval: Number of codes between two checkpoints. Windows are
+        decoded from the closest checkpoint, so smaller intervals give
+        faster reads, but larger indexes.
+    :param config: Tape format of the file, for the ``'tape'`` format
+    :return: The index of the file
+    """
+    # pylint: disable=too-many-arguments
+    engine = compile_tabled(codec, 'Indexing')
+    with MappedCodes(path, fmt, config=config) as source:
+        index = CodeIndex(fmt, interval, source.size, list(engine.states),
+                          config)
+        state, chars = engine.initial, 0
+        for start in range(0, max(len(source), 1), interval):
+            index.add(start, chars, engine.shift_of(state))
+            text, state = engine.decode_codes(
+                source.read(start, start + interval), state)
+            chars += len(text)
+        index.total_codes, index.total_chars = len(source), chars
+    return index
+
+
+class IndexedReader:
+    """
+    Decoder of arbitrary windows of an indexed file.
+
+    :param path: Path of the encoded file
+    :param codec: Codec of the file, a :py:class:`.SimpleTabledCodec`
+    :param index: Index of the file. By default, it is loaded from the
+        path of the file followed by :py:data:`INDEX_SUFFIX`.
+    :raises ReadError: If the index does not match the file
+    """
+
+    def __init__(self, path: str, codec: BaudotCodec,
+                 index: Optional[CodeIndex] = None):
+        self.index = index if index is not None \
+            else CodeIndex.load(os.fspath(path) + INDEX_SUFFIX)
+        self._engine = compile_tabled(codec, 'Indexing')
+        self._source = MappedCodes(path, self.index.fmt,
+                                   config=self.index.config)
+        if self._source.size != self.index.size:
+            self._source.close()
+            raise ReadError(f'The index does not match the file: {path}')
+
+    def close(self):
+        """Release the file"""
+        self._source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read_codes(self, start: int, stop: int) -> bytes:
+        """
+        Read a window of codes, without decoding them.
+
+        :param start: Offset of the first code
+        :param stop: Offset after the last code
+        :return: Codes, one per byte
+        """
+        start, stop = _clip(start, stop, self.index.total_codes)
+        return self._source.read(start, stop)
+
+    def decode_codes(self, start: int, stop: int) -> str:
+        """
+        Decode a window of codes.
+
+        :param start: Offset of the first code
+        :param stop: Offset after the last code
+        :return: Characters decoded from those codes
+        """
+        start, stop = _clip(start, stop, self.index.total_codes)
+        checkpoint = self.index[self.index.at_code(start)]
+        state = self._state(checkpoint)
+        _, state = self._engine.decode_codes(
+            self._source.read(checkpoint.code, start), state)
+        chars, _ = self._engine.decode_codes(
+            self._source.read(start, stop), state)
+        return chars
+
+    def read_chars(self, start: int, stop: int) -> str:
+        """
+        Decode a window of characters.
+
+        :param start: Offset of the first character
+        :param stop: Offset after the last character
+        :return: Characters between these offsets
+        """
+        start, stop = _clip(start, stop, self.index.total_chars)
+        if start >= stop:
+            return ''
+
+        checkpoint = self.index[self.index.at_char(start)]
+        code, state = checkpoint.code, self._state(checkpoint)
+        chunks, count = [], checkpoint.char
+        while count < stop and code < self.index.total_codes:
+            chars, state = self._engine.decode_codes(
+                self._source.read(code, code + self.index.interval), state)
+            chunks.append(chars)
+            code += self.index.interval
+            count += len(chars)
+
+        offset = start - checkpoint.char
+        return ''.join(chunks)[offset:offset + stop - start]
+
+    def _state(self, checkpoint: Checkpoint) -> int:
+        return self._engine.state_of(checkpoint.state)
+
+
+def _clip(start: int, stop: int, length: int):
+    return max(0, min(start, length)), max(0, min(stop, length))
@@ -0,0 +1,327 @@
+"""
+Encoding with the fewest possible codes, shift codes included.
+
+The regular encoder picks the state of each character greedily, one
+character at a time. This encoder instead considers a whole text at once,
+and finds the sequence of codes that is the shortest overall, using
+dynamic programming over the codec's states: this matters for characters
+existing in several states, for characters appearing twice in a state,
+and for values made of several characters (as in ITA1, UK version).
+
+The paths are searched by windows of :py:data:`WINDOW` characters: when
+all the shortest paths found so far share a start, it is committed and
+forgotten. If they do not after a few windows, the best path so far is
+committed, so that memory stays bounded on texts of any length.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .codecs import SimpleTabledCodec, CompiledCodec
+from .errors import ENCODING_REPLACEMENT, ErrorReport, check_errors
+from .exceptions import EncodingError
+
+__all__ = ['encode_optimal', 'encode_codes_optimal', 'chunked_encoder']
+
+#: Number of characters searched before trying to commit the shortest path
+WINDOW = 4096
+
+# Way to reach a state: cost, previous state, value length, code (-1 for
+# none), and whether the value could not be encoded
+_Step = Tuple[int, int, int, int, bool]
+
+
+class _Graph(NamedTuple):
+    # Codes of the values that can be written in each state, by value
+    values: Dict[int, Dict[str, int]]
+    # Shortest sequence of shift codes between any two states
+    shifts: Dict[int, Dict[int, bytes]]
+    # Length of the longest value
+    longest: int
+    # Values of several characters
+    joined: Tuple[str, ...]
+
+
+class _Result(NamedTuple):
+    codes: bytes  # Codes of the committed path
+    state: int  # State at its end
+    count: int  # Number of characters it encodes
+    errors: List[int]  # Offsets of the characters that were not encoded
+
+
+def encode_optimal(chars: str, codec: SimpleTabledCodec) -> bytes:
+    """
+    Encode a unicode string to the shortest possible sequence of codes.
+    Decoding these codes gives the same string back.
+
+    :param chars: Unicode string to encode
+    :param codec: Codec to use for encoding
+    :return: Encoded codes, one per byte
+    """
+    engine = codec.compile()
+    codes, _ = encode_codes_optimal(engine, chars, engine.initial)
+    return codes
+
+
+def encode_codes_optimal(engine: CompiledCodec, chars: str,
+                         state: int) -> Tuple[bytes, int]:
+    """
+    Encode a unicode string to the shortest possible sequence of codes,
+    from a given state of a compiled codec. This is a drop-in replacement
+    for :py:meth:`.CompiledCodec.encode_codes`.
+
+    :param engine: Compiled codec to use for encoding
+    :param chars: Characters to encode
+    :param state: Current state of encoding
+    :return: Codes to emit (one per byte), and the new state
+    """
+    result = _search(_make_graph(engine), chars, state, final=True)
+    return result.codes, result.state
+
+
+def chunked_encoder(engine: CompiledCodec, errors: str = 'strict',
+                    report: Optional[ErrorReport] = None,
+                    on_error: Optional[Callable[[Exception], None]] = None):
+    """
+    Get a function encoding consecutive chunks of characters to the
+    shortest possible sequence of codes, as a whole.
+
+    The characters after the point where all the shortest paths agree
+    are held back, and searched again with the next chunk: values of
+    several characters may thus span two chunks. The returned function
+    takes a chunk and the current state, and returns the codes and the
+    new state; call it with an empty chunk at the end of the input, to
+    encode the characters held back.
+
+    :param engine: Compiled codec to use for encoding
+    :param errors: Policy for unsupported characters (see
+        :py:mod:`baudot.errors`). The replacements are part of the search.
+    :param report: Optional report of the offsets of invalid characters
+    :param on_error: Optional function called with each error handled
+    """
+    check_errors(errors)
+    graph = _make_graph(engine)
+    replacement = None if errors == 'strict' \
+        else ENCODING_REPLACEMENT if errors == 'replace' else ''
+    pending, position = '', 0
+
+    def encoder(chars: str, state: int) -> Tuple[bytes, int]:
+        nonlocal pending, position
+        text = pending + chars
+        result = _search(graph, text, state, not chars, replacement)
+        for offset in result.errors:
+            if report is not None:
+                report.add(position + offset)
+            if on_error is not None:
+                on_error(EncodingError(f"Unsupported value {text[offset]}"))
+        pending = text[result.count:]
+        position += result.count
+        return result.codes, result.state
+
+    return encoder
+
+
+def _search(graph: _Graph, chars: str, state: int, final: bool,
+            replacement: Optional[str] = None) -> _Result:
+    """
+    Find the shortest path encoding characters from a state, and commit
+    it. If the characters are not final, only the start that all the
+    shortest paths share is committed.
+
+    :param replacement: Replacement of the characters that cannot be
+        encoded (empty to drop them), or ``None`` to raise an error
+    """
+    # pylint: disable=too-many-locals,too-many-branches
+    # best[i] maps each state reachable after encoding chars[:base + i]
+    # to the best way to reach it
+    best: List[Dict[int, _Step]] = [{state: (0, state, 0, -1, False)}]
+    base, check = 0, WINDOW
+    pieces: List[bytes] = []
+    errors: List[int] = []
+    # Last position after which no more characters can change the path
+    limit = len(chars) - 1 if final else len(chars) - graph.longest + 1
+
+    def commit(position: int, end: int):
+        nonlocal best, base
+        codes, skipped = _backtrack(graph, best, position, end)
+        pieces.append(codes)
+        errors.extend(base + offset for offset in skipped)
+        best = [{end: best[position][end]}] + best[position + 1:]
+        base += position
+
+    for i in range(len(chars)):
+        before = best[i - base]
+        found = False
+        for length in range(1, min(graph.longest, len(chars) - i) + 1):
+            if len(best) <= i + length - base:
+                best.append({})
+            if before:
+                found |= _relax(graph, before, best[i + length - base],
+                                chars[i:i + length], length)
+        if before and not found and replacement is not None:
+            _skip(graph, before, best[i + 1 - base], replacement)
+
+        # All the paths go through the states of best[position] at a cut
+        position = i + 1
+        if position < check or position > limit \
+                or not _is_cut(graph, chars, position):
+            continue
+        check = position + WINDOW
+        frontier = best[position - base]
+        if not frontier:
+            raise _unsupported(chars, base, best)
+        common, end = _converge(best, position - base)
+        if not common and position - base >= 2 * WINDOW:
+            # No shared start: keep the best path so far
+            common = position - base
+            end, _ = min(frontier.items(), key=lambda item: item[1][0])
+        if common:
+            commit(common, end)
+
+    if final:
+        if not best[-1]:
+            raise _unsupported(chars, base, best)
+        # Prefer ending in the state we started from, then any state
+        end = min(best[-1], key=lambda st: (best[-1][st][0], st != state))
+        commit(len(best) - 1, end)
+        return _Result(b''.join(pieces), end, len(chars), errors)
+
+    # Commit up to where the paths reaching the last cut agree
+    position = limit
+    while position > base and not _is_cut(graph, chars, position):
+        position -= 1
+    if position > base:
+        if not best[position - base]:
+            raise _unsupported(chars, base, best)
+        common, end = _converge(best, position - base)
+        if common:
+            commit(common, end)
+    state = min(best[0])
+    return _Result(b''.join(pieces), state, base, errors)
+
+
+def _relax(graph: _Graph, before: Dict[int, _Step], after: Dict[int, _Step],
+           value: str, length: int, error: bool = False) -> bool:
+    """
+    Update the best ways to reach states by writing a value in place of
+    a number of characters.
+
+    :return: Whether the value can be written from any state of ``before``
+    """
+    # pylint: disable=too-many-arguments
+    found = False
+    for new_state, values in graph.values.items():
+        code = values.get(value)
+        if code is None:
+            continue
+        for old_state, (cost, *_) in before.items():
+            shifts = graph.shifts[old_state].get(new_state)
+            if shifts is None:
+                continue
+            found = True
+            # On ties, staying in the same state wins
+            candidate = (cost + len(shifts) + 1, old_state, length, code,
+                         error)
+            current = after.get(new_state)
+            if current is None or candidate[0] < current[0] or (
+                    candidate[0] == current[0] and old_state == new_state):
+                after[new_state] = candidate
+    return found
+
+
+def _skip(graph: _Graph, before: Dict[int, _Step], after: Dict[int, _Step],
+          replacement: str):
+    """Replace or drop a character that cannot be encoded"""
+    if replacement and _relax(graph, before, after, replacement, 1, True):
+        return
+    for state, (cost, *_) in before.items():
+        current = after.get(state)
+        if current is None or cost < current[0]:
+            after[state] = (cost, state, 1, -1, True)
+
+
+def _backtrack(graph: _Graph, best: List[Dict[int, _Step]],
+               position: int, state: int) -> Tuple[bytes, List[int]]:
+    """Codes of the path reaching a state of best[position], and the
+    positions of the characters it could not encode"""
+    chunks, skipped = [], []
+    while position:
+        _, previous, length, code, error = best[position][state]
+        position -= length
+        if error:
+            skipped.append(position)
+        if code >= 0:
+            chunks.append(bytes((code,)))
+            chunks.append(graph.shifts[previous][state])
+        state = previous
+    return b''.join(reversed(chunks)), skipped[::-1]
+
+
+def _converge(best: List[Dict[int, _Step]], position: int) -> Tuple[int, int]:
+    """Last position and state shared by the paths reaching
+    best[position], or ``(0, 0)``"""
+    shared = None
+    for state in best[position]:
+        nodes = set()
+        current = position
+        while current:
+            nodes.add((current, state))
+            _, state, length, _, _ = best[current][state]
+            current -= length
+        shared = nodes if shared is None else shared & nodes
+    return max(shared or (), default=(0, 0))
+
+
+def _is_cut(graph: _Graph, chars: str, position: int) -> bool:
+    """Whether no value of several characters spans a position"""
+    return not any(chars.startswith(value, position - offset)
+                   for value in graph.joined
+                   for offset in range(1, min(len(value), position + 1)))
+
+
+def _unsupported(chars: str, base: int,
+                 best: List[Dict[int, _Step]]) -> EncodingError:
+    reached = max(i for i, states in enumerate(best) if states)
+    return EncodingError(f"Unsupported value {chars[base + reached]}")
+
+
+@lru_cache(maxsize=None)
+def _make_graph(engine: CompiledCodec) -> _Graph:
+    states = range(0, 32 * len(engine.states), 32)
+
+    values: Dict[int, Dict[str, int]] = {state: {} for state in states}
+    moves: Dict[int, Dict[int, int]] = {state: {} for state in states}
+    for state in states:
+        for code in range(32):
+            entry = engine.decoding[state + code]
+            if entry is None:
+                continue
+            chars, new_state = entry
+            if chars:
+                values[state].setdefault(chars, code)
+            elif new_state != state:
+                moves[state].setdefault(new_state, code)
+
+    longest = max((len(value) for table in values.values() for value in table),
+                  default=1)
+    joined = {value for table in values.values() for value in table
+              if len(value) > 1}
+    return _Graph(values, _shortest_shifts(moves), longest,
+                  tuple(sorted(joined)))
+
+
+def _shortest_shifts(
+        moves: Dict[int, Dict[int, int]]) -> Dict[int, Dict[int, bytes]]:
+    """Breadth-first search of the shortest shift sequences"""
+    shifts: Dict[int, Dict[int, bytes]] = {}
+    for start in moves:
+        paths = shifts[start] = {start: b''}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for target, code in moves[current].items():
+                if target not in paths:
+                    paths[target] = paths[current] + bytes((code,))
+                    queue.append(target)
+    return shifts
@@ -0,0 +1,132 @@
+"""
+Parallel decoding of large files, over multiple processes.
+
+The state used to decode a code depends on all the codes before it,
+so a file cannot simply be cut in pieces decoded independently. Here,
+each chunk is decoded speculatively from every possible starting state;
+the results are then stitched together in order, each chunk picking the
+result matching the final state of the chunk before it.
+
+Speculation is cheap with the built-in codecs: their shift codes select
+the same state whatever the current state is, so only the codes up to
+the first shift need to be decoded more than once.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from io import TextIOBase
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from .codecs import SimpleTabledCodec, CompiledCodec
+from .exceptions import DecodingError
+from .handlers.mapped import MappedCodes
+
+__all__ = ['decode_parallel']
+
+#: Default number of codes per chunk
+CHUNK_SIZE = 1 << 22
+
+# Decoded text and final state for each starting state, or the exception
+# raised when decoding from that state
+_Outcomes = Dict[int, Union[Tuple[str, int], DecodingError]]
+# Result of a chunk: outcomes of its head for each starting state, and
+# outcomes of its tail for each state at the end of the head
+_Result = Tuple[_Outcomes, _Outcomes]
+
+
+def decode_parallel(path: str, codec: SimpleTabledCodec,
+                    workers: Optional[int] = None, *, fmt: str = 'hex',
+                    chunk_size: int = CHUNK_SIZE,
+                    stream: Optional[TextIOBase] = None) -> Optional[str]:
+    """
+    Decode a file of codes using several processes. The result is
+    exactly that of a sequential decoding.
+
+    :param path: Path of the file to decode
+    :param codec: Codec to use for decoding
+    :param workers: Number of processes, as many as CPUs by default
+    :param fmt: Format of the file: ``'raw'`` (one code per byte),
+        ``'hex'``, ``'packed'`` or ``'tape'``, as for
+        :py:class:`.MappedCodes`
+    :param chunk_size: Number of codes decoded by each task
+    :param stream: If given, the decoded text is written to this stream
+        as it comes instead of being returned
+    :return: Decoded string, or ``None`` if a stream was given
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    engine = codec.compile()
+    with MappedCodes(path, fmt) as source:
+        size = len(source)
+    # Whole groups of packed codes
+    step = max(chunk_size // 8, 1) * 8
+    tasks = [(start, start + step) for start in range(0, size, step)] \
+        or [(0, 0)]
+    chunks: List[str] = []
+    write = stream.write if stream is not None else chunks.append
+
+    workers = workers or os.cpu_count() or 1
+    state = engine.initial
+    with ProcessPoolExecutor(workers) as executor:
+        decode_chunk = partial(_decode_chunk, path, fmt, codec)
+        # Few results are kept waiting at a time, as they are large
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(executor.submit(decode_chunk, task))
+            if len(pending) >= 2 * workers:
+                state = _join(pending.popleft().result(), state, write)
+        while pending:
+            state = _join(pending.popleft().result(), state, write)
+
+    return None if stream is not None else ''.join(chunks)
+
+
+def _join(result: _Result, state: int, write) -> int:
+    """Write the text of a chunk decoded from a state, and return
+    the final state"""
+    heads, tails = result
+    for outcomes in heads, tails:
+        outcome = outcomes[state]
+        if isinstance(outcome, DecodingError):
+            raise outcome
+        chars, state = outcome
+        write(chars)
+    return state
+
+
+def _decode_chunk(path: str, fmt: str, codec: SimpleTabledCodec,
+                  task: Tuple[int, int]) -> _Result:
+    """Decode one chunk of a file, from all the possible states"""
+    start, stop = task
+    with MappedCodes(path, fmt) as source:
+        codes = source.read(start, stop)
+    return _speculate(codec.compile(), codes)
+
+
+def _speculate(engine: CompiledCodec, codes: bytes) -> _Result:
+    """Decode codes from all the possible states"""
+
+    # Codes after the first state-independent shift decode the same way
+    # from any starting state: they only need to be decoded once.
+    sync = [code for code, state in engine.shift_codes().items()
+            if state is not None]
+    cut = min((i for i in map(codes.find, sync) if i >= 0),
+              default=len(codes) - 1) + 1
+    head, tail = codes[:cut], codes[cut:]
+
+    # The tails are kept apart, so that each is sent back only once
+    heads: _Outcomes = {}
+    tails: _Outcomes = {}
+    for state in range(0, 32 * len(engine.states), 32):
+        try:
+            _, new_state = heads[state] = engine.decode_codes(head, state)
+        except DecodingError as exc:
+            heads[state] = exc
+            continue
+        if new_state not in tails:
+            try:
+                tails[new_state] = engine.decode_codes(tail, new_state)
+            except DecodingError as exc:
+                tails[new_state] = exc
+    return heads, tails
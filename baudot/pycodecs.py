@@ -0,0 +1,196 @@
+"""
+Integration of the Baudot codecs with the standard library ``codecs``.
+
+Once :py:func:`register` has been called (which importing :py:mod:`baudot`
+does), the built-in codecs are available by name to ``str.encode``,
+``bytes.decode``, ``open``, ``io.TextIOWrapper``, ``codecs.iterdecode``,
+etc. Encoded data holds one code per byte, like
+:py:func:`baudot.encode_to_codes` returns.
+
+=========== ===============================
+Name        Codec
+=========== ===============================
+``ita1``    :py:data:`baudot.codecs.ITA1_CONTINENTAL`
+``ita1-uk`` :py:data:`baudot.codecs.ITA1_UK`
+``ita2``    :py:data:`baudot.codecs.ITA2_STANDARD`
+``ita2-us`` :py:data:`baudot.codecs.ITA2_US`
+=========== ===============================
+
+Any other codec of the registry (see :py:func:`baudot.codecs.get`)
+is available as well, under its registered name.
+
+Encoders and decoders keep the shift state between calls, so that
+a text can be processed chunk by chunk. The ``'strict'``, ``'replace'``
+and ``'ignore'`` error handlers are supported (see :py:mod:`baudot.errors`).
+"""
+
+import codecs
+from typing import Optional, Tuple
+
+from .codecs import BaudotCodec, registry
+from .errors import check_errors, tolerant_decoder, tolerant_encoder
+
+__all__ = ['register', 'search', 'codec_info',
+           'IncrementalEncoder', 'IncrementalDecoder',
+           'StreamWriter', 'StreamReader']
+
+_REGISTERED = False
+
+
+class IncrementalEncoder(codecs.IncrementalEncoder):
+    """
+    Stateful encoder; subclasses set the :py:attr:`codec` to use.
+    """
+
+    codec: BaudotCodec
+
+    def __init__(self, errors: str = 'strict'):
+        super().__init__(errors)
+        check_errors(errors)
+        self._engine = self.codec.compile()
+        self._state = self._engine.initial
+        self._encode = self._engine.encode_codes
+        if errors != 'strict':
+            self._encode = tolerant_encoder(self._engine, self._encode, errors)
+
+    def encode(self, input: str, final: bool = False) -> bytes:
+        # pylint: disable=redefined-builtin
+        codes, self._state = self._encode(input, self._state)
+        return codes
+
+    def reset(self):
+        self._state = self._engine.initial
+
+    def getstate(self) -> int:
+        return self._state
+
+    def setstate(self, state: int):
+        self._state = state
+
+
+class IncrementalDecoder(codecs.IncrementalDecoder):
+    """
+    Stateful decoder; subclasses set the :py:attr:`codec` to use.
+    """
+
+    codec: BaudotCodec
+
+    def __init__(self, errors: str = 'strict'):
+        super().__init__(errors)
+        check_errors(errors)
+        self._engine = self.codec.compile()
+        self._state = self._engine.initial
+        self._decode = self._engine.decode_codes
+        if errors != 'strict':
+            self._decode = tolerant_decoder(self._engine, self._decode, errors)
+
+    def decode(self, input: bytes, final: bool = False) -> str:
+        # pylint: disable=redefined-builtin
+        chars, self._state = self._decode(input, self._state)
+        return chars
+
+    def reset(self):
+        self._state = self._engine.initial
+
+    def getstate(self) -> Tuple[bytes, int]:
+        return b'', self._state
+
+    def setstate(self, state: Tuple[bytes, int]):
+        self._state = state[1]
+
+
+class StreamWriter(codecs.StreamWriter):
+    """
+    Stream writer keeping the shift state between writes.
+    """
+    # pylint: disable=abstract-method
+
+    incremental_encoder = IncrementalEncoder
+
+    def __init__(self, stream, errors: str = 'strict'):
+        super().__init__(stream, errors)
+        self._encoder = self.incremental_encoder(errors)
+
+    def encode(self, input: str, errors: str = 'strict') -> Tuple[bytes, int]:
+        # pylint: disable=redefined-builtin,unused-argument
+        return self._encoder.encode(input), len(input)
+
+    def reset(self):
+        super().reset()
+        self._encoder.reset()
+
+
+class StreamReader(codecs.StreamReader):
+    """
+    Stream reader keeping the shift state between reads.
+    """
+    # pylint: disable=abstract-method
+
+    incremental_decoder = IncrementalDecoder
+
+    def __init__(self, stream, errors: str = 'strict'):
+        super().__init__(stream, errors)
+        self._decoder = self.incremental_decoder(errors)
+
+    def decode(self, input: bytes, errors: str = 'strict') -> Tuple[str, int]:
+        # pylint: disable=redefined-builtin,unused-argument
+        return self._decoder.decode(input), len(input)
+
+    def reset(self):
+        super().reset()
+        self._decoder.reset()
+
+
+def codec_info(name: str, codec: BaudotCodec) -> codecs.CodecInfo:
+    """
+    Build the standard library codec information for a Baudot codec.
+
+    :param name: Name under which the codec is known
+    :param codec: Baudot codec to use
+    :return: Codec information, as expected from a search function
+    """
+    encoder = type('IncrementalEncoder', (IncrementalEncoder,),
+                   {'codec': codec})
+    decoder = type('IncrementalDecoder', (IncrementalDecoder,),
+                   {'codec': codec})
+
+    def encode(chars: str, errors: str = 'strict') -> Tuple[bytes, int]:
+        return encoder(errors).encode(chars, True), len(chars)
+
+    def decode(codes: bytes, errors: str = 'strict') -> Tuple[str, int]:
+        return decoder(errors).decode(codes, True), len(codes)
+
+    return codecs.CodecInfo(
+        encode, decode, name=name,
+        incrementalencoder=encoder, incrementaldecoder=decoder,
+        streamwriter=type('StreamWriter', (StreamWriter,),
+                          {'incremental_encoder': encoder}),
+        streamreader=type('StreamReader', (StreamReader,),
+                          {'incremental_decoder': decoder}),
+    )
+
+
+def search(name: str) -> Optional[codecs.CodecInfo]:
+    """
+    Search function for the standard library codec registry.
+
+    :param name: Name of the wanted encoding
+    :return: Codec information, or ``None`` if not a Baudot codec
+    """
+    name = registry.normalize(name)
+    try:
+        codec = registry.get(name)
+    except LookupError:
+        return None
+    return codec_info(name, codec)
+
+
+def register():
+    """
+    Register the Baudot codecs with the standard library. Calling this
+    function more than once has no effect.
+    """
+    global _REGISTERED  # pylint: disable=global-statement
+    if not _REGISTERED:
+        codecs.register(search)
+        _REGISTERED = True
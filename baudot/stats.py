@@ -0,0 +1,152 @@
+"""
+Instrumentation of encoding and decoding operations.
+
+A :py:class:`CodecStats` object can be passed to :py:func:`baudot.encode`
+and :py:func:`baudot.decode` to collect counters and timings. When no
+stats object is passed, nothing is measured and nothing is slowed down.
+"""
+
+from collections import Counter
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .codecs import CodecEngine, CompiledCodec, Shift
+from .errors import RESYNC_WINDOW
+from .exceptions import DecodingError
+
+__all__ = ['CodecStats']
+
+
+class CodecStats:
+    """
+    Counters and timings of encoding or decoding operations.
+
+    The same object may be passed to several calls, which adds up
+    their measures.
+    """
+
+    def __init__(self):
+        #: Number of codes emitted (encoding) or consumed (decoding)
+        self.codes = 0
+        #: Number of characters consumed (encoding) or produced (decoding)
+        self.chars = 0
+        #: Number of shift codes, by selected state
+        self.shifts: Dict[Optional[Shift], int] = Counter()
+        #: Time spent in the codec, in seconds
+        self.codec_time = 0.0
+        #: Time spent reading and writing through streams and handlers
+        self.io_time = 0.0
+        #: Number of errors, raised or handled by an error policy, by
+        #: exception type name
+        self.errors: Dict[str, int] = Counter()
+
+    def __repr__(self):
+        return (f'<CodecStats codes={self.codes} chars={self.chars} '
+                f'shift_ratio={self.shift_ratio:.3f} '
+                f'codec_time={self.codec_time:.6f} io_time={self.io_time:.6f} '
+                f'errors={sum(self.errors.values())}>')
+
+    @property
+    def shift_codes(self) -> int:
+        """Total number of shift codes"""
+        return sum(self.shifts.values())
+
+    @property
+    def shift_ratio(self) -> float:
+        """Share of the codes that are shift codes"""
+        return self.shift_codes / self.codes if self.codes else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """All measures, as a JSON-friendly dictionary"""
+        return {
+            'codes': self.codes,
+            'chars': self.chars,
+            'shifts': {getattr(shift, 'name', None): count
+                       for shift, count in self.shifts.items()},
+            'shift_codes': self.shift_codes,
+            'shift_ratio': self.shift_ratio,
+            'codec_time': self.codec_time,
+            'io_time': self.io_time,
+            'errors': dict(self.errors),
+        }
+
+    def count_error(self, error: Exception):
+        """Count an error, raised or handled by an error policy"""
+        self.errors[type(error).__name__] += 1
+
+    def timed_io(self, func: Callable) -> Callable:
+        """Wrap an input/output function to measure it"""
+        @wraps(func)
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return func(*args)
+            except Exception as exc:
+                self.count_error(exc)
+                raise
+            finally:
+                self.io_time += perf_counter() - start
+        return wrapper
+
+    def encoder(self, engine: CodecEngine,
+                encode_codes: Callable[[str, Any], Tuple[bytes, Any]]):
+        """Wrap the encoding function of an engine to measure it"""
+        @wraps(encode_codes)
+        def wrapper(chars: str, state: Any) -> Tuple[bytes, Any]:
+            codes, new_state = self._run(encode_codes, chars, state)
+            self.chars += len(chars)
+            self._count_codes(engine, codes, state)
+            return codes, new_state
+        return wrapper
+
+    def decoder(self, engine: CodecEngine,
+                decode_codes: Callable[[bytes, Any], Tuple[str, Any]]):
+        """Wrap the decoding function of an engine to measure it"""
+        @wraps(decode_codes)
+        def wrapper(codes: bytes, state: Any) -> Tuple[str, Any]:
+            chars, new_state = self._run(decode_codes, codes, state)
+            self.chars += len(chars)
+            self._count_codes(engine, codes, state)
+            return chars, new_state
+        return wrapper
+
+    def _run(self, func: Callable, *args):
+        start = perf_counter()
+        try:
+            return func(*args)
+        except Exception as exc:
+            self.count_error(exc)
+            raise
+        finally:
+            self.codec_time += perf_counter() - start
+
+    def _count_codes(self, engine: CodecEngine, codes: bytes, state: Any):
+        self.codes += len(codes)
+
+        if isinstance(engine, CompiledCodec):
+            # Shift codes that do not depend on the state can be counted
+            # without following the state code after code
+            shifts = engine.shift_codes()
+            if None not in shifts.values():
+                data = bytes(codes)  # Decoded chunks may be memoryviews
+                for code, target in shifts.items():
+                    self.shifts[engine.shift_of(target)] += data.count(code)
+                return
+
+        # Follow the state as the decoders do, invalid codes included
+        for index, code in enumerate(codes):
+            try:
+                chars, state = engine.decode_code(code, state)
+            except DecodingError:
+                if code >= 32:
+                    following = codes[index + 1:index + 1 + RESYNC_WINDOW]
+                    state = engine.resync_state(state, following)
+                    continue
+                try:
+                    chars, state = engine.decode_code(
+                        code, engine.guess_state(state))
+                except DecodingError:
+                    continue
+            if not chars:
+                self.shifts[engine.shift_of(state)] += 1
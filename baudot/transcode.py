@@ -0,0 +1,225 @@
+"""
+Direct conversion of codes from one codec to another.
+
+Instead of decoding to unicode then encoding again, a transition table is
+precomputed from every pair of source and destination states, and every
+source code, to the destination codes to emit and the new pair of states.
+Codes are then converted with a single lookup each.
+
+With a non-strict error policy, chunks holding invalid source codes are
+converted again code per code, guessing the source state as the
+decoders of :py:mod:`baudot.errors` do.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from .codecs import BaudotCodec, CompiledCodec
+from .core import read_chunks
+from .errors import RESYNC_WINDOW, check_errors
+from .exceptions import DecodingError, EncodingError
+from .handlers import BaudotReader, BaudotWriter
+
+__all__ = ['transcode', 'transcode_codes', 'TranscodingTable']
+
+
+class TranscodingTable:
+    """
+    Transition table between two compiled codecs.
+
+    States are pairs of source and destination states, identified by
+    the offset of their row in :py:attr:`transitions` (multiples of 32).
+
+    :param source: Codec of the input codes
+    :param destination: Codec of the output codes
+    :param errors: What to do with invalid source codes, and with
+        characters that the destination codec cannot encode: raise an
+        error (``'strict'``), drop them (``'ignore'``) or encode
+        ``replacement`` instead (``'replace'``)
+    :param replacement: Replacement string for the ``'replace'`` policy
+    """
+
+    def __init__(self, source: CompiledCodec, destination: CompiledCodec,
+                 errors: str = 'strict', replacement: str = '?'):
+        check_errors(errors)
+
+        self.source = source
+        self.destination = destination
+        self.errors = errors
+        self.replacement = replacement
+        self.initial = 0
+
+        #: Entries are the codes to emit and the new state, or ``None``
+        #: if the code cannot be converted
+        self.transitions: List[Optional[Tuple[bytes, int]]] = []
+
+        n_dst = len(destination.states)
+        for src_state in range(0, 32 * len(source.states), 32):
+            for dst_state in range(0, 32 * n_dst, 32):
+                for code in range(32):
+                    entry = self._convert(
+                        source.decoding[src_state + code], dst_state,
+                        errors, replacement)
+                    if entry is not None:
+                        codes, (new_src, new_dst) = entry
+                        entry = codes, self._join(new_src, new_dst)
+                    self.transitions.append(entry)
+
+    def transcode(self, codes: Sequence[int], state: int) -> Tuple[bytes, int]:
+        """
+        Convert a sequence of codes.
+
+        :param codes: Source codes, e.g. a ``bytes`` object
+        :param state: Current state of conversion
+        :return: Destination codes (one per byte), and the new state
+        """
+        try:
+            return self._transcode(codes, state)
+        except (DecodingError, EncodingError):
+            if self.errors == 'strict':
+                raise
+        return self._transcode_slow(codes, state)
+
+    def _transcode(self, codes: Sequence[int],
+                   state: int) -> Tuple[bytes, int]:
+        if codes and max(codes) >= 32:
+            code = next(c for c in codes if c >= 32)
+            raise DecodingError(f"Invalid code: {code}")
+
+        table = self.transitions
+        output = bytearray()
+
+        try:
+            for code in codes:
+                converted, state = table[state + code]
+                output += converted
+        except TypeError:  # Unpacking a None entry
+            raise self._error(code, state) from None
+
+        return bytes(output), state
+
+    def _transcode_slow(self, codes: Sequence[int],
+                        state: int) -> Tuple[bytes, int]:
+        table, source = self.transitions, self.source
+        output = bytearray()
+        for index, code in enumerate(codes):
+            entry = table[state + code] if code < 32 else None
+            if entry is None:
+                src_state, dst_state = self._split(state)
+                if code >= 32:  # Garbage, maybe a lost shift code
+                    following = codes[index + 1:index + 1 + RESYNC_WINDOW]
+                    src_state = source.resync_state(src_state, following)
+                elif source.guess_state(src_state) != src_state:
+                    src_state = source.guess_state(src_state)
+                    entry = table[self._join(src_state, dst_state) + code]
+                if entry is None:
+                    entry = self._replace(src_state, dst_state)
+            converted, state = entry
+            output += converted
+        return bytes(output), state
+
+    def _replace(self, src_state: int, dst_state: int) -> Tuple[bytes, int]:
+        """Transition for an invalid source code"""
+        codes = b''
+        if self.errors == 'replace':
+            try:
+                codes, dst_state = self.destination.encode_codes(
+                    self.replacement, dst_state)
+            except EncodingError:
+                pass
+        return codes, self._join(src_state, dst_state)
+
+    def _split(self, state: int) -> Tuple[int, int]:
+        """Source and destination states of a state"""
+        n_dst = len(self.destination.states)
+        return state // 32 // n_dst * 32, state // 32 % n_dst * 32
+
+    def _join(self, src_state: int, dst_state: int) -> int:
+        """State of a pair of source and destination states"""
+        return (src_state * len(self.destination.states) + dst_state) \
+            // 32 * 32
+
+    def _convert(self, entry: Optional[Tuple[str, int]], dst_state: int,
+                 errors: str, replacement: str):
+        """Transition for a decoded entry, from a destination state"""
+        if entry is None:
+            return None
+        chars, src_state = entry
+
+        try:
+            codes, dst_state = self.destination.encode_codes(chars, dst_state)
+        except EncodingError:
+            if errors == 'strict':
+                return None
+            codes = b''
+            if errors == 'replace':
+                try:
+                    codes, dst_state = self.destination.encode_codes(
+                        replacement, dst_state)
+                except EncodingError:
+                    return None
+
+        return codes, (src_state, dst_state)
+
+    def _error(self, code: int, state: int) -> Exception:
+        """Error to raise when a code cannot be converted"""
+        src_state, dst_state = self._split(state)
+        # Let the codecs raise the appropriate error
+        chars, _ = self.source.decode_code(code, src_state)
+        self.destination.encode_codes(chars, dst_state)
+        return EncodingError(f"Unsupported value {chars}")
+
+
+@lru_cache(maxsize=None)
+def _make_table(source: BaudotCodec, destination: BaudotCodec,
+                errors: str, replacement: str) -> TranscodingTable:
+    source_engine = source.compile()
+    destination_engine = destination.compile()
+    if not isinstance(source_engine, CompiledCodec) or \
+            not isinstance(destination_engine, CompiledCodec):
+        raise TypeError('Transcoding requires SimpleTabledCodec codecs')
+    return TranscodingTable(source_engine, destination_engine,
+                            errors, replacement)
+
+
+def transcode(reader: BaudotReader, src_codec: BaudotCodec,
+              dst_codec: BaudotCodec, writer: BaudotWriter,
+              errors: str = 'strict', replacement: str = '?'):
+    """
+    Convert a baudot code stream from a reader to another codec, and
+    write it to a writer. The result is the same as decoding then
+    encoding again, but no unicode text is produced.
+
+    :param reader: Reader instance that will read codes from an input
+    :param src_codec: Codec of the input codes
+    :param dst_codec: Codec of the output codes
+    :param writer: Writer instance for the wanted output format
+    :param errors: Policy for invalid codes, and for characters that
+        ``dst_codec`` cannot encode (see :py:class:`TranscodingTable`)
+    :param replacement: Replacement string for the ``'replace'`` policy
+    """
+    # pylint: disable=too-many-arguments
+    table = _make_table(src_codec, dst_codec, errors, replacement)
+    state = table.initial
+    for codes in read_chunks(reader.read_into):
+        converted, state = table.transcode(codes, state)
+        writer.write_many(converted)
+
+
+def transcode_codes(codes: Sequence[int], src_codec: BaudotCodec,
+                    dst_codec: BaudotCodec, errors: str = 'strict',
+                    replacement: str = '?') -> bytes:
+    """
+    Convert codes from a codec to another.
+
+    :param codes: Codes to convert, one per byte
+    :param src_codec: Codec of the input codes
+    :param dst_codec: Codec of the output codes
+    :param errors: Policy for invalid codes, and for characters that
+        ``dst_codec`` cannot encode (see :py:class:`TranscodingTable`)
+    :param replacement: Replacement string for the ``'replace'`` policy
+    :return: Converted codes, one per byte
+    """
+    table = _make_table(src_codec, dst_codec, errors, replacement)
+    converted, _ = table.transcode(codes, table.initial)
+    return converted
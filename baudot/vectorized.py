@@ -0,0 +1,151 @@
+"""
+Vectorized decoding tools, for very large inputs.
+
+This module requires `NumPy <https://numpy.org/>`_, which is an optional
+dependency of this library (``pip install baudot[numpy]``).
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as _exc:
+    raise ImportError(
+        'baudot.vectorized requires NumPy: pip install baudot[numpy]'
+    ) from _exc
+
+from .codecs import SimpleTabledCodec
+from .exceptions import DecodingError
+
+__all__ = ['decode_array']
+
+#: Number of codes processed per vectorized operation
+BLOCK_SIZE = 1 << 20
+
+_POINT_ENCODINGS = (('u1', 'latin-1'), ('<u2', 'utf-16-le'),
+                    ('<u4', 'utf-32-le'))
+
+
+class _Tables(NamedTuple):
+    # Lookup tables are flattened from (n_states, 32) arrays
+    valid: 'np.ndarray'  # booleans
+    shift_target: 'np.ndarray'  # (32,) target state, -1 if not a shift
+    values: 'np.ndarray'  # strings
+    points: Optional['np.ndarray']  # code points, if all are single
+    encoding: str  # Python encoding matching the dtype of ``points``
+
+
+def decode_array(codes: 'np.ndarray', codec: SimpleTabledCodec) -> str:
+    """
+    Decode an array of codes to a unicode string, using a given codec.
+
+    Instead of following the state code after code, this finds all the
+    shift codes at once, forward-fills the state they select, then
+    gathers every character from a ``(n_states, 32)`` table. The result
+    is exactly that of :py:func:`baudot.decode_codes`.
+
+    This only works if each shift code selects the same state whatever
+    the current state is, which is the case for all built-in codecs.
+    Other codecs fall back to the regular (non-vectorized) engine.
+
+    :param codes: One-dimensional array of codes (any integer type)
+    :param codec: Codec to use for decoding
+    :return: Decoded Unicode string
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 1:
+        raise ValueError('Codes must be a one-dimensional array')
+    if not codes.size:
+        return ''
+
+    invalid = (codes < 0) | (codes >= 32)
+    if invalid.any():
+        code = codes[np.argmax(invalid)]
+        raise DecodingError(f"Invalid code: {code}")
+
+    engine = codec.compile()
+    tables = _make_tables(codec)
+    if tables is None:
+        chars, _ = engine.decode_codes(codes.astype(np.uint8).tobytes(),
+                                       engine.initial)
+        return chars
+
+    codes = codes.astype(np.uint8)
+    state, chunks = 0, []
+    for start in range(0, codes.size, BLOCK_SIZE):
+        block = codes[start:start + BLOCK_SIZE]
+        chars, state = _decode_block(block, state, tables, engine.states)
+        chunks.append(chars)
+    return ''.join(chunks)
+
+
+def _decode_block(codes: 'np.ndarray', state: int, tables: _Tables,
+                  states: tuple) -> Tuple[str, int]:
+    size = codes.size
+
+    # For each code, find the last shift code before it (1-based index
+    # in the block, 0 if none), then get the state that shift selects.
+    targets = tables.shift_target[codes]
+    is_shift = targets >= 0
+    last_shift = np.maximum.accumulate(
+        np.where(is_shift, np.arange(1, size + 1, dtype=np.int32), 0))
+
+    selected = np.empty(size + 1, dtype=np.intp)
+    selected[0] = state
+    selected[1:] = targets
+    previous = np.empty(size, dtype=np.int32)
+    previous[0] = 0
+    previous[1:] = last_shift[:-1]
+    block_states = selected[previous]
+
+    index = block_states * 32 + codes
+    valid = tables.valid[index]
+    if not valid.all():
+        state = states[block_states[np.argmin(valid)]]
+        raise DecodingError(f"Unrecognized state: {state}")
+
+    new_state = int(selected[last_shift[-1]])
+    index = index[~is_shift]
+    if tables.points is None:
+        return ''.join(tables.values[index].tolist()), new_state
+
+    points = tables.points[index]
+    return points.tobytes().decode(tables.encoding), new_state
+
+
+@lru_cache(maxsize=None)
+def _make_tables(codec: SimpleTabledCodec) -> Optional[_Tables]:
+    """
+    Build the lookup arrays for a codec, or return ``None``
+    if its shift codes depend on the current state.
+    """
+    engine = codec.compile()
+    n_states = len(engine.states)
+
+    shifts = engine.shift_codes()
+    if None in shifts.values():
+        return None
+
+    valid = np.zeros((n_states, 32), dtype=bool)
+    shift_target = np.full(32, -1, dtype=np.intp)
+    values = np.full((n_states, 32), '', dtype=object)
+    for code, state in shifts.items():
+        shift_target[code] = state // 32
+
+    for index, entry in enumerate(engine.decoding):
+        if entry is not None:
+            valid.flat[index] = True
+            values.flat[index] = entry[0]
+
+    values = values.ravel()
+    points, encoding = None, ''
+    if all(len(value) <= 1 for value in values):
+        points = np.array([ord(value) if value else 0 for value in values])
+        # Smallest fixed-width encoding for these code points
+        for dtype, encoding in _POINT_ENCODINGS:
+            if points.max() <= np.iinfo(dtype).max:
+                points = points.astype(dtype)
+                break
+
+    return _Tables(valid.ravel(), shift_target, values, points, encoding)
@@ -0,0 +1,246 @@
+"""
+Throughput benchmarks for the Baudot library.
+
+Every combination of codec, handler and engine is timed on several
+synthetic corpora, for encoding and decoding. Results are printed as a
+table, and can be written as JSON to compare releases::
+
+    python benchmarks/bench_throughput.py --size 1000000 --output bench.json
+
+Each measure reports codes per second and characters per second (best of
+``--repeat`` runs), and the peak memory allocated during one extra run,
+traced separately so that tracing does not distort the timings.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+import baudot
+from baudot import handlers
+from baudot.codecs import (
+    BaudotCodec, CodecEngine, SimpleTabledCodec,
+    ITA1_CONTINENTAL, ITA1_UK, ITA2_STANDARD, ITA2_US)
+
+try:
+    from baudot import vectorized
+except ImportError:
+    vectorized = None
+
+CODECS = {
+    'ita1': ITA1_CONTINENTAL,
+    'ita1-uk': ITA1_UK,
+    'ita2': ITA2_STANDARD,
+    'ita2-us': ITA2_US,
+}
+
+
+class GenericCodec(BaudotCodec):
+    """Codec wrapper that does not compile, to time the generic engine"""
+
+    def __init__(self, codec: SimpleTabledCodec):
+        self.codec = codec
+
+    def encode(self, value, state):
+        return self.codec.encode(value, state)
+
+    def decode(self, code, state):
+        return self.codec.decode(code, state)
+
+    def compile(self):
+        return CodecEngine(self)
+
+
+# Corpora
+
+def make_corpora(codec: SimpleTabledCodec, size: int) -> Dict[str, str]:
+    """Synthetic texts of about ``size`` characters"""
+    engine = codec.compile()
+    rng = random.Random(1870)
+
+    # Characters written without shift in each state, and in all of them
+    by_state = [set(char for char, (codes, _) in engine.encoding[state].items()
+                    if len(char) == 1 and len(codes) == 1)
+                for state in range(32, 32 * len(engine.states), 32)]
+    common = set.intersection(*by_state)
+    letters, figures = (sorted(chars - common) for chars in by_state[:2])
+
+    def words(alphabet, count):
+        return ' '.join(''.join(rng.choices(alphabet, k=rng.randint(1, 9)))
+                        for _ in range(count))
+
+    return {
+        'letters': words(letters, size // 5)[:size],
+        'figures': words(figures, size // 5)[:size],
+        'mixed': ' '.join(words(letters, 8) + ' ' + words(figures, 1)
+                          for _ in range(size // 50))[:size],
+        'thrashing': ''.join(rng.choice(letters) + rng.choice(figures)
+                             for _ in range(size // 2)),
+    }
+
+
+# Handlers
+
+def _tape():
+    return StringIO, handlers.TapeWriter, handlers.TapeReader
+
+
+def _hex():
+    return BytesIO, handlers.HexBytesWriter, handlers.HexBytesReader
+
+
+def _packed():
+    return BytesIO, handlers.PackedWriter, handlers.PackedReader
+
+
+HANDLERS = {'tape': _tape, 'hex': _hex, 'packed': _packed}
+MAPPED = {'hex': handlers.MappedHexReader,
+          'packed': handlers.MappedPackedReader}
+
+
+def write_with(handler: str, codec: BaudotCodec, text: str, func: Callable):
+    """Encode a text through a handler, return the written data"""
+    stream_type, writer_type, _ = HANDLERS[handler]()
+    stream = stream_type()
+    with writer_type(stream) as writer:
+        func(text, codec, writer)
+    return stream.getvalue()
+
+
+def read_with(handler: str, codec: BaudotCodec, data, func: Callable):
+    """Decode data through a handler"""
+    stream_type, _, reader_type = HANDLERS[handler]()
+    return func(reader_type(stream_type(data)), codec)
+
+
+def _encode_stream(text, codec, writer):
+    with StringIO(text) as stream:
+        baudot.encode(stream, codec, writer)
+
+
+def _decode_stream(reader, codec):
+    with StringIO() as stream:
+        baudot.decode(reader, codec, stream)
+        return stream.getvalue()
+
+
+# Measures
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best time of several runs, and peak memory of one more"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def benchmarks(codec_name: str, corpus: str, text: str, tmp: Path):
+    """Yield (name, function) pairs for a codec and a corpus"""
+    codec = CODECS[codec_name]
+    codes = baudot.encode_to_codes(text, codec)
+    generic = GenericCodec(codec)
+
+    yield 'encode_to_codes/compiled', lambda: baudot.encode_to_codes(text, codec)
+    yield 'encode_to_codes/generic', lambda: baudot.encode_to_codes(text, generic)
+    yield 'encode_to_codes/optimal', \
+        lambda: baudot.encode_to_codes(text, codec, optimal=True)
+    yield 'decode_codes/compiled', lambda: baudot.decode_codes(codes, codec)
+    yield 'decode_codes/generic', lambda: baudot.decode_codes(codes, generic)
+    if vectorized is not None:
+        array = vectorized.np.frombuffer(codes, dtype=vectorized.np.uint8)
+        yield 'decode_array/vectorized', \
+            lambda: vectorized.decode_array(array, codec)
+
+    for handler in HANDLERS:
+        data = write_with(handler, codec, text, baudot.encode_str)
+        yield f'encode_str/{handler}', \
+            lambda h=handler: write_with(h, codec, text, baudot.encode_str)
+        yield f'encode/{handler}', \
+            lambda h=handler: write_with(h, codec, text, _encode_stream)
+        yield f'decode_to_str/{handler}', \
+            lambda h=handler, d=data: read_with(h, codec, d, baudot.decode_to_str)
+        yield f'decode/{handler}', \
+            lambda h=handler, d=data: read_with(h, codec, d, _decode_stream)
+
+        if handler in MAPPED:
+            path = tmp / f'{codec_name}-{corpus}.{handler}'
+            path.write_bytes(data)
+            yield f'decode_to_str/mapped-{handler}', \
+                lambda h=handler, p=path: _decode_mapped(h, p, codec)
+
+
+def _decode_mapped(handler: str, path: Path, codec: BaudotCodec):
+    with MAPPED[handler](path) as reader:
+        return baudot.decode_to_str(reader, codec)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=200_000,
+                        help='characters per corpus (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per measure (default: %(default)s)')
+    parser.add_argument('--codec', action='append', choices=sorted(CODECS),
+                        help='codec(s) to benchmark (default: all)')
+    parser.add_argument('--filter', default='',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', help='write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec_name in args.codec or sorted(CODECS):
+            codec = CODECS[codec_name]
+            for corpus, text in make_corpora(codec, args.size).items():
+                n_codes = len(baudot.encode_to_codes(text, codec))
+                for name, func in benchmarks(codec_name, corpus, text,
+                                             Path(tmp)):
+                    if args.filter not in name:
+                        continue
+                    result = measure(func, args.repeat)
+                    result.update(
+                        benchmark=name, codec=codec_name, corpus=corpus,
+                        chars=len(text), codes=n_codes,
+                        codes_per_second=n_codes / result['seconds'],
+                        chars_per_second=len(text) / result['seconds'])
+                    results.append(result)
+                    print(f"{codec_name:8} {corpus:10} {name:32} "
+                          f"{result['codes_per_second'] / 1e6:8.2f} Mcodes/s "
+                          f"{result['peak_bytes'] / 2**20:8.1f} MiB",
+                          flush=True)
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'size': args.size,
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
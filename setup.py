@@ -36,6 +36,8 @@ setup(
     license='LGPLv3',
     python_requires='>=3.7.0',
     packages=find_packages(exclude=('tests',)),
+    extras_require={'numpy': ['numpy']},
+    entry_points={'console_scripts': ['baudot=baudot.cli:main']},
     test_requires=["pytest", "hypothesis", "coverage", "pylint"],
     classifiers=[
         'Development Status :: 4 - Beta',
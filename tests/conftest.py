@@ -0,0 +1,23 @@
+"""
+Helpers shared by the tests of the file-based tools
+"""
+
+from baudot import handlers
+
+MESSAGE = 'RYRYRY 1234 THE QUICK BROWN FOX (5/7) ' * 50
+
+
+def write_codes(path, fmt, codes):
+    """Write codes to a file, in one of the formats of MappedCodes"""
+    if fmt == 'tape':
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            handlers.TapeWriter(file).write_many(codes)
+        return
+    with open(path, 'wb') as file:
+        if fmt == 'raw':
+            file.write(codes)
+        elif fmt == 'hex':
+            handlers.HexBytesWriter(file).write_many(codes)
+        else:
+            with handlers.PackedWriter(file) as writer:
+                writer.write_many(codes)
@@ -0,0 +1,47 @@
+"""
+Tests for the asyncio tools, against a loopback gateway
+"""
+
+import asyncio
+
+import pytest
+
+from baudot import aio, encode_to_codes
+from baudot.codecs import ITA2_STANDARD
+
+MESSAGE = 'HELLO WORLD 1939\r\n' * 1000
+
+
+async def _exchange(direction: str, data: bytes) -> bytes:
+    server = await aio.start_gateway(ITA2_STANDARD, '127.0.0.1',
+                                     direction=direction)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for i in range(0, len(data), 1000):
+            writer.write(data[i:i + 1000])
+            await writer.drain()
+        writer.write_eof()
+        response = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+    return response
+
+
+def test_gateway_encode():
+    codes = asyncio.run(_exchange('encode', MESSAGE.encode()))
+    assert codes == encode_to_codes(MESSAGE, ITA2_STANDARD)
+
+
+def test_gateway_decode():
+    codes = encode_to_codes(MESSAGE, ITA2_STANDARD)
+    assert asyncio.run(_exchange('decode', codes)).decode() == MESSAGE
+
+
+def test_gateway_decode_error():
+    assert asyncio.run(_exchange('decode', b'\x1f\x14\xff\x14')) == b''
+
+
+def test_gateway_direction():
+    with pytest.raises(ValueError):
+        asyncio.run(aio.start_gateway(ITA2_STANDARD, direction='sideways'))
@@ -0,0 +1,148 @@
+"""
+Tests for the compressed archive handler
+"""
+
+from io import BytesIO
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import decode_codes, decode_to_str, encode_str, encode_to_codes
+from baudot.codecs import ITA2_STANDARD
+from baudot.exceptions import ReadError
+from baudot.handlers.archive import ArchiveReader, ArchiveWriter
+
+MESSAGE = 'RYRYRY THE QUICK BROWN FOX 1234 (5/7)\r\n' * 100
+
+
+class _Pipe(BytesIO):
+    """Stream that cannot seek"""
+
+    def seekable(self):
+        return False
+
+
+def _archive(codes, **kwargs):
+    stream = BytesIO()
+    with ArchiveWriter(stream, ITA2_STANDARD, **kwargs) as writer:
+        writer.write_many(codes)
+    stream.seek(0)
+    return stream
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'lzma'])
+@pytest.mark.parametrize('workers', [0, 3])
+def test_archive_tnb(compression, workers):
+    stream = BytesIO()
+    with ArchiveWriter(stream, ITA2_STANDARD, compression,
+                       block_size=500) as writer:
+        encode_str(MESSAGE, ITA2_STANDARD, writer)
+    assert len(stream.getvalue()) < len(MESSAGE) // 2
+
+    stream.seek(0)
+    with ArchiveReader(stream, workers) as reader:
+        assert reader.compression == compression
+        assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+
+    pipe = _Pipe(stream.getvalue())
+    with ArchiveReader(pipe, workers) as reader:
+        assert not reader.blocks
+        assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+
+
+@given(st.integers(-5, len(MESSAGE) + 5), st.integers(0, 1000))
+def test_archive_random_access(start, size):
+    stream = _archive(encode_to_codes(MESSAGE, ITA2_STANDARD),
+                      block_size=333)
+    with ArchiveReader(stream) as reader:
+        assert reader.read_chars(ITA2_STANDARD, start, start + size) == \
+            MESSAGE[max(start, 0):max(start + size, 0)]
+
+
+def test_archive_blocks():
+    codes = encode_to_codes(MESSAGE, ITA2_STANDARD)
+    with ArchiveReader(_archive(codes, block_size=1000)) as reader:
+        assert [block.code for block in reader.blocks] == \
+            list(range(0, len(codes), 1000))
+        assert reader.blocks[0].state is None
+
+        # Any block decodes without the ones before
+        block = reader.blocks[3]
+        reader.seek_block(3)
+        engine = ITA2_STANDARD.compile()
+        state = engine.state_of(block.state)
+        chars, _ = engine.decode_codes(reader.read_block(), state)
+        assert MESSAGE[block.char:].startswith(chars)
+        assert decode_codes(codes[:block.code], ITA2_STANDARD) == \
+            MESSAGE[:block.char]
+
+
+@pytest.mark.parametrize('footer', [True, False])
+def test_archive_append(footer):
+    codes = encode_to_codes(MESSAGE, ITA2_STANDARD)
+    split = 2500 if footer else 2000
+    data = _archive(codes[:split], block_size=1000).getvalue()
+    if not footer:  # As if appending had been interrupted
+        data = data[:data.rindex(b'{"blocks"')]
+
+    stream = BytesIO(data)
+    with ArchiveWriter.append(stream, ITA2_STANDARD, 1000) as writer:
+        assert len(writer.blocks) == (3 if footer else 2)
+        writer.write_many(codes[split:])
+
+    stream.seek(0)
+    with ArchiveReader(stream) as reader:
+        assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+        assert split in [block.code for block in reader.blocks]
+        assert reader.read_chars(ITA2_STANDARD, 3000, 3100) == \
+            MESSAGE[3000:3100]
+
+
+def test_archive_append_truncated():
+    codes = encode_to_codes(MESSAGE, ITA2_STANDARD)
+    data = _archive(codes[:2000], block_size=1000).getvalue()
+    stream = BytesIO(data[:data.rindex(b'{"blocks"') - 10])
+    with ArchiveReader(stream) as reader:
+        assert len(reader.blocks) == 1
+        assert bytes(reader) == codes[:1000]
+
+    stream.seek(0)
+    with ArchiveWriter.append(stream, ITA2_STANDARD, 1000) as writer:
+        assert len(writer.blocks) == 1
+        writer.write_many(codes[1000:])
+
+    stream.seek(0)
+    with ArchiveReader(stream) as reader:
+        assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+        assert [block.code for block in reader.blocks][:3] == [0, 1000, 2000]
+
+
+def test_archive_without_shift():
+    stream = BytesIO()
+    with ArchiveWriter(stream, ITA2_STANDARD, block_size=1) as writer:
+        writer.write_many(b'\x01\x02')
+    stream.seek(0)
+    with ArchiveWriter.append(stream, ITA2_STANDARD, 1) as writer:
+        writer.write(0x03)
+
+    stream.seek(0)
+    with ArchiveReader(stream) as reader:
+        assert [block.char for block in reader.blocks] == [0, 1, 2]
+        assert reader.read_chars(ITA2_STANDARD, 1, 3) == '\nA'
+        reader.seek_block(0)
+        assert bytes(reader) == b'\x01\x02\x03'
+
+
+def test_archive_errors():
+    with pytest.raises(ReadError):
+        ArchiveReader(BytesIO(b'BAUDOTHEX'))
+    with pytest.raises(ValueError):
+        ArchiveWriter(BytesIO(), ITA2_STANDARD, 'rar')
+
+    data = bytearray(_archive(b'\x1f\x01' * 100).getvalue())
+    data[30:34] = b'\x00' * 4
+    with pytest.raises(ReadError):
+        bytes(ArchiveReader(BytesIO(data)))
+
+    with ArchiveReader(_archive(b'')) as reader:
+        assert reader.blocks == [] and bytes(reader) == b''
@@ -0,0 +1,82 @@
+"""
+Tests for the RTTY audio handler
+"""
+
+from io import BytesIO
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from baudot import decode_to_str, encode_str, encode_to_codes
+from baudot.codecs import ITA2_STANDARD
+from baudot.exceptions import ReadError
+
+np = pytest.importorskip('numpy')
+audio = pytest.importorskip('baudot.handlers.audio')
+
+MESSAGE = 'RYRYRY THE QUICK BROWN FOX 1234 (5/7)\r\n' * 3
+
+CONFIGS = [
+    audio.DEFAULT_AUDIO,
+    audio.AudioConfig(baud=50, stop_bits=1, rate=11025),
+    audio.AudioConfig(baud=75, stop_bits=2, shift=850, rate=22050),
+]
+
+
+def _modulate(codes, config, wav=True):
+    stream = BytesIO()
+    with audio.AudioWriter(stream, config, wav) as writer:
+        writer.write_many(codes[:7])
+        for code in codes[7:12]:
+            writer.write(code)
+        writer.write_many(codes[12:])
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_audio_tnb(config):
+    data = _modulate(encode_to_codes(MESSAGE, ITA2_STANDARD), config)
+    # The sample rate is read from the WAV header
+    with audio.AudioReader(BytesIO(data), config._replace(rate=1)) as reader:
+        assert reader.config == config
+        assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+
+
+@given(st.binary(max_size=30).map(lambda b: bytes(c % 32 for c in b)))
+@settings(max_examples=20, deadline=None)
+def test_audio_raw(codes):
+    data = _modulate(codes, audio.DEFAULT_AUDIO, wav=False)
+    reader = audio.AudioReader(BytesIO(data), wav=False)
+    assert bytes(reader) == codes
+
+
+def test_audio_noise():
+    config = audio.DEFAULT_AUDIO
+    codes = encode_to_codes(MESSAGE * 5, ITA2_STANDARD)
+    signal = np.frombuffer(_modulate(codes, config, wav=False), dtype='<i2')
+
+    # Noise as strong as the signal
+    noise = np.random.default_rng(42).normal(0, 10000, signal.size)
+    noisy = np.clip(signal + noise, -32768, 32767).astype('<i2')
+    reader = audio.AudioReader(BytesIO(noisy.tobytes()), config, wav=False)
+    assert bytes(reader) == codes
+
+
+def test_audio_errors():
+    stream = BytesIO()
+    with audio.AudioWriter(stream) as writer:
+        encode_str('HELLO', ITA2_STANDARD, writer)
+    samples = np.frombuffer(stream.getvalue()[44:], dtype='<i2').copy()
+
+    # Replace the stop bit of the second code by space
+    length = audio.DEFAULT_AUDIO.bit_length
+    start = int((1 + 7.5 + 6) * length)
+    time = np.arange(start, int(start + length))
+    samples[start:start + time.size] = 16000 * np.sin(
+        2 * np.pi * audio.DEFAULT_AUDIO.space / 8000 * time)
+
+    with pytest.raises(ReadError):
+        bytes(audio.AudioReader(BytesIO(samples.tobytes()), wav=False))
+    reader = audio.AudioReader(BytesIO(samples.tobytes()), wav=False,
+                               errors='replace')
+    assert bytes(reader) == b'\x1f\xff\x01\x12\x12\x18'
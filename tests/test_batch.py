@@ -0,0 +1,64 @@
+"""
+Tests for the conversion of many messages
+"""
+
+import subprocess
+import sys
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import decode_codes, decode_many, encode_many, encode_to_codes
+from baudot.codecs import ITA2_STANDARD, ITA2_US
+
+MESSAGES = ['RYRYRY', '', 'THE QUICK BROWN FOX 1234', '(5/7)', 'HELLO'] * 30
+
+
+@given(st.lists(st.text(alphabet=sorted(ITA2_US.alphabet))),
+       st.integers(1, 10))
+def test_batch_tnb(messages, batch_size):
+    encoded = encode_many(messages, ITA2_US, batch_size=batch_size)
+    assert len(encoded) == len(messages)
+    assert list(encoded) == [encode_to_codes(m, ITA2_US) for m in messages]
+
+    decoded = decode_many(encoded, ITA2_US, batch_size=batch_size)
+    assert decoded.data == ''.join(messages)
+    assert list(decoded) == messages
+
+
+@pytest.mark.parametrize('pool', ['thread', 'process'])
+def test_batch_pools(pool):
+    encoded = encode_many(MESSAGES, ITA2_STANDARD, pool=pool, workers=2,
+                          batch_size=7)
+    assert encoded.data == b''.join(
+        encode_to_codes(m, ITA2_STANDARD) for m in MESSAGES)
+    assert encoded[2] == encode_to_codes(MESSAGES[2], ITA2_STANDARD)
+    assert encoded[-1] == encode_to_codes(MESSAGES[-1], ITA2_STANDARD)
+
+    decoded = decode_many(list(encoded), ITA2_STANDARD, pool=pool, workers=2,
+                          batch_size=7)
+    assert list(decoded) == MESSAGES
+
+
+def test_batch_errors():
+    blobs = [b'\x1f\x14', b'\x14', b'\x1f\x14\x01']
+    decoded = decode_many(blobs, ITA2_STANDARD, 'replace')
+    assert list(decoded) == [decode_codes(b, ITA2_STANDARD, 'replace')
+                             for b in blobs]
+    assert len(encode_many(['%'], ITA2_STANDARD, errors='ignore')[0]) == 0
+
+    with pytest.raises(ValueError):
+        encode_many(MESSAGES, ITA2_STANDARD, pool='fibers')
+    with pytest.raises(IndexError):
+        decoded[3]  # pylint: disable=pointless-statement
+
+
+def test_pools_imported_lazily():
+    script = ('import sys, baudot; '
+              'assert not [m for m in sys.modules if m.startswith('
+              '("concurrent", "multiprocessing", "baudot.cli", '
+              '"baudot.parallel"))]; '
+              'baudot.encode_many(["A"], baudot.codecs.ITA2_US, '
+              'pool="thread"); '
+              'assert "concurrent.futures" in sys.modules')
+    subprocess.run([sys.executable, '-c', script], check=True)
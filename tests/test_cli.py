@@ -0,0 +1,115 @@
+"""
+Tests for the command-line interface
+"""
+
+import io
+import os
+import sys
+import threading
+
+import pytest
+
+from baudot import encode_to_codes
+from baudot.cli import main
+from baudot.codecs import ITA2_STANDARD
+
+MESSAGE = 'RYRYRY 1234 THE QUICK BROWN FOX (5/7)\r\n' * 20
+
+
+@pytest.fixture(name='stdin')
+def fixture_stdin(monkeypatch):
+    def set_stdin(data: bytes):
+        monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(data)))
+    return set_stdin
+
+
+@pytest.mark.parametrize('fmt', ['tape', 'hex', 'packed'])
+def test_cli_streams(stdin, capsysbinary, fmt):
+    stdin(MESSAGE.encode())
+    assert main(['encode', '--format', fmt]) == 0
+    encoded = capsysbinary.readouterr().out
+
+    stdin(encoded)
+    assert main(['decode', '-f', fmt, '-c', 'ITA2']) == 0
+    assert capsysbinary.readouterr().out == MESSAGE.encode()
+
+
+def test_cli_files(tmp_path):
+    source = tmp_path / 'message.txt'
+    source.write_text(MESSAGE, newline='')
+    encoded, transcoded = tmp_path / 'message.hex', tmp_path / 'ita1.tape'
+
+    assert main(['encode', '-f', 'hex', str(source), '-o', str(encoded)]) == 0
+    assert encoded.read_bytes() == \
+        encode_to_codes(MESSAGE, ITA2_STANDARD).hex().encode()
+
+    text = MESSAGE.replace('\r\n', '').replace('(', '').replace(')', '')
+    source.write_text(text)
+    main(['encode', '-f', 'hex', str(source), '-o', str(encoded)])
+    assert main(['transcode', '-f', 'hex', '--to-format', 'tape',
+                 '--to-codec', 'ita1', str(encoded),
+                 '-o', str(transcoded)]) == 0
+    assert main(['decode', '-c', 'ita1', str(transcoded),
+                 '-o', str(source)]) == 0
+    assert source.read_text() == text
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_cli_batch(tmp_path, jobs):
+    inputs = []
+    for number in range(3):
+        path = tmp_path / f'input{number}.txt'
+        path.write_text(MESSAGE * number, newline='')
+        inputs.append(str(path))
+
+    out = tmp_path / 'out'
+    assert main(['encode', '-f', 'packed', '-j', str(jobs),
+                 '-d', str(out), *inputs]) == 0
+    assert main(['decode', '-f', 'packed', '-j', str(jobs), '-d', str(out),
+                 *(str(out / f'input{n}.packed') for n in range(3))]) == 0
+    for number in range(3):
+        assert (out / f'input{number}.txt').read_bytes() == \
+            (MESSAGE * number).encode()
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='Needs named pipes')
+@pytest.mark.parametrize('data, status', [(b'1f1401', 0), (b'1fzz01', 1)])
+def test_cli_pipe(tmp_path, capsys, data, status):
+    path = tmp_path / 'codes.hex'
+    os.mkfifo(path)
+
+    def feed():
+        with open(path, 'wb') as pipe:
+            pipe.write(data)
+    writer = threading.Thread(target=feed)
+    writer.start()
+    try:
+        assert main(['decode', '-f', 'hex', str(path)]) == status
+    finally:
+        writer.join()
+    assert capsys.readouterr().out == ('HE' if status == 0 else '')
+
+
+def test_cli_errors(tmp_path, capsys):
+    path = tmp_path / 'codes.hex'
+    path.write_bytes(b'1f14zz01')
+    assert main(['decode', '-f', 'hex', str(path)]) == 1
+    assert 'error' in capsys.readouterr().err
+
+    assert main(['decode', '-f', 'hex', '-e', 'replace', str(path)]) == 0
+    assert capsys.readouterr().out == 'H�E'
+
+    assert main(['transcode', '-f', 'hex', '-e', 'replace', '--to-codec',
+                 'ita2-us', '--to-format', 'tape', str(path)]) == 0
+    transcoded = capsys.readouterr().out
+    path.write_text(transcoded, newline='')
+    assert main(['decode', '-c', 'ita2-us', str(path)]) == 0
+    assert capsys.readouterr().out == 'H?E'
+
+    with pytest.raises(SystemExit):
+        main(['decode', '--codec', 'nope'])
+    with pytest.raises(SystemExit):
+        main(['decode', '--jobs', '2', str(path)])
+
+    assert main(['codecs']) == 0
+    assert 'ita2-us' in capsys.readouterr().out.split()
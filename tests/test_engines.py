@@ -0,0 +1,258 @@
+"""
+Tests checking that the codec engines agree with the codecs themselves
+"""
+
+import io
+import itertools
+import tracemalloc
+
+import pytest
+from hypothesis import given, strategies as st
+
+import baudot
+from baudot import encode_to_codes, decode_codes, transcode_codes
+from baudot.exceptions import BaudotException, EncodingError
+from baudot.codecs import (
+    CodecEngine, ITA1_CONTINENTAL, ITA1_UK, ITA2_STANDARD, ITA2_US, Shift,
+    SimpleTabledCodec)
+
+ALL_CODECS = (ITA1_CONTINENTAL, ITA1_UK, ITA2_STANDARD, ITA2_US)
+
+
+def _run_decode(engine, codes):
+    state, chars = engine.initial, []
+    for code in codes:
+        try:
+            value, state = engine.decode_code(code, state)
+        except Exception as exc:  # pylint: disable=broad-except
+            chars.append(type(exc))
+            break
+        chars.append(value)
+    return chars
+
+
+def _run_encode(engine, text):
+    state, codes = engine.initial, []
+    for char in text:
+        try:
+            value, state = engine.encode_char(char, state)
+        except Exception as exc:  # pylint: disable=broad-except
+            codes.append(type(exc))
+            break
+        codes.append(value)
+    return codes
+
+
+@given(st.sampled_from(ALL_CODECS), st.lists(st.integers(0, 31)))
+def test_compiled_decode(codec, codes):
+    expected = _run_decode(CodecEngine(codec), codes)
+    assert _run_decode(codec.compile(), codes) == expected
+
+
+@given(st.data())
+def test_compiled_encode(data):
+    codec = data.draw(st.sampled_from(ALL_CODECS))
+    alphabet = sorted(char for char in codec.alphabet if len(char) == 1)
+    text = data.draw(st.text(alphabet=alphabet))
+    expected = _run_encode(CodecEngine(codec), text)
+    assert _run_encode(codec.compile(), text) == expected
+
+
+def test_compile_is_cached():
+    assert ITA2_STANDARD.compile() is ITA2_STANDARD.compile()
+
+
+@pytest.mark.parametrize('codec', ALL_CODECS)
+def test_state_of(codec):
+    for engine in (CodecEngine(codec), codec.compile()):
+        for shift in (None,) + tuple(codec.decoding_table):
+            assert engine.shift_of(engine.state_of(shift)) == shift
+
+
+def test_shift_codes():
+    engine = ITA2_STANDARD.compile()
+    assert engine.shift_codes() == {0x1f: 32, 0x1b: 64}
+
+    # Shift code of one state only, a character in the other
+    letters, figures = Shift('Letters'), Shift('Figures')
+    codec = SimpleTabledCodec('Toggle', {
+        letters: [chr(65 + i) for i in range(31)] + [figures],
+        figures: [chr(48 + i) for i in range(31)] + [letters],
+    })
+    assert codec.compile().shift_codes() == {31: None}
+
+
+@given(st.sampled_from(ALL_CODECS), st.binary())
+def test_bulk_decode(codec, codes):
+    engine = codec.compile()
+    expected = _run_decode(engine, codes)
+    try:
+        chars, _ = engine.decode_codes(codes, engine.initial)
+    except Exception as exc:  # pylint: disable=broad-except
+        assert expected[-1] is type(exc)
+    else:
+        assert chars == ''.join(expected)
+
+
+@given(st.data())
+def test_bulk_encode(data):
+    codec = data.draw(st.sampled_from(ALL_CODECS))
+    engine = codec.compile()
+    alphabet = sorted(char for char in codec.alphabet if len(char) == 1)
+    text = data.draw(st.text(alphabet=alphabet))
+    expected = _run_encode(engine, text)
+    try:
+        codes, _ = engine.encode_codes(text, engine.initial)
+    except Exception as exc:  # pylint: disable=broad-except
+        assert expected[-1] is type(exc)
+    else:
+        assert codes == b''.join(expected)
+
+
+@given(st.data())
+def test_runs_encode(data):
+    # Long runs in a same state, with shifts in between
+    codec = data.draw(st.sampled_from(ALL_CODECS))
+    engine = codec.compile()
+    runs = []
+    for table in data.draw(st.lists(
+            st.sampled_from(list(codec.decoding_table.values())),
+            max_size=50)):
+        alphabet = sorted(value for value in table
+                          if isinstance(value, str) and len(value) == 1)
+        runs.append(data.draw(st.text(alphabet=alphabet, min_size=10)))
+    text = ''.join(runs)
+    state = data.draw(st.sampled_from(sorted(engine.encoding)))
+
+    expected = _outcome(_run_encode_from, engine, text, state)
+    assert _outcome(engine.encode_codes, text, state) == expected
+
+
+@pytest.mark.parametrize('text', ['A1' * 100, 'ABC ' * 50 + 'A1' * 100])
+def test_runs_encode_short_runs(text):
+    engine = ITA2_STANDARD.compile()
+    assert engine.encode_codes(text, 0) == _run_encode_from(engine, text, 0)
+
+
+@given(st.data())
+def test_optimal_encode(data):
+    codec = data.draw(st.sampled_from(ALL_CODECS))
+    values = data.draw(st.lists(st.sampled_from(sorted(codec.alphabet))))
+    text = ''.join(values)
+
+    codes = encode_to_codes(text, codec, optimal=True)
+    assert decode_codes(codes, codec) == text
+    try:
+        assert len(codes) <= len(encode_to_codes(text, codec))
+    except EncodingError:  # Multi-character values
+        pass
+
+
+def test_optimal_shifts():
+    assert len(encode_to_codes('-1', ITA1_UK)) == 4
+    assert encode_to_codes('-1', ITA1_UK, optimal=True) == b'\x08\x1c\x01'
+
+
+@pytest.mark.parametrize('chunks', [['A' * 8191, '¹⁄B'], ['A¹', '⁄B'],
+                                    ['A¹', '', '⁄', '-1']])
+def test_optimal_chunks(chunks):
+    text = ''.join(chunks)
+    expected = encode_to_codes(text, ITA1_UK, optimal=True)
+    assert b''.join(baudot.iter_encode(chunks, ITA1_UK, optimal=True)) \
+        == expected
+
+    writer = _Collector()
+    baudot.encode(io.StringIO(text), ITA1_UK, writer, optimal=True)
+    assert bytes(writer.codes) == expected
+
+
+@given(st.data())
+def test_optimal_chunked(data):
+    codec = data.draw(st.sampled_from(ALL_CODECS))
+    values = data.draw(st.lists(st.sampled_from(sorted(codec.alphabet))))
+    text = ''.join(values)
+    cuts = sorted(data.draw(st.lists(st.integers(0, len(text)))))
+    chunks = [text[start:stop]
+              for start, stop in zip([0] + cuts, cuts + [len(text)])]
+
+    codes = b''.join(baudot.iter_encode(chunks, codec, optimal=True))
+    assert decode_codes(codes, codec) == text
+    assert len(codes) == len(encode_to_codes(text, codec, optimal=True))
+
+
+@pytest.mark.parametrize('text', ['¹⁄-1 RY ' * 2500, 'A' + ' ' * 20000 + '1'],
+                         ids=['converging', 'diverging'])
+def test_optimal_memory(monkeypatch, text):
+    expected = encode_to_codes(text, ITA1_UK, optimal=True)
+    monkeypatch.setattr(baudot.optimal, 'WINDOW', 256)
+    tracemalloc.start()
+    try:
+        codes = encode_to_codes(text, ITA1_UK, optimal=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert decode_codes(codes, ITA1_UK) == text
+    assert len(codes) == len(expected)
+    assert peak < 1 << 20
+
+
+class _Collector:
+    def __init__(self):
+        self.codes = bytearray()
+
+    def write_many(self, codes):
+        self.codes += codes
+
+
+def _run_encode_from(engine, text, state):
+    codes = bytearray()
+    for char in text:
+        value, state = engine.encode_char(char, state)
+        codes += value
+    return bytes(codes), state
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except Exception as exc:  # pylint: disable=broad-except
+        return type(exc)
+
+
+@given(st.sampled_from(ALL_CODECS), st.sampled_from(ALL_CODECS),
+       st.binary().map(lambda data: bytes(b % 32 for b in data)))
+def test_transcode(src, dst, codes):
+    expected = _outcome(
+        lambda: encode_to_codes(decode_codes(codes, src), dst))
+    outcome = _outcome(transcode_codes, codes, src, dst)
+    if isinstance(expected, bytes):
+        assert outcome == expected
+    else:  # Errors may come in a different order
+        assert issubclass(outcome, BaudotException)
+
+
+def test_transcode_policies():
+    codes = encode_to_codes('A É B', ITA1_CONTINENTAL)
+    with pytest.raises(EncodingError):
+        transcode_codes(codes, ITA1_CONTINENTAL, ITA2_STANDARD)
+    ignored = transcode_codes(codes, ITA1_CONTINENTAL, ITA2_STANDARD, 'ignore')
+    assert decode_codes(ignored, ITA2_STANDARD) == 'A  B'
+    replaced = transcode_codes(codes, ITA1_CONTINENTAL, ITA2_STANDARD,
+                               'replace')
+    assert decode_codes(replaced, ITA2_STANDARD) == 'A ? B'
+
+
+def test_transcode_invalid_codes():
+    codes = b'\x01\x1f\x01\x20\x01'  # No initial shift, then garbage
+    with pytest.raises(BaudotException):
+        transcode_codes(codes, ITA2_STANDARD, ITA2_US)
+    replaced = transcode_codes(codes, ITA2_STANDARD, ITA2_US, 'replace')
+    assert decode_codes(replaced, ITA2_US) == 'EE?E'
+    ignored = transcode_codes(codes, ITA2_STANDARD, ITA2_US, 'ignore')
+    assert decode_codes(ignored, ITA2_US) == 'EEE'
+
+
+def test_iter_decode_endless():
+    feed = itertools.chain([b'\x1f'], itertools.repeat(b'\x01\x1b\x01\x1f'))
+    decoded = baudot.iter_decode(feed, ITA2_STANDARD)
+    assert list(itertools.islice(decoded, 3)) == ['E3'] * 3
@@ -0,0 +1,139 @@
+"""
+Tests for the error-tolerant encoding and decoding
+"""
+
+import codecs
+from io import BytesIO, StringIO
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import (
+    decode, decode_codes, encode_to_codes, decode_to_str, iter_encode)
+from baudot.codecs import ITA2_STANDARD, ITA1_CONTINENTAL
+from baudot.errors import ErrorReport, INVALID_CODE
+from baudot.exceptions import (
+    DecodingError, EncodingError, ReadError, WriteError)
+from baudot.handlers import HexBytesReader, HexBytesWriter, MappedHexReader
+
+
+def test_decode_replace():
+    report = ErrorReport()
+    codes = b'\x1f\x01\x20\x01\x1b\x01\xff\x1f'
+    assert decode_codes(codes, ITA2_STANDARD, 'replace', report) == 'E�E3�'
+    assert list(report) == [2, 6]
+
+    report = ErrorReport()
+    assert decode_codes(codes, ITA2_STANDARD, 'ignore', report) == 'EE3'
+    assert report.ranges() == [(2, 3), (6, 7)]
+
+
+def test_decode_resync():
+    # No initial shift: the state is guessed, and reported
+    report = ErrorReport()
+    assert decode_codes(b'\x04\x01\x01\x1b\x01', ITA2_STANDARD,
+                        'replace', report) == ' EE3'
+    assert list(report) == [1]
+    assert decode_codes(b'\x01\x01', ITA1_CONTINENTAL, 'ignore') == 'AA'
+
+
+def test_decode_lost_shift():
+    codes = bytearray(encode_to_codes('HELLO 123 WORLD 45', ITA2_STANDARD))
+    codes[codes.index(0x1b)] = INVALID_CODE  # The first figures shift
+    report = ErrorReport()
+    assert decode_codes(codes, ITA2_STANDARD, 'replace', report) == \
+        'HELLO \ufffd123 WORLD 45'
+    assert list(report) == [7]
+
+    # Invalid codes that were not shifts leave the state unchanged
+    codes = encode_to_codes('12', ITA2_STANDARD)
+    assert decode_codes(codes[:2] + b'\xff' + codes[2:] + b'\x1f\x01',
+                        ITA2_STANDARD, 'ignore') == '12E'
+
+
+def test_encode_errors():
+    report = ErrorReport()
+    text = 'HI Ω ÉTÉ'
+    assert encode_to_codes(text, ITA2_STANDARD, errors='replace',
+                           report=report) == \
+        encode_to_codes('HI ? ?T?', ITA2_STANDARD)
+    assert list(report) == [3, 5, 7]
+    assert encode_to_codes(text, ITA2_STANDARD, optimal=True,
+                           errors='ignore') == \
+        encode_to_codes('HI  T', ITA2_STANDARD)
+
+
+def test_encode_optimal_errors():
+    report = ErrorReport()
+    chunks = ['HI Ω', ' 12', 'Ω']
+    codes = b''.join(iter_encode(chunks, ITA2_STANDARD, optimal=True,
+                                 errors='replace', report=report))
+    assert decode_codes(codes, ITA2_STANDARD) == 'HI ? 12?'
+    assert list(report) == [3, 7]
+
+
+def test_strict_unchanged():
+    with pytest.raises(DecodingError):
+        decode_codes(b'\x1f\x20', ITA2_STANDARD)
+    with pytest.raises(EncodingError):
+        encode_to_codes('Ω', ITA2_STANDARD)
+    with pytest.raises(ValueError):
+        decode_codes(b'', ITA2_STANDARD, errors='surrogateescape')
+
+
+@given(st.text(alphabet='AB12 \r', max_size=50), st.data())
+def test_offsets_across_chunks(text, data):
+    # Encoded text, whose shift codes always change the state
+    codes = encode_to_codes(text, ITA2_STANDARD)
+    positions = data.draw(st.sets(st.integers(0, len(codes))))
+    corrupted = bytearray(codes)
+    for position in sorted(positions, reverse=True):
+        corrupted.insert(position, INVALID_CODE)
+
+    reader = HexBytesReader(BytesIO(corrupted.hex().encode()), 'ignore')
+    report, output = ErrorReport(), StringIO()
+    decode(reader, ITA2_STANDARD, output, errors='ignore', report=report)
+
+    assert output.getvalue() == decode_codes(codes, ITA2_STANDARD)
+    assert len(report) == len(positions)
+
+
+def test_decode_stream_chunks():
+    hex_data = ('1f01' * 5000 + 'zz' + '01' * 5000).encode()
+    report = ErrorReport()
+    text = decode_to_str(HexBytesReader(BytesIO(hex_data), 'replace'),
+                         ITA2_STANDARD, 'replace', report)
+    assert text == 'E' * 5000 + '�' + 'E' * 5000
+    assert list(report) == [10000]
+
+    output = StringIO()
+    decode(HexBytesReader(BytesIO(hex_data), 'ignore'), ITA2_STANDARD,
+           output, errors='ignore', report=report)
+    assert output.getvalue() == 'E' * 10000
+    assert list(report) == [10000, 10000]
+
+
+def test_readers_errors(tmp_path):
+    with pytest.raises(ReadError):
+        decode_to_str(HexBytesReader(BytesIO(b'1fzz')), ITA2_STANDARD)
+
+    path = tmp_path / 'data.hex'
+    path.write_bytes(b'1fzz017f0\n')
+    with MappedHexReader(str(path), errors='replace') as reader:
+        assert decode_to_str(reader, ITA2_STANDARD, 'replace') == '�E��'
+
+
+def test_pycodecs_errors():
+    # Importing baudot registers its codecs with the codecs module
+    assert b'\x1f\x20\x01'.decode('ita2', 'replace') == '�E'
+    assert 'AΩB'.encode('ita2', 'ignore') == \
+        encode_to_codes('AB', ITA2_STANDARD)
+    decoder = codecs.getincrementaldecoder('ita2')('ignore')
+    assert decoder.decode(b'\x1f\x01\xff') + decoder.decode(b'\x01') == 'EE'
+    with pytest.raises(ValueError):
+        b'\x1f'.decode('ita2', 'backslashreplace')
+
+
+def test_writer_still_strict():
+    with pytest.raises(WriteError):
+        HexBytesWriter(BytesIO()).write_many(bytes([INVALID_CODE]))
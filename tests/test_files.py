@@ -0,0 +1,113 @@
+"""
+Tests for loading codecs from table files
+"""
+
+import json
+import sys
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from baudot import encode_to_codes, decode_codes
+from baudot.codecs import files, ITA2_STANDARD, ITA1_UK, Shift
+from baudot.exceptions import IncoherentTable
+
+
+def _document(codec):
+    return {
+        'name': codec.name,
+        'tables': {
+            state.name: [{'shift': value.name} if isinstance(value, Shift)
+                         else value for value in table]
+            for state, table in codec.decoding_table.items()
+        },
+    }
+
+
+def _toml(codec):
+    lines = [f'name = {json.dumps(codec.name)}', '', '[tables]']
+    for state, table in _document(codec)['tables'].items():
+        values = ', '.join(f'{{shift = {json.dumps(v["shift"])}}}'
+                           if isinstance(v, dict) else json.dumps(v)
+                           for v in table)
+        lines.append(f'{state} = [{values}]')
+    return '\n'.join(lines)
+
+
+@pytest.fixture(name='ita2_file')
+def fixture_ita2_file(tmp_path):
+    path = tmp_path / 'ita2.json'
+    path.write_text(json.dumps(_document(ITA2_STANDARD)))
+    return path
+
+
+@settings(max_examples=20)
+@given(st.sampled_from([ITA2_STANDARD, ITA1_UK]), st.data())
+def test_json_same_as_builtin(reference, data):
+    codec = files.parse_codec(json.dumps(_document(reference)))
+    assert codec.decoding_table == reference.decoding_table
+
+    alphabet = sorted(c for c in reference.alphabet if len(c) == 1)
+    text = data.draw(st.text(alphabet=alphabet))
+    codes = encode_to_codes(text, codec)
+    assert codes == encode_to_codes(text, reference)
+    assert decode_codes(codes, codec) == decode_codes(codes, reference)
+
+
+def test_toml(tmp_path):
+    pytest.importorskip('tomllib' if sys.version_info >= (3, 11)
+                        else 'tomli')
+    path = tmp_path / 'ita1_uk.toml'
+    path.write_text(_toml(ITA1_UK), encoding='utf-8')
+    codec = files.load_codec(path, cache=False)
+    assert codec.name == ITA1_UK.name
+    assert codec.decoding_table == ITA1_UK.decoding_table
+
+
+def test_cache(ita2_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    codec = files.load_codec(ita2_file, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def fail(*_):
+        raise AssertionError('Codec rebuilt despite the cache')
+
+    monkeypatch.setattr(files, 'parse_codec', fail)
+    cached = files.load_codec(ita2_file, cache_dir=cache_dir)
+    assert cached is not codec
+    assert cached.decoding_table == codec.decoding_table
+    assert cached.compile().encoding == codec.compile().encoding
+    assert decode_codes(b'\x1b\x17\x1f\x17', cached) == '1Q'
+
+
+def test_cache_invalidation(ita2_file, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    files.load_codec(ita2_file, cache_dir=cache_dir)
+    cache_file, = cache_dir.iterdir()
+    cache_file.write_bytes(b'garbage')
+    codec = files.load_codec(ita2_file, cache_dir=cache_dir)
+    assert codec.decoding_table == ITA2_STANDARD.decoding_table
+
+    document = _document(ITA2_STANDARD)
+    document['name'] = 'Other'
+    ita2_file.write_text(json.dumps(document))
+    assert files.load_codec(ita2_file, cache_dir=cache_dir).name == 'Other'
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+@pytest.mark.parametrize('document', [
+    [],
+    {'name': 'No tables'},
+    {'tables': {'A': ['x'] * 31}},
+    {'tables': {'A': ['x'] * 31 + [{'shift': 'B'}]}},
+    {'tables': {'A': ['x'] * 31 + [{'shift': 'A', 'other': 1}]}},
+    {'tables': {'A': ['x'] * 31 + [42]}},
+])
+def test_invalid_tables(document):
+    with pytest.raises(IncoherentTable):
+        files.parse_codec(json.dumps(document))
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        files.parse_codec('', '.yaml')
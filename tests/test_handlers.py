@@ -0,0 +1,173 @@
+"""
+Tests for the input/output handlers
+"""
+
+import os
+from io import BytesIO, StringIO
+from tempfile import TemporaryDirectory
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import decode_to_str, encode_to_codes, handlers, transcode
+from baudot.codecs import ITA1_CONTINENTAL, ITA2_STANDARD
+from baudot.exceptions import ReadError
+from baudot.handlers.mapped import MappedCodes
+
+CODES = st.binary().map(lambda data: bytes(b % 32 for b in data))
+
+
+class ListReader(handlers.BaudotReader):
+    """Reader with only the per-code method"""
+
+    def __init__(self, codes):
+        self.codes = iter(codes)
+
+    def __next__(self):
+        return next(self.codes)
+
+
+class ListWriter(handlers.BaudotWriter):
+    """Writer with only the per-code method"""
+
+    def __init__(self):
+        self.codes = []
+
+    def write(self, code):
+        self.codes.append(code)
+
+
+@given(CODES, st.integers(1, 10))
+def test_default_read_into(codes, size):
+    reader, buffer, read = ListReader(codes), bytearray(size), bytearray()
+    count = reader.read_into(buffer)
+    while count:
+        read += buffer[:count]
+        count = reader.read_into(buffer)
+    assert read == codes
+
+
+@given(CODES)
+def test_default_write_many(codes):
+    writer = ListWriter()
+    writer.write_many(codes)
+    assert bytes(writer.codes) == codes
+
+
+@given(CODES)
+def test_hexbytes_batched(codes):
+    stream = BytesIO()
+    handlers.HexBytesWriter(stream).write_many(codes)
+    stream.seek(0)
+    buffer = bytearray(len(codes) + 1)
+    assert handlers.HexBytesReader(stream).read_into(buffer) == len(codes)
+    assert buffer[:len(codes)] == codes
+
+
+@pytest.mark.parametrize('data', [b'0a1x', b'0a20'])
+def test_hexbytes_read_errors(data):
+    with pytest.raises(ReadError):
+        handlers.HexBytesReader(BytesIO(data)).read_into(bytearray(8))
+
+
+@given(CODES, st.integers(1, 20))
+def test_packed_batched(codes, size):
+    stream = BytesIO()
+    with handlers.PackedWriter(stream) as writer:
+        writer.write_many(codes[:size])
+        for code in codes[size:]:
+            writer.write(code)
+    assert len(stream.getvalue()) == len(codes) // 8 * 5 + (
+        6 if len(codes) % 8 else 0)
+
+    stream.seek(0)
+    reader = handlers.PackedReader(stream)
+    buffer, read = bytearray(size), bytearray()
+    count = reader.read_into(buffer)
+    while count:
+        read += buffer[:count]
+        count = reader.read_into(buffer)
+    assert read == codes
+
+
+def test_packed_layout():
+    codes = bytes(range(8))
+    assert handlers.packed.pack_codes(codes) == bytes.fromhex('00443214c7')
+    assert handlers.packed.unpack_codes(bytes.fromhex('00443214c7')) == codes
+
+
+@pytest.mark.parametrize('data', [b'\x00\x00', b'\x00' * 5 + b'\x08'])
+def test_packed_read_errors(data):
+    with pytest.raises(ReadError):
+        list(handlers.PackedReader(BytesIO(data)))
+
+
+@pytest.mark.parametrize('size', [0, 1, 7, 8, 9, 70000])
+@pytest.mark.parametrize('kind', ['hex', 'packed'])
+def test_mapped_readers(tmp_path, kind, size):
+    codes = bytes(i * 7 % 32 for i in range(size))
+    path = tmp_path / 'codes'
+    with open(path, 'wb') as stream:
+        if kind == 'hex':
+            handlers.HexBytesWriter(stream).write_many(codes)
+            reader = handlers.MappedHexReader
+        else:
+            with handlers.PackedWriter(stream) as writer:
+                writer.write_many(codes)
+            reader = handlers.MappedPackedReader
+
+    with reader(path) as mapped:
+        assert bytes(mapped) == codes
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'0a1f0x', 'Invalid hexadecimal byte at offset 4: 0x'),
+    (b'0a1f' * 5000 + b'1F20', 'Code value 32 at offset 20002 is not'),
+])
+def test_mapped_hex_errors(tmp_path, data, message):
+    path = tmp_path / 'codes.hex'
+    path.write_bytes(data)
+    with handlers.MappedHexReader(path) as reader:
+        with pytest.raises(ReadError, match=message):
+            list(reader)
+
+
+@given(st.integers(0, 70), st.integers(0, 70))
+def test_mapped_codes_windows(start, stop):
+    codes = bytes(i * 7 % 32 for i in range(61))
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'codes')
+        with open(path, 'wb') as stream:
+            with handlers.PackedWriter(stream) as writer:
+                writer.write_many(codes)
+        with MappedCodes(path, 'packed') as mapped:
+            assert len(mapped) == len(codes)
+            assert mapped.read(start, stop) == codes[start:stop]
+
+
+def test_mapped_not_regular():
+    # Pipes and devices have no size: they must not be read as empty
+    with pytest.raises(ReadError, match='Not a regular file'):
+        handlers.MappedHexReader(os.devnull)
+
+
+def test_tape_irregular_lines():
+    # Missing newline, missing trailing blanks, and a separator in the
+    # wrong place are all read as before
+    lines = '***.**\n* *.\n *.*\n*  .*'
+    assert bytes(handlers.TapeReader(StringIO(lines))) == b'\x1f\x14\x0c\x12'
+
+    buffer = bytearray(8)
+    assert handlers.TapeReader(StringIO(lines)).read_into(buffer) == 4
+    assert buffer[:4] == b'\x1f\x14\x0c\x12'
+
+
+def test_transcode_stream():
+    codes = encode_to_codes('RYRY 1234 ' * 1000, ITA1_CONTINENTAL)
+    output = BytesIO()
+    with handlers.PackedWriter(output) as writer:
+        transcode(handlers.HexBytesReader(BytesIO(codes.hex().encode())),
+                  ITA1_CONTINENTAL, ITA2_STANDARD, writer)
+    output.seek(0)
+    assert decode_to_str(handlers.PackedReader(output),
+                         ITA2_STANDARD) == 'RYRY 1234 ' * 1000
@@ -0,0 +1,85 @@
+"""
+Tests for the random access index
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from baudot import encode_to_codes
+from baudot.codecs import ITA1_CONTINENTAL, ITA2_STANDARD
+from baudot.exceptions import ReadError
+from baudot.index import INDEX_SUFFIX, CodeIndex, IndexedReader, build_index
+from conftest import MESSAGE, write_codes
+
+
+@pytest.fixture(name='indexed', params=['raw', 'hex', 'packed', 'tape'],
+                scope='module')
+def fixture_indexed(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp('index') / 'codes'
+    codes = encode_to_codes(MESSAGE, ITA2_STANDARD)
+    write_codes(path, request.param, codes)
+    index = build_index(path, ITA2_STANDARD, request.param, interval=37)
+    with IndexedReader(path, ITA2_STANDARD, index) as reader:
+        yield reader, codes
+
+
+@given(start=st.integers(-10, len(MESSAGE) + 10),
+       size=st.integers(0, 200))
+@settings(max_examples=50)
+def test_read_chars(indexed, start, size):
+    reader, _ = indexed
+    expected = MESSAGE[max(start, 0):max(start + size, 0)]
+    assert reader.read_chars(start, start + size) == expected
+
+
+@given(start=st.integers(0, 3000), size=st.integers(0, 200))
+@settings(max_examples=50)
+def test_codes(indexed, start, size):
+    reader, codes = indexed
+    assert reader.read_codes(start, start + size) == \
+        codes[start:start + size]
+
+    # The window is decoded in the state left by the codes before it
+    engine = ITA2_STANDARD.compile()
+    _, state = engine.decode_codes(codes[:start], engine.initial)
+    expected, _ = engine.decode_codes(codes[start:start + size], state)
+    assert reader.decode_codes(start, start + size) == expected
+
+
+def test_index_file(tmp_path):
+    path = tmp_path / 'codes'
+    write_codes(path, 'hex', encode_to_codes(MESSAGE, ITA1_CONTINENTAL))
+    index = build_index(path, ITA1_CONTINENTAL, 'hex', interval=100)
+    index.save(str(path) + INDEX_SUFFIX)
+
+    loaded = CodeIndex.load(str(path) + INDEX_SUFFIX)
+    assert list(loaded) == list(index)
+    assert loaded.total_chars == len(MESSAGE)
+    assert loaded[0].state is None and loaded[1].state is not None
+
+    with IndexedReader(path, ITA1_CONTINENTAL) as reader:
+        assert reader.read_chars(1000, 1020) == MESSAGE[1000:1020]
+
+    # The index of another file is rejected
+    write_codes(path, 'hex', b'\x1f\x14')
+    with pytest.raises(ReadError):
+        IndexedReader(path, ITA1_CONTINENTAL)
+
+    (tmp_path / 'bad').write_bytes(b'not an index')
+    with pytest.raises(ReadError):
+        CodeIndex.load(tmp_path / 'bad')
+
+
+def test_index_empty(tmp_path):
+    path = tmp_path / 'codes'
+    path.write_bytes(b'')
+    index = build_index(path, ITA2_STANDARD, 'packed')
+    assert len(index) == 1 and index.total_chars == 0
+    with IndexedReader(path, ITA2_STANDARD, index) as reader:
+        assert reader.read_chars(0, 10) == ''
+        assert reader.decode_codes(0, 10) == ''
+
+    # An index without checkpoints is used as is, not loaded from disk
+    index = CodeIndex('packed', 100, 0, list(ITA2_STANDARD.compile().states))
+    with IndexedReader(path, ITA2_STANDARD, index) as reader:
+        assert reader.index is index
@@ -0,0 +1,55 @@
+"""
+Tests for the parallel decoding
+"""
+
+from io import StringIO
+
+import pytest
+
+from baudot import encode_to_codes
+from baudot.codecs import ITA1_CONTINENTAL, ITA2_STANDARD
+from baudot.exceptions import DecodingError
+from baudot.parallel import _speculate, decode_parallel
+from conftest import MESSAGE, write_codes
+
+
+@pytest.mark.parametrize('fmt', ['raw', 'hex', 'packed', 'tape'])
+@pytest.mark.parametrize('codec', [ITA1_CONTINENTAL, ITA2_STANDARD])
+@pytest.mark.parametrize('chunk_size', [1, 37, 100000])
+def test_decode_parallel(tmp_path, fmt, codec, chunk_size):
+    path = tmp_path / 'codes'
+    codes = encode_to_codes(MESSAGE, codec)
+    write_codes(path, fmt, codes)
+
+    result = decode_parallel(path, codec, 2, fmt=fmt, chunk_size=chunk_size)
+    assert result == MESSAGE
+
+    stream = StringIO()
+    decode_parallel(path, codec, 2, fmt=fmt, stream=stream, chunk_size=50)
+    assert stream.getvalue() == MESSAGE
+
+
+def test_decode_parallel_errors(tmp_path):
+    path = tmp_path / 'codes'
+    write_codes(path, 'raw', b'\x1f\x14' * 100 + b'\x01' + b'\x14' * 100)
+    assert len(decode_parallel(path, ITA2_STANDARD, fmt='raw')) == 201
+
+    # No initial shift: the first chunk cannot be decoded
+    write_codes(path, 'raw', b'\x14' * 100 + b'\x1f' + b'\x14' * 100)
+    with pytest.raises(DecodingError):
+        decode_parallel(path, ITA2_STANDARD, fmt='raw', chunk_size=30)
+
+    write_codes(path, 'raw', b'')
+    assert decode_parallel(path, ITA2_STANDARD, fmt='raw') == ''
+
+
+def test_speculate_shared_tail():
+    engine = ITA2_STANDARD.compile()
+    codes = encode_to_codes('12 AB', ITA2_STANDARD)
+    heads, tails = _speculate(engine, codes[1:])
+    # Every starting state decodes the head, then the same single tail
+    assert len(heads) == len(engine.states)
+    assert len(tails) == 1
+    assert heads[engine.state_of(engine.states[2])] == ('12 ', 32)
+    assert heads[engine.state_of(engine.states[1])] == ('QW ', 32)
+    assert tails == {32: ('AB', 32)}
@@ -0,0 +1,51 @@
+"""
+Tests for the integration with the standard library codecs
+"""
+
+import codecs
+
+from hypothesis import given, strategies as st
+
+import baudot
+from baudot.codecs import ITA2_STANDARD, ITA2_US, ITA1_CONTINENTAL
+
+CODECS = (('ita1', ITA1_CONTINENTAL), ('ita2', ITA2_STANDARD),
+          ('ITA2-US', ITA2_US))
+
+
+@st.composite
+def chunked_text(draw):
+    name, codec = draw(st.sampled_from(CODECS))
+    text = draw(st.text(alphabet=sorted(codec.alphabet)))
+    cuts = sorted(draw(st.lists(st.integers(0, len(text)))))
+    chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+    return name, codec, chunks
+
+
+@given(chunked_text())
+def test_incremental_tnb(test_case):
+    name, codec, chunks = test_case
+    text = ''.join(chunks)
+
+    codes = b''.join(codecs.iterencode(chunks, name))
+    assert codes == baudot.encode_to_codes(text, codec)
+    assert codes.decode(name) == text
+
+    code_chunks = [codes[:len(codes) // 2], codes[len(codes) // 2:]]
+    assert ''.join(codecs.iterdecode(code_chunks, name)) == text
+
+
+def test_text_file(tmp_path):
+    path = tmp_path / 'message.ita2'
+    with open(path, 'w', encoding='ita2', newline='') as file:
+        file.write('HELLO ')
+        file.write('WORLD 1939\r\n')
+    assert path.read_bytes() == baudot.encode_to_codes(
+        'HELLO WORLD 1939\r\n', ITA2_STANDARD)
+
+    with open(path, encoding='ita2', newline='') as file:
+        assert file.read() == 'HELLO WORLD 1939\r\n'
+
+
+def test_unknown_name():
+    assert baudot.pycodecs.search('ita3') is None
@@ -0,0 +1,80 @@
+"""
+Tests for the lazy codec registry
+"""
+
+import subprocess
+import sys
+from collections import namedtuple
+
+import pytest
+
+from baudot import codecs as baudot_codecs, pycodecs
+from baudot.codecs import registry, SimpleTabledCodec, Shift
+from baudot.exceptions import CodecNotFound
+
+EntryPoint = namedtuple('EntryPoint', ('name', 'value'))
+
+LETTERS = Shift('Letters')
+TOY_CODEC = SimpleTabledCodec(
+    'Toy', {LETTERS: [chr(65 + i) for i in range(31)] + [LETTERS]})
+
+
+@pytest.fixture(name='clean_registry')
+def fixture_clean_registry(monkeypatch):
+    # pylint: disable=protected-access
+    monkeypatch.setattr(registry, '_FACTORIES', dict(registry._FACTORIES))
+    monkeypatch.setattr(registry, '_CACHE', {})
+    monkeypatch.setattr(registry, '_ENTRY_POINTS_LOADED', False)
+
+
+def test_builtin_names():
+    assert baudot_codecs.get('ITA2_US') is baudot_codecs.ITA2_US
+    assert baudot_codecs.get('ita1 uk') is baudot_codecs.ITA1_UK
+    assert {'ita1', 'ita1-uk', 'ita2', 'ita2-us'} <= set(baudot_codecs.names())
+    assert 'ITA2_STANDARD' in dir(baudot_codecs)
+
+
+def test_unknown_codec():
+    with pytest.raises(CodecNotFound):
+        baudot_codecs.get('ita3')
+    with pytest.raises(AttributeError):
+        getattr(baudot_codecs, 'ITA3')
+
+
+def test_import_is_lazy():
+    script = ('import sys, baudot; '
+              'assert not [m for m in sys.modules if "ita" in m]; '
+              'baudot.codecs.get("ita2"); '
+              'assert "baudot.codecs.ita1_baudot" not in sys.modules')
+    subprocess.run([sys.executable, '-c', script], check=True)
+
+
+@pytest.mark.usefixtures('clean_registry')
+def test_register():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return TOY_CODEC
+
+    registry.register('Toy_Codec', factory)
+    assert 'toy-codec' in registry.names()
+    assert not calls
+    assert registry.get('toy-codec') is registry.get('TOY CODEC') is TOY_CODEC
+    assert len(calls) == 1
+    # Not through codecs.lookup(), whose cache would outlive this test
+    assert pycodecs.search('toy-codec').name == 'toy-codec'
+
+
+@pytest.mark.usefixtures('clean_registry')
+def test_entry_points(monkeypatch):
+    monkeypatch.setattr(registry, '_entry_points', lambda: [
+        EntryPoint('Toy', f'{__name__}:TOY_CODEC'),
+        EntryPoint('ita2', 'not.imported:AT_ALL'),
+    ])
+    assert registry.get('toy') is TOY_CODEC
+    assert registry.get('ita2') is baudot_codecs.ITA2_STANDARD
+
+    registry.register('bad', 'baudot.codecs.core:Shift')
+    with pytest.raises(TypeError):
+        registry.get('bad')
@@ -0,0 +1,86 @@
+"""
+Tests for the serial line handler
+"""
+
+from io import BytesIO
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import decode_to_str, encode_str, handlers
+from baudot.codecs import ITA2_STANDARD
+from baudot.exceptions import ReadError
+from baudot.handlers.serial import find_frames, frame_codes, pack_samples, \
+    unpack_samples
+
+MESSAGE = 'RYRYRY THE QUICK BROWN FOX 1234 (5/7)\r\n' * 3
+
+codes_strategy = st.binary().map(lambda b: bytes(c % 32 for c in b))
+config_strategy = st.builds(
+    handlers.SerialConfig,
+    st.floats(3, 32), st.sampled_from([1, 1.5, 2]))
+
+
+@given(codes_strategy, config_strategy, st.booleans())
+def test_serial_tnb(codes, config, packed):
+    stream = BytesIO()
+    with handlers.SerialWriter(stream, config, packed) as writer:
+        writer.write_many(codes[:3])
+        for code in codes[3:6]:
+            writer.write(code)
+        writer.write_many(codes[6:])
+
+    stream.seek(0)
+    assert bytes(handlers.SerialReader(stream, config, packed)) == codes
+
+
+def test_serial_codec():
+    stream = BytesIO()
+    with handlers.SerialWriter(stream) as writer:
+        encode_str(MESSAGE, ITA2_STANDARD, writer)
+    stream.seek(0)
+    reader = handlers.SerialReader(stream)
+    assert decode_to_str(reader, ITA2_STANDARD) == MESSAGE
+
+
+@given(codes_strategy, st.floats(-.03, .03))
+def test_serial_drift(codes, drift):
+    # The receiver clock is off by up to 3%
+    config = handlers.SerialConfig(10 * (1 + drift), 1)
+    samples, _ = frame_codes(codes, config)
+    codes_read, _ = find_frames(b'\x01' + samples + b'\x01' * 20,
+                                handlers.SerialConfig(10, 1))
+    assert codes_read == codes
+
+
+def test_serial_frames():
+    config = handlers.SerialConfig(4, 2)
+    samples, time = frame_codes(b'\x01\x1e', config)
+    assert time == 64
+    assert samples == bytes.fromhex(
+        '00000000 01010101 00000000 00000000 00000000 00000000'
+        '01010101 01010101 00000000 00000000 01010101 01010101'
+        '01010101 01010101 01010101 01010101'.replace(' ', ''))
+    assert unpack_samples(pack_samples(samples)) == samples
+
+    # Glitches are not start bits
+    glitched = samples[:24] + b'\x00' + samples[25:]
+    assert find_frames(b'\x01' + glitched, config) == (b'\x01\x1e', 64)
+
+    # A space instead of the stop bit
+    broken = samples[:26] + b'\x00' * 4 + samples[30:]
+    with pytest.raises(ReadError):
+        find_frames(b'\x01' + broken, config)
+    assert find_frames(b'\x01' + broken, config, 'replace')[0] == b'\xff\x1e'
+    assert find_frames(b'\x01' + broken, config, 'ignore')[0] == b'\x1e'
+
+
+@given(st.binary().map(lambda b: bytes(c % 2 for c in b)))
+def test_serial_packing(samples):
+    packed = pack_samples(samples)
+    assert len(packed) == (len(samples) + 7) // 8
+    # The last byte is padded with mark samples
+    unpacked = unpack_samples(packed)
+    assert unpacked[:len(samples)] == samples
+    assert set(unpacked[len(samples):]) <= {1}
+    assert unpack_samples(b'') == pack_samples(b'') == b''
@@ -0,0 +1,83 @@
+"""
+Tests of the instrumentation of encoding and decoding
+"""
+
+from io import BytesIO, StringIO
+
+import pytest
+
+from baudot import encode, decode
+from baudot.codecs import CodecEngine, ITA2_STANDARD
+from baudot.errors import ErrorReport
+from baudot.exceptions import ReadError
+from baudot.handlers import HexBytesReader, HexBytesWriter
+from baudot.stats import CodecStats
+
+
+class GenericCodec:
+    """Wrapper forcing the use of the generic engine"""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, codec):
+        self.codec = codec
+
+    def compile(self):
+        return CodecEngine(self.codec)
+
+
+@pytest.mark.parametrize('codec', [ITA2_STANDARD, GenericCodec(ITA2_STANDARD)])
+def test_encode_stats(codec):
+    stats = CodecStats()
+    with HexBytesWriter(BytesIO()) as writer:
+        encode(StringIO('HELLO 123 WORLD'), codec, writer, stats=stats)
+
+    assert stats.chars == 15
+    assert stats.codes == 18
+    assert dict(stats.shifts) == {
+        ITA2_STANDARD.decode(27, None): 1, ITA2_STANDARD.decode(31, None): 2}
+    assert stats.shift_ratio == pytest.approx(3 / 18)
+    assert stats.codec_time > 0 and stats.io_time > 0
+    assert not stats.errors
+
+
+def test_decode_stats_accumulate():
+    stats = CodecStats()
+    for _ in range(2):
+        reader = HexBytesReader(BytesIO(b'1f14011b01'))
+        decode(reader, ITA2_STANDARD, StringIO(), stats=stats)
+
+    assert stats.codes == 10
+    assert stats.chars == 6
+    assert stats.shift_codes == 4
+    assert stats.as_dict()['shifts'] == {'Letters': 2, 'Figures': 2}
+
+
+def test_decode_stats_errors():
+    stats = CodecStats()
+    reader = HexBytesReader(BytesIO(b'1f3f'))
+    with pytest.raises(ReadError):
+        decode(reader, ITA2_STANDARD, StringIO(), stats=stats)
+    assert dict(stats.errors) == {'ReadError': 1}
+
+
+@pytest.mark.parametrize('codec', [ITA2_STANDARD, GenericCodec(ITA2_STANDARD)])
+def test_decode_stats_policy(codec):
+    stats = CodecStats()
+    reader = HexBytesReader(BytesIO(b'0101zz1f01'), 'replace')
+    output, report = StringIO(), ErrorReport()
+    decode(reader, codec, output, stats=stats, errors='replace',
+           report=report)
+    assert output.getvalue().endswith('�E')
+    assert stats.codes == 5
+    assert stats.shift_codes == stats.as_dict()['shifts']['Letters'] == 1
+    assert dict(stats.errors) == {'DecodingError': len(report)}
+
+
+@pytest.mark.parametrize('optimal', [False, True])
+def test_encode_stats_policy(optimal):
+    stats = CodecStats()
+    with HexBytesWriter(BytesIO()) as writer:
+        encode(StringIO('HI Ω'), ITA2_STANDARD, writer, optimal,
+               stats=stats, errors='replace')
+    assert dict(stats.errors) == {'EncodingError': 1}
+    assert stats.chars == 4
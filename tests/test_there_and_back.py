@@ -8,6 +8,8 @@ from io import StringIO, BytesIO
 from hypothesis import given, strategies as st
 
 from baudot import encode_str, decode_to_str, handlers
+from baudot import encode_to_codes, decode_codes
+from baudot import iter_encode, iter_decode, iter_codes, write_codes
 from baudot.codecs import ITA2_STANDARD, ITA2_US, ITA1_CONTINENTAL
 
 # Note: ITA1_UK cannot be tested easily because it has two-character symbols
@@ -59,3 +61,45 @@ def test_hexbytes_codec_tnb(codec_test):
 
     tmp_out.close()
     assert str_back == test_str
+
+
+@given(codec_test_strategy())
+def test_codes_codec_tnb(codec_test):
+    codec, test_str = codec_test
+
+    codes = encode_to_codes(test_str, codec)
+    assert decode_codes(memoryview(codes), codec) == test_str
+
+
+@given(codec_test_strategy())
+def test_packed_codec_tnb(codec_test):
+    codec, test_str = codec_test
+
+    tmp_out = BytesIO()
+    with handlers.PackedWriter(tmp_out) as writer:
+        encode_str(test_str, codec, writer)
+
+    tmp_out.seek(0)
+    reader = handlers.PackedReader(tmp_out)
+    str_back = decode_to_str(reader, codec)
+
+    tmp_out.close()
+    assert str_back == test_str
+
+
+@given(codec_test_strategy(), st.lists(st.integers(0, 20)))
+def test_pipeline_tnb(codec_test, cuts):
+    codec, test_str = codec_test
+    bounds = sorted(min(cut, len(test_str)) for cut in cuts)
+    chunks = [test_str[i:j]
+              for i, j in zip([0] + bounds, bounds + [len(test_str)])]
+
+    tmp_out = BytesIO()
+    write_codes(iter_encode(iter(chunks), codec),
+                handlers.HexBytesWriter(tmp_out))
+    assert tmp_out.getvalue() == \
+        encode_to_codes(test_str, codec).hex().encode()
+
+    tmp_in = BytesIO(tmp_out.getvalue())
+    reader = handlers.HexBytesReader(tmp_in)
+    assert ''.join(iter_decode(iter_codes(reader), codec)) == test_str
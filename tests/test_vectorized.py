@@ -0,0 +1,38 @@
+"""
+Tests for the NumPy-based decoder
+"""
+
+import pytest
+from hypothesis import given, strategies as st
+
+from baudot import decode_codes, encode_to_codes
+from baudot.codecs import ITA1_CONTINENTAL, ITA1_UK, ITA2_STANDARD, ITA2_US
+
+np = pytest.importorskip('numpy')
+vectorized = pytest.importorskip('baudot.vectorized')
+
+ALL_CODECS = (ITA1_CONTINENTAL, ITA1_UK, ITA2_STANDARD, ITA2_US)
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except Exception as exc:  # pylint: disable=broad-except
+        return type(exc), str(exc)
+
+
+@given(st.sampled_from(ALL_CODECS), st.lists(st.integers(0, 33)))
+def test_decode_array(codec, codes):
+    expected = _outcome(decode_codes, bytes(codes), codec)
+    array = np.array(codes, dtype=np.uint8)
+    assert _outcome(vectorized.decode_array, array, codec) == expected
+
+
+@pytest.mark.parametrize('codec', ALL_CODECS)
+def test_decode_array_blocks(codec, monkeypatch):
+    monkeypatch.setattr(vectorized, 'BLOCK_SIZE', 7)
+    codes = encode_to_codes('A', codec) + np.random.default_rng(0).integers(
+        0, 32, 1000, dtype=np.uint8).tobytes()
+    codes = np.frombuffer(codes, dtype=np.uint8)
+    expected = _outcome(decode_codes, codes.tobytes(), codec)
+    assert _outcome(vectorized.decode_array, codes, codec) == expected